@@ -0,0 +1,196 @@
+"""
+Dashboard Backend Benchmark
+Times the dashboard's get_* functions on the SQL path against the in-memory
+NumPy engine (and the filter cube built from it)
+
+Run:
+    python benchmarks/backend_benchmark.py           # offline: engine + cube from the CSVs
+    python benchmarks/backend_benchmark.py --sql     # also time SQL Server and the engine loaded from it
+    python benchmarks/backend_benchmark.py --storage sqlserver,sqlite
+                                                     # SQL path per storage backend, side by side
+"""
+
+import argparse
+import inspect
+import itertools
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Add dashboard to path
+sys.path.append(str(Path(__file__).parent.parent / 'dashboard'))
+
+from analytics_engine import AnalyticsEngine
+from filter_cube import FilterCube
+
+
+SEASONS = [None, '2021-22', '2022-23', '2023-24']
+EDGES = [1, 3, 5, 7]
+DIRECTIONS = ['UNDERDOG', 'FAVORITE', 'BOTH']
+CONFERENCES = [None, 'Major', 'Mid-Major', 'Minor']
+MONTHS = [None, 11, 12, 1, 2, 3]
+
+
+def filter_grid(limit=None):
+    """Every (season, min_edge, direction, conference, month) combination, optionally truncated"""
+    grid = list(itertools.product(SEASONS, EDGES, DIRECTIONS, CONFERENCES, MONTHS))
+    return grid[:limit] if limit else grid
+
+
+def time_calls(func, arg_list):
+    """Call func(*args) for each args tuple; return per-call latencies in ms"""
+    latencies = []
+    for args in arg_list:
+        started = time.perf_counter()
+        func(*args)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct / 100), len(ordered) - 1)]
+
+
+def report(backend, name, latencies):
+    print(f"  {backend:<8} {name:<28} n={len(latencies):<5} "
+          f"mean={statistics.mean(latencies):9.3f} ms  p50={percentile(latencies, 50):9.3f} ms  "
+          f"p95={percentile(latencies, 95):9.3f} ms")
+
+
+def call_args(grid):
+    """Argument tuples per get_* function for a filter grid"""
+    return {
+        'get_strategy_comparison': [(s, e, c, d, m) for s, e, d, c, m in grid],
+        'get_performance_by_season': [(s, e, d, m) for s, e, d, c, m in grid],
+        'get_conference_comparison': [(s, e, d, m) for s, e, d, c, m in grid],
+        'get_recent_picks': [(s,) for s in SEASONS],
+    }
+
+
+def benchmark_backend(backend, api, grid):
+    """Time the four filtered get_* functions of one backend"""
+    for name, arg_list in call_args(grid).items():
+        report(backend, name, time_calls(api[name], arg_list))
+
+
+def storage_worker(sql_limit):
+    """
+    --storage-worker: time the SQL path on this process's DB_BACKEND
+
+    Prints one JSON line of {measurement: {mean, p50, p95}} in ms for compare_storage()
+    """
+    import app
+
+    results = {}
+    started = time.perf_counter()
+    with app.db_pool.connection() as conn:
+        AnalyticsEngine.from_connection(conn)
+    elapsed = (time.perf_counter() - started) * 1000
+    results['load engine'] = {'mean': elapsed, 'p50': elapsed, 'p95': elapsed}
+
+    # Bypass the result cache so every call is a real round trip
+    for name, arg_list in call_args(filter_grid(sql_limit)).items():
+        latencies = time_calls(inspect.unwrap(getattr(app, name)), arg_list)
+        results[name] = {'mean': statistics.mean(latencies), 'p50': percentile(latencies, 50),
+                         'p95': percentile(latencies, 95)}
+    print(json.dumps(results))
+
+
+def compare_storage(names, sql_limit):
+    """Run storage_worker once per backend (DB_BACKEND is read at import) and print them side by side"""
+    results = {}
+    for name in names:
+        env = dict(os.environ, DB_BACKEND=name, DASHBOARD_BACKEND='sql', DASHBOARD_WARMUP='0')
+        proc = subprocess.run([sys.executable, __file__, '--storage-worker', '--sql-limit', str(sql_limit)],
+                              env=env, capture_output=True, text=True)
+        if proc.returncode != 0:
+            error = (proc.stderr.strip().splitlines() or ['no output'])[-1]
+            print(f"  ✗ {name} skipped: {error}")
+            continue
+        results[name] = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    if not results:
+        return
+    print(f"  {'':<28}" + ''.join(f"{name + ' mean/p95 ms':>26}" for name in results))
+    for measurement in next(iter(results.values())):
+        print(f"  {measurement:<28}" + ''.join(
+            f"{stats[measurement]['mean']:>14.3f} /{stats[measurement]['p95']:>9.3f}" for stats in results.values()))
+
+
+def engine_api(engine):
+    return {name: getattr(engine, name) for name in
+            ['get_strategy_comparison', 'get_performance_by_season', 'get_conference_comparison', 'get_recent_picks']}
+
+
+def cube_api(cube, engine):
+    return {
+        'get_strategy_comparison': cube.strategy_comparison,
+        'get_performance_by_season': cube.performance_by_season,
+        'get_conference_comparison': cube.conference_comparison,
+        'get_recent_picks': engine.get_recent_picks,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark dashboard data backends')
+    parser.add_argument('--sql', action='store_true', help='Also benchmark the SQL Server path')
+    parser.add_argument('--sql-limit', type=int, default=60, help='Filter combinations to run against SQL Server')
+    parser.add_argument('--csv-dir', default=str(Path(__file__).parent.parent), help='Folder with ncaabb*.csv')
+    parser.add_argument('--storage', help='Comma-separated storage backends to compare on the SQL path '
+                                          '(sqlserver, sqlite)')
+    parser.add_argument('--storage-worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.storage_worker:
+        storage_worker(args.sql_limit)
+        return
+
+    grid = filter_grid()
+    print("=" * 50)
+    print("Dashboard Backend Benchmark")
+    print("=" * 50)
+
+    print("\n[Load]")
+    started = time.perf_counter()
+    engine = AnalyticsEngine.from_csv(args.csv_dir)
+    print(f"  Engine from CSV: {(time.perf_counter() - started) * 1000:.1f} ms ({len(engine)} games)")
+
+    started = time.perf_counter()
+    cube = FilterCube(engine.cube_rows())
+    print(f"  Cube from engine: {(time.perf_counter() - started) * 1000:.1f} ms ({cube.row_count} cells)")
+
+    print(f"\n[Queries: {len(grid)} filter combinations]")
+    benchmark_backend('numpy', engine_api(engine), grid)
+    benchmark_backend('cube', cube_api(cube, engine), grid)
+
+    if args.sql:
+        os.environ.setdefault('DASHBOARD_BACKEND', 'sql')
+        try:
+            import app
+            started = time.perf_counter()
+            with app.db_pool.connection() as conn:
+                sql_engine = AnalyticsEngine.from_connection(conn)
+            print(f"\n  Engine from SQL Server: {(time.perf_counter() - started) * 1000:.1f} ms ({len(sql_engine)} games)")
+
+            # Bypass the result cache so every call is a real round trip
+            sql_api = {name: inspect.unwrap(getattr(app, name)) for name in engine_api(engine)}
+            sql_grid = filter_grid(args.sql_limit)
+            print(f"\n[SQL Server: {len(sql_grid)} filter combinations]")
+            benchmark_backend('sql', sql_api, sql_grid)
+            benchmark_backend('numpy', engine_api(sql_engine), sql_grid)
+        except Exception as e:
+            print(f"\n✗ SQL Server benchmark skipped: {e}")
+
+    if args.storage:
+        names = [name.strip() for name in args.storage.split(',') if name.strip()]
+        print(f"\n[Storage backends: {len(filter_grid(args.sql_limit))} filter combinations]")
+        compare_storage(names, args.sql_limit)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,313 @@
+"""
+Dashboard Load Test
+Replays filter changes from N concurrent simulated users against the Dash
+callback endpoint and reports latency percentiles and throughput per callback
+
+By default it starts the dashboard in a child process on the offline backend
+(data built in memory from ncaabb22-24.csv, no SQL Server), so it runs anywhere.
+Point --url at a running deployment to load-test that instead.
+
+Run:
+    python benchmarks/load_test.py                          # 10 users, 30 filter changes each
+    python benchmarks/load_test.py --users 50 --changes 100 --think-ms 500
+    python benchmarks/load_test.py --rendering client       # clientside chart rendering
+    python benchmarks/load_test.py --url http://localhost:8050
+"""
+
+import argparse
+import logging
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import requests
+
+DASHBOARD_DIR = Path(__file__).parent.parent / 'dashboard'
+
+# Filter values a user clicks through, and how often each kind of change happens
+FILTER_CHOICES = {
+    ('season-dropdown', 'value'): ['ALL', '2021-22', '2022-23', '2023-24'],
+    ('edge-slider', 'value'): [1, 2, 2.5, 3, 3.5, 4, 4.5, 5, 6, 7, 8.5, 10],
+    ('direction-dropdown', 'value'): ['UNDERDOG', 'FAVORITE', 'BOTH'],
+    ('conference-dropdown', 'value'): ['ALL', 'Major', 'Mid-Major', 'Minor'],
+    ('month-dropdown', 'value'): ['ALL', 11, 12, 1, 2, 3],
+}
+CHANGE_WEIGHTS = {
+    ('season-dropdown', 'value'): 20,
+    ('edge-slider', 'value'): 30,
+    ('direction-dropdown', 'value'): 15,
+    ('conference-dropdown', 'value'): 10,
+    ('month-dropdown', 'value'): 15,
+    ('recent-picks-table', 'page_current'): 10,
+}
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct / 100), len(ordered) - 1)]
+
+
+def parse_outputs(output):
+    """'..a.figure...b.children..' or 'a.figure' -> [('a', 'figure'), ('b', 'children')]"""
+    multi = output.startswith('..')
+    parts = output[2:-2].split('...') if multi else [output]
+    return [tuple(part.rsplit('.', 1)) for part in parts], multi
+
+
+class Callback:
+    """One server-side callback from /_dash-dependencies"""
+
+    def __init__(self, dependency):
+        self.output = dependency['output']
+        self.outputs, self.multi = parse_outputs(self.output)
+        self.inputs = [(item['id'], item['property']) for item in dependency['inputs']]
+        self.state = [(item['id'], item['property']) for item in dependency.get('state', [])]
+        self.name = self.outputs[0][0]
+
+    def body(self, props, changed):
+        """Request body the Dash renderer would send"""
+        outputs = [{'id': i, 'property': p} for i, p in self.outputs]
+        return {
+            'output': self.output,
+            'outputs': outputs if self.multi else outputs[0],
+            'inputs': [{'id': i, 'property': p, 'value': props.get((i, p))} for i, p in self.inputs],
+            'state': [{'id': i, 'property': p, 'value': props.get((i, p))} for i, p in self.state],
+            'changedPropIds': [f'{i}.{p}' for i, p in changed if (i, p) in self.inputs],
+        }
+
+
+def collect_props(node, props):
+    """Initial property values of every component with an id in a /_dash-layout tree"""
+    if isinstance(node, list):
+        for child in node:
+            collect_props(child, props)
+    elif isinstance(node, dict) and 'props' in node:
+        component_props = node['props']
+        if 'id' in component_props:
+            for name, value in component_props.items():
+                if name != 'children' or not isinstance(value, (dict, list)):
+                    props[(component_props['id'], name)] = value
+        collect_props(component_props.get('children'), props)
+
+
+class Stats:
+    """Latencies per callback plus whole-interaction latencies, shared by all users"""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.interactions = []
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds, ok):
+        with self._lock:
+            self.latencies[name].append(seconds * 1000)
+            if not ok:
+                self.errors[name] += 1
+
+    def record_interaction(self, seconds):
+        with self._lock:
+            self.interactions.append(seconds * 1000)
+
+
+class SimulatedUser:
+    """
+    Loads the page and then changes one filter at a time, firing callbacks the
+    way the browser does: every callback whose inputs changed, then whatever
+    their outputs trigger in turn
+    """
+
+    def __init__(self, base_url, callbacks, layout, stats, seed, think_ms):
+        self.base_url = base_url
+        self.callbacks = callbacks
+        self.stats = stats
+        self.random = random.Random(seed)
+        self.think_ms = think_ms
+        self.session = requests.Session()
+        self.props = {}
+        collect_props(layout, self.props)
+
+    def run_callback(self, callback, changed):
+        started = time.perf_counter()
+        ok = True
+        try:
+            response = self.session.post(f'{self.base_url}/_dash-update-component',
+                                         json=callback.body(self.props, changed), timeout=60)
+            ok = response.status_code in (200, 204)
+            updates = response.json().get('response', {}) if response.status_code == 200 else {}
+        except (requests.RequestException, ValueError):
+            ok = False
+            updates = {}
+        self.stats.record(callback.name, time.perf_counter() - started, ok)
+
+        outputs = []
+        for component_id, values in updates.items():
+            for prop, value in values.items():
+                self.props[(component_id, prop)] = value
+                outputs.append((component_id, prop))
+        return outputs
+
+    def fire(self, changed):
+        """Run every callback triggered by the changed props, following chained outputs"""
+        started = time.perf_counter()
+        changed = set(changed)
+
+        for _ in range(10):  # chains here are at most two deep; the cap guards against cycles
+            triggered = [cb for cb in self.callbacks if changed.intersection(cb.inputs)]
+            if not triggered:
+                break
+
+            # A callback fed by another triggered callback waits for that one's output
+            wave = [cb for cb in triggered
+                    if not any(set(other.outputs).intersection(cb.inputs) for other in triggered if other is not cb)]
+
+            next_changed = set()
+            for cb in wave:
+                for output in self.run_callback(cb, changed):
+                    if output not in cb.inputs:
+                        next_changed.add(output)
+            changed = next_changed
+
+        self.stats.record_interaction(time.perf_counter() - started)
+
+    def change_filter(self):
+        keys = list(CHANGE_WEIGHTS)
+        key = self.random.choices(keys, weights=[CHANGE_WEIGHTS[k] for k in keys])[0]
+
+        if key == ('recent-picks-table', 'page_current'):
+            pages = self.props.get(('recent-picks-table', 'page_count')) or 1
+            value = self.random.randrange(max(min(pages, 5), 1))
+        else:
+            options = [v for v in FILTER_CHOICES[key] if v != self.props.get(key)]
+            value = self.random.choice(options)
+
+        self.props[key] = value
+        self.fire([key])
+
+    def run(self, changes):
+        # Initial page load: every callback fires once
+        self.fire(set(key for cb in self.callbacks for key in cb.inputs))
+        for _ in range(changes):
+            if self.think_ms:
+                time.sleep(self.random.uniform(0.5, 1.5) * self.think_ms / 1000)
+            self.change_filter()
+
+
+def wait_until_ready(base_url, timeout=120):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if requests.get(f'{base_url}/ready', timeout=5).status_code == 200:
+                return True
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    return False
+
+
+def start_server(args):
+    """Run the dashboard in a child process on a free port; returns (process, base_url)"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+
+    env = dict(os.environ)
+    env.setdefault('DASHBOARD_BACKEND', args.backend)
+    env['DASHBOARD_RENDERING'] = args.rendering
+    env.setdefault('DASHBOARD_LOG_LEVEL', 'WARNING')
+    process = subprocess.Popen([sys.executable, __file__, '--serve', '--port', str(port)], env=env, cwd=DASHBOARD_DIR)
+    return process, f'http://127.0.0.1:{port}'
+
+
+def serve(port):
+    """Child process: the dashboard on a threaded WSGI server"""
+    sys.path.append(str(DASHBOARD_DIR))
+    from werkzeug.serving import run_simple
+    import app
+
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)  # no per-request access log
+    run_simple('127.0.0.1', port, app.server, threaded=True)
+
+
+def report(stats, wall_seconds):
+    total = sum(len(v) for v in stats.latencies.values())
+    print(f"\n{'callback':<28} {'n':>6} {'errors':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'mean ms':>9} {'req/s':>8}")
+    for name in sorted(stats.latencies):
+        latencies = stats.latencies[name]
+        print(f"{name:<28} {len(latencies):>6} {stats.errors[name]:>6} {percentile(latencies, 50):>9.1f} "
+              f"{percentile(latencies, 95):>9.1f} {percentile(latencies, 99):>9.1f} "
+              f"{statistics.mean(latencies):>9.1f} {len(latencies) / wall_seconds:>8.1f}")
+
+    interactions = stats.interactions
+    print(f"\n{'filter change (all callbacks)':<28} {len(interactions):>6} {'':>6} {percentile(interactions, 50):>9.1f} "
+          f"{percentile(interactions, 95):>9.1f} {percentile(interactions, 99):>9.1f} "
+          f"{statistics.mean(interactions):>9.1f} {len(interactions) / wall_seconds:>8.1f}")
+    print(f"\nTotal: {total} callback requests in {wall_seconds:.1f}s ({total / wall_seconds:.1f} req/s), "
+          f"{sum(stats.errors.values())} errors")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test the dashboard callbacks with concurrent users')
+    parser.add_argument('--url', help='Test a running dashboard instead of starting one')
+    parser.add_argument('--users', type=int, default=10, help='Concurrent simulated users')
+    parser.add_argument('--changes', type=int, default=30, help='Filter changes per user after the page load')
+    parser.add_argument('--think-ms', type=float, default=0, help='Mean pause between a user\'s filter changes')
+    parser.add_argument('--backend', default='offline', help='DASHBOARD_BACKEND for the started server')
+    parser.add_argument('--rendering', default='server', choices=['server', 'client'],
+                        help='DASHBOARD_RENDERING for the started server')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.port)
+        return
+
+    print("=" * 50)
+    print("Dashboard Load Test")
+    print("=" * 50)
+
+    process = None
+    base_url = args.url
+    if not base_url:
+        process, base_url = start_server(args)
+        print(f"\nStarted dashboard ({args.backend} backend, {args.rendering} rendering) at {base_url}")
+
+    try:
+        if not wait_until_ready(base_url):
+            print("✗ Dashboard never reported ready on /ready")
+            return
+
+        layout = requests.get(f'{base_url}/_dash-layout', timeout=30).json()
+        dependencies = requests.get(f'{base_url}/_dash-dependencies', timeout=30).json()
+        callbacks = [Callback(d) for d in dependencies if not d.get('clientside_function')]
+        print(f"{len(callbacks)} server callbacks, {len(dependencies) - len(callbacks)} clientside")
+        print(f"{args.users} users x {args.changes} filter changes (think time {args.think_ms:.0f} ms)")
+
+        stats = Stats()
+        users = [SimulatedUser(base_url, callbacks, layout, stats, args.seed + i, args.think_ms)
+                 for i in range(args.users)]
+        threads = [threading.Thread(target=user.run, args=(args.changes,)) for user in users]
+
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        report(stats, time.perf_counter() - started)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == '__main__':
+    main()
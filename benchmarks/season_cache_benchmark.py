@@ -0,0 +1,113 @@
+"""
+Season Cache Benchmark
+Load time and memory of the season data: the old CSV paths (csv.DictReader
+with per-cell float(), pandas.read_csv) against the typed Parquet cache read
+in full, projected to the analytics engine's columns, and with a date/team
+filter pushed into the scan
+
+Run:
+    python benchmarks/season_cache_benchmark.py
+    python benchmarks/season_cache_benchmark.py --repeat 20 --team Kansas --month 2024-01
+"""
+
+import argparse
+import csv
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+# Add dashboard to path
+sys.path.append(str(Path(__file__).parent.parent / 'dashboard'))
+
+import season_cache
+from season_cache import CSV_FILES, read_season
+
+ENGINE_COLUMNS = ['date', 'home', 'road', 'hscore', 'rscore', 'line', 'lineespn']
+
+
+def dict_reader(csv_path):
+    """The old import parse: every row as strings, numbers through float()"""
+    rows = []
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            rows.append({key: (float(value) if value and key not in ('date', 'home', 'road') else value)
+                         for key, value in row.items()})
+    return rows
+
+
+def frame_mb(result):
+    if isinstance(result, pd.DataFrame):
+        return result.memory_usage(deep=True).sum() / 1e6
+    return None
+
+
+def measure(func, repeat):
+    """(median ms, Python heap peak MB of one run, result size MB)"""
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    result = func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(latencies), peak / 1e6, frame_mb(result)
+
+
+def report(name, ms, peak, size):
+    size = f"{size:8.2f} MB" if size is not None else f"{'-':>8}   "
+    print(f"  {name:<34} {ms:9.2f} ms   peak {peak:8.2f} MB   frame {size}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the columnar season cache against the CSVs')
+    parser.add_argument('--csv-dir', default=str(Path(__file__).parent.parent), help='Folder with ncaabb*.csv')
+    parser.add_argument('--repeat', type=int, default=10, help='Timed runs per measurement')
+    parser.add_argument('--team', default='Kansas', help='Team for the filtered read')
+    parser.add_argument('--month', default=None, help='YYYY-MM for the filtered read (default: each season\'s January)')
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("Season Cache Benchmark")
+    print("=" * 50)
+    if season_cache.pq is None:
+        print("⚠ pyarrow is not installed: read_season falls back to the CSV, so the cache rows measure that path")
+
+    for csv_file in CSV_FILES:
+        csv_path = Path(args.csv_dir) / csv_file
+        if not csv_path.exists():
+            print(f"\n✗ File not found: {csv_path}")
+            continue
+
+        started = time.perf_counter()
+        path = season_cache.season_file(csv_path)
+        convert_ms = (time.perf_counter() - started) * 1000
+
+        month = pd.Period(args.month or f"20{csv_file[6:8]}-01", freq='M')
+        start, end = month.start_time.date(), month.end_time.date()
+
+        print(f"\n[{csv_file}] CSV {os.path.getsize(csv_path) / 1024:.0f} KB", end='')
+        if path is not None:
+            print(f", Parquet {os.path.getsize(path) / 1024:.0f} KB (ready in {convert_ms:.0f} ms)")
+        else:
+            print()
+
+        report('csv.DictReader + float()', *measure(lambda: dict_reader(csv_path), args.repeat))
+        report('pandas.read_csv', *measure(lambda: pd.read_csv(csv_path), args.repeat))
+        report('read_season (all columns)', *measure(lambda: read_season(csv_path), args.repeat))
+        report('read_season (engine columns)', *measure(
+            lambda: read_season(csv_path, columns=ENGINE_COLUMNS), args.repeat))
+        report(f'read_season ({month}, {args.team})', *measure(
+            lambda: read_season(csv_path, columns=ENGINE_COLUMNS, start=start, end=end, teams=[args.team]),
+            args.repeat))
+
+
+if __name__ == '__main__':
+    main()
@@ -3,19 +3,21 @@ ESPN BPI Predictions Scraper
 Fetches game predictions from ESPN's BPI predictions page
 """
 
-import requests
 from bs4 import BeautifulSoup
 from datetime import datetime
 import re
 
+import http_client
 
-def fetch_espn_predictions(date_str=None):
+
+def fetch_espn_predictions(date_str=None, timeout=None):
     """
     Fetch ESPN BPI predictions for a given date
 
     Args:
         date_str: Date in YYYYMMDD format (e.g., '20251103')
                   If None, uses today's date
+        timeout: Seconds to wait for ESPN to connect and to send each chunk (None waits forever)
 
     Returns:
         List of dicts with game predictions
@@ -31,8 +33,9 @@ def fetch_espn_predictions(date_str=None):
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
     }
 
-    response = requests.get(url, headers=headers)
-    response.raise_for_status()
+    response = http_client.get(url, 'espn', headers=headers, timeout=timeout)
+    if response.from_cache:
+        print(f"Using cached ESPN page ({response.age / 60:.0f} min old)")
 
     soup = BeautifulSoup(response.content, 'html.parser')
 
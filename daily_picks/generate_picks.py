@@ -5,7 +5,10 @@ Main script to generate CSV of betting recommendations
 
 import csv
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 
 # Add daily_picks to path
@@ -14,7 +17,9 @@ sys.path.append(str(Path(__file__).parent))
 from espn_scraper import fetch_espn_predictions
 from odds_fetcher import fetch_ncaab_odds, calculate_consensus_spread, get_best_line
 from strategy_engine import apply_strategies, calculate_edge
-from load_teams import load_teams_from_db, load_teams_cache, save_teams_cache
+from load_teams import load_teams_from_db, load_teams_cache, save_teams_cache, get_fallback_teams
+from team_index import TeamIndex
+import http_client
 
 
 # Your Odds API Key
@@ -23,84 +28,154 @@ ODDS_API_KEY = 'c2684e376927153aefc7aa730cca2d27'
 # Bookmakers to check
 BOOKMAKERS = ['fanduel', 'betmgm', 'draftkings']
 
-
-def normalize_team_name(team_name):
-    """Normalize team names for matching between sources"""
-    # Remove common suffixes
-    team_name = team_name.replace(' St.', ' State')
-    team_name = team_name.replace(' St', ' State')
-
-    # Common aliases
-    aliases = {
-        'Miami (FL)': 'Miami FL',
-        'Miami-Florida': 'Miami FL',
-        'Central Florida': 'UCF',
-        'CS Sacramento': 'Sacramento St.',
-        'CS Bakersfield': 'Cal St. Bakersfield',
-        'Middle Tenn St.': 'Middle Tennessee St.',
-        'UT Rio Grande Valley': 'UTRGV',
-        'SE Louisiana': 'Southeastern Louisiana',
-        'FGCU': 'Florida Gulf Coast',
-    }
-
-    return aliases.get(team_name, team_name)
+# Seconds each data source gets before the run goes on without it
+SOURCE_TIMEOUTS = {
+    'teams': 30,
+    'espn': 20,
+    'odds': 15,
+}
 
 
-def match_espn_to_odds(espn_games, odds_games):
+def match_espn_to_odds(espn_games, odds_games, team_index, unmatched=None):
     """
     Match ESPN predictions with odds data
 
+    Both sources' teams are resolved to canonical IDs once, the odds games are
+    keyed by (home ID, away ID), and each ESPN game is one lookup.
+
     Args:
         espn_games: List of ESPN game dicts
         odds_games: List of odds game dicts
+        team_index: TeamIndex built from the teams database
+        unmatched: Optional list; ESPN games without odds are appended with a 'reason'
 
     Returns:
         List of matched game dicts
     """
+    odds_by_teams = {}
+    for odds_game in odds_games:
+        teams = (team_index.resolve(odds_game['home_team']), team_index.resolve(odds_game['away_team']))
+        if None not in teams:
+            odds_by_teams.setdefault(teams, odds_game)  # Keep the first listing, like the feed order
+
     matched_games = []
 
     for espn_game in espn_games:
-        espn_home = normalize_team_name(espn_game['home_team'])
-        espn_away = normalize_team_name(espn_game['away_team'])
-
-        # Try to find matching odds game
-        for odds_game in odds_games:
-            odds_home = normalize_team_name(odds_game['home_team'])
-            odds_away = normalize_team_name(odds_game['away_team'])
-
-            # Check if teams match (either exact or fuzzy)
-            home_match = (espn_home == odds_home or
-                         espn_home in odds_home or
-                         odds_home in espn_home)
-            away_match = (espn_away == odds_away or
-                         espn_away in odds_away or
-                         odds_away in espn_away)
-
-            if home_match and away_match:
-                # Calculate consensus spread
-                consensus = calculate_consensus_spread(odds_game)
-
-                # Get best lines for each side
-                best_home = get_best_line(odds_game, 'home')
-                best_away = get_best_line(odds_game, 'away')
-
-                matched_game = {
-                    'home_team': espn_game['home_team'],
-                    'away_team': espn_game['away_team'],
-                    'espn_spread': espn_game.get('espn_spread'),
-                    'consensus_spread': consensus,
-                    'commence_time': odds_game.get('commence_time'),
-                    'bookmakers': odds_game.get('bookmakers', {}),
-                    'best_home_line': best_home,
-                    'best_away_line': best_away,
-                }
-
-                matched_games.append(matched_game)
-                break  # Found match, move to next ESPN game
+        home_id = team_index.resolve(espn_game['home_team'])
+        away_id = team_index.resolve(espn_game['away_team'])
+        odds_game = odds_by_teams.get((home_id, away_id))
+
+        if odds_game is None:
+            if unmatched is not None:
+                if home_id is None or away_id is None:
+                    unknown = [espn_game[side] for side, team_id in
+                               (('away_team', away_id), ('home_team', home_id)) if team_id is None]
+                    reason = f"unknown team: {', '.join(unknown)}"
+                elif (away_id, home_id) in odds_by_teams:
+                    reason = 'home and away reversed in the odds'
+                else:
+                    reason = 'no odds posted'
+                unmatched.append({**espn_game, 'reason': reason})
+            continue
+
+        # Calculate consensus spread
+        consensus = calculate_consensus_spread(odds_game)
+
+        # Get best lines for each side
+        best_home = get_best_line(odds_game, 'home')
+        best_away = get_best_line(odds_game, 'away')
+
+        matched_game = {
+            'home_team': espn_game['home_team'],
+            'away_team': espn_game['away_team'],
+            'espn_spread': espn_game.get('espn_spread'),
+            'consensus_spread': consensus,
+            'commence_time': odds_game.get('commence_time'),
+            'bookmakers': odds_game.get('bookmakers', {}),
+            'best_home_line': best_home,
+            'best_away_line': best_away,
+        }
+
+        matched_games.append(matched_game)
 
     return matched_games
 
 
+def load_teams_db(timeout=None):
+    """Teams from the JSON cache, or from the database (then cached)"""
+    teams_db = load_teams_cache()
+    if teams_db is None:
+        teams_db = load_teams_from_db(timeout=timeout)
+        save_teams_cache(teams_db)
+    return teams_db
+
+
+class SourceFailed(Exception):
+    """A data source raised; keeps the error and how long the source ran"""
+
+    def __init__(self, error, seconds):
+        super().__init__(str(error))
+        self.error = error
+        self.seconds = seconds
+
+
+def _timed(func, *args):
+    started = time.perf_counter()
+    try:
+        result = func(*args)
+    except Exception as e:
+        raise SourceFailed(e, time.perf_counter() - started) from e
+    return result, time.perf_counter() - started
+
+
+def fetch_sources(date_str, timeouts=SOURCE_TIMEOUTS):
+    """
+    Load the teams, ESPN predictions and odds at the same time
+
+    The three don't depend on each other, so each runs in its own thread and
+    the wait is as long as the slowest one. A source that fails or runs past
+    its timeout is reported and replaced by its fallback (fallback teams, no
+    games).
+
+    Args:
+        date_str: Date in YYYYMMDD format for ESPN
+        timeouts: {source: seconds}, also passed to the HTTP requests and the teams DB connection
+
+    Returns:
+        (teams_db, espn_games, odds_games, {source: (seconds, status)})
+    """
+    sources = {
+        'teams': (load_teams_db, (timeouts['teams'],), get_fallback_teams),
+        'espn': (fetch_espn_predictions, (date_str, timeouts['espn']), list),
+        'odds': (partial(fetch_ncaab_odds, raise_errors=True), (ODDS_API_KEY, BOOKMAKERS, timeouts['odds']), list),
+    }
+
+    results = {}
+    timings = {}
+    started = time.perf_counter()
+    executor = ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix='picks-source')
+    futures = {name: executor.submit(_timed, func, *args) for name, (func, args, _) in sources.items()}
+
+    for name, future in futures.items():
+        # Every timeout counts from the shared start, not from when we get to this source
+        remaining = max(0, started + timeouts[name] - time.perf_counter())
+        try:
+            results[name], seconds = future.result(timeout=remaining)
+            timings[name] = (seconds, 'ok')
+        except TimeoutError:
+            timings[name] = (timeouts[name], f"timed out after {timeouts[name]}s")
+        except SourceFailed as e:
+            timings[name] = (e.seconds, f"failed: {e.error}")
+
+        if name not in results:
+            results[name] = sources[name][2]()
+
+    # Don't wait for a source that timed out here. The interpreter still joins its
+    # thread at exit, so every source has a timeout of its own (HTTP, DB login)
+    executor.shutdown(wait=False, cancel_futures=True)
+    return results['teams'], results['espn'], results['odds'], timings
+
+
 def generate_csv(picks, output_filename='daily_picks.csv'):
     """
     Generate CSV file with betting recommendations
@@ -205,28 +280,33 @@ def main(date_str=None, output_filename='daily_picks.csv'):
 
     print(f"=== Generating Daily Picks for {date_str} ===\n")
 
-    # 1. Load teams database
-    print("Step 1: Loading teams database...")
-    teams_db = load_teams_cache()
-    if teams_db is None:
-        teams_db = load_teams_from_db()
-        save_teams_cache(teams_db)
-    print()
-
-    # 2. Fetch ESPN predictions
-    print("Step 2: Fetching ESPN BPI predictions...")
-    espn_games = fetch_espn_predictions(date_str)
-    print(f"Found {len(espn_games)} games from ESPN\n")
-
-    # 3. Fetch odds from bookmakers
-    print("Step 3: Fetching odds from bookmakers...")
-    odds_games = fetch_ncaab_odds(ODDS_API_KEY, BOOKMAKERS)
-    print(f"Found {len(odds_games)} games with odds\n")
+    # 1-3. Load teams, ESPN predictions and odds (concurrently)
+    print("Steps 1-3: Loading teams, ESPN BPI predictions and odds...")
+    started = time.perf_counter()
+    teams_db, espn_games, odds_games, timings = fetch_sources(date_str)
+    wall_time = time.perf_counter() - started
+
+    team_index = TeamIndex(teams_db)
+    print(f"Indexed {len(team_index)} teams")
+    print(f"Found {len(espn_games)} games from ESPN")
+    print(f"Found {len(odds_games)} games with odds")
+    for name, (seconds, status) in timings.items():
+        print(f"  {name:<6} {seconds:6.2f}s  {status}")
+    print(f"  Wall time {wall_time:.2f}s (sources one after another: {sum(t for t, _ in timings.values()):.2f}s)")
+    http_stats = http_client.stats()
+    print(f"  HTTP: {http_stats['network']} downloaded, {http_stats['cached']} from cache, "
+          f"{http_stats['revalidated']} unchanged (304){' [offline]' if http_client.OFFLINE else ''}\n")
 
     # 4. Match ESPN to odds
     print("Step 4: Matching ESPN predictions with odds...")
-    matched_games = match_espn_to_odds(espn_games, odds_games)
-    print(f"Matched {len(matched_games)} games\n")
+    unmatched = []
+    matched_games = match_espn_to_odds(espn_games, odds_games, team_index, unmatched)
+    print(f"Matched {len(matched_games)} games")
+    if unmatched:
+        print(f"Unmatched {len(unmatched)} ESPN games:")
+        for game in unmatched:
+            print(f"  {game['away_team']} @ {game['home_team']} ({game['reason']})")
+    print()
 
     # 5. Apply strategies
     print("Step 5: Applying betting strategies...")
@@ -244,7 +324,7 @@ def main(date_str=None, output_filename='daily_picks.csv'):
             continue
 
         # Apply strategies
-        matches = apply_strategies(game, teams_db, current_month)
+        matches = apply_strategies(game, team_index, current_month)
 
         # Add matched strategies to picks
         for match in matches:
@@ -278,9 +358,15 @@ if __name__ == '__main__':
     date_str = None
     output_file = 'daily_picks.csv'
 
-    if len(sys.argv) > 1:
-        date_str = sys.argv[1]
-    if len(sys.argv) > 2:
-        output_file = sys.argv[2]
+    args = sys.argv[1:]
+    if '--offline' in args:
+        # Only cached ESPN/odds responses, whatever their age
+        args.remove('--offline')
+        http_client.OFFLINE = True
+
+    if len(args) > 0:
+        date_str = args[0]
+    if len(args) > 1:
+        output_file = args[1]
 
     main(date_str, output_file)
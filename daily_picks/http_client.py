@@ -0,0 +1,217 @@
+"""
+HTTP Client
+Shared requests session and on-disk response cache for the ESPN scraper and
+the odds fetcher.
+
+One pooled session keeps connections alive across requests (and threads)
+and asks for gzip. Successful responses are stored in PICKS_HTTP_CACHE_DIR
+(default data/http_cache/) and reused while younger than their source's TTL,
+so rerunning picks for the same date neither re-downloads ESPN nor spends
+Odds API quota. A stale entry with an ETag or Last-Modified is revalidated
+with a conditional request; a 304 keeps the stored body.
+
+Offline mode (PICKS_OFFLINE=1, or generate_picks.py --offline) never touches
+the network: any cached response is used whatever its age, and a missing one
+raises CacheMiss.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+CACHE_DIR = Path(os.getenv('PICKS_HTTP_CACHE_DIR', PROJECT_ROOT / 'data' / 'http_cache'))
+
+# Seconds a cached response is used without asking the server again
+CACHE_TTLS = {
+    'espn': 6 * 60 * 60,  # BPI predictions for a date barely move during the day
+    'odds': 10 * 60,      # Lines move, but every call costs quota
+}
+DEFAULT_TTL = 5 * 60
+
+OFFLINE = os.getenv('PICKS_OFFLINE', '0') == '1'
+
+# Query parameters left out of the cache key (the key is the same for any API key)
+SECRET_PARAMS = {'apiKey'}
+
+# Response headers kept with a cached body
+KEPT_HEADERS = ['Content-Type', 'ETag', 'Last-Modified', 'x-requests-remaining', 'x-requests-used']
+
+POOL_SIZE = 4
+
+
+class CacheMiss(requests.exceptions.RequestException):
+    """Offline mode and nothing cached for the request"""
+
+
+class CachedResponse:
+    """The parts of a response the fetchers use, from the network or the cache"""
+
+    def __init__(self, status_code, headers, content, from_cache=False, age=0.0):
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+        self.from_cache = from_cache
+        self.age = age
+        self._json = None
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        """Parsed body; raises requests' JSONDecodeError (a RequestException) like Response.json()"""
+        if self._json is None:
+            try:
+                self._json = json.loads(self.content)
+            except ValueError as e:
+                raise requests.exceptions.JSONDecodeError(getattr(e, 'msg', str(e)), self.text,
+                                                          getattr(e, 'pos', 0)) from e
+        return self._json
+
+
+_session = None
+_session_lock = threading.Lock()
+_stats = {'network': 0, 'cached': 0, 'revalidated': 0}
+
+
+def get_session():
+    """The shared session (created on first use)"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers['Accept-Encoding'] = 'gzip, deflate'
+            _session = session
+        return _session
+
+
+def _cache_key(url, params):
+    public = sorted((key, str(value)) for key, value in (params or {}).items() if key not in SECRET_PARAMS)
+    return hashlib.sha256(json.dumps([url, public]).encode()).hexdigest()
+
+
+def _read_entry(key):
+    """(metadata, body) of a cached response, or None"""
+    try:
+        with open(CACHE_DIR / f"{key}.json", 'r') as f:
+            meta = json.load(f)
+        body = (CACHE_DIR / f"{key}.body").read_bytes()
+    except (OSError, ValueError):
+        return None
+    return meta, body
+
+
+def _write_entry(key, meta, body=None):
+    """Store a response (body=None only refreshes the metadata after a 304)"""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    # Temp file then rename, so a concurrent run never reads half an entry
+    suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+    if body is not None:
+        temp_path = CACHE_DIR / f"{key}.body{suffix}"
+        temp_path.write_bytes(body)
+        os.replace(temp_path, CACHE_DIR / f"{key}.body")
+    temp_path = CACHE_DIR / f"{key}.json{suffix}"
+    with open(temp_path, 'w') as f:
+        json.dump(meta, f)
+    os.replace(temp_path, CACHE_DIR / f"{key}.json")
+
+
+def _drop_entry(key):
+    for suffix in ('json', 'body'):
+        try:
+            os.remove(CACHE_DIR / f"{key}.{suffix}")
+        except OSError:
+            pass
+
+
+def get(url, source, params=None, headers=None, timeout=None, ttl=None, expect_json=False):
+    """
+    GET through the shared session and the response cache
+
+    Args:
+        url: Request URL
+        source: Cache source name, picks the TTL from CACHE_TTLS
+        params: Query parameters
+        headers: Extra request headers
+        timeout: Seconds for requests (connect and each read)
+        ttl: Override the source's TTL (0 always asks the server)
+        expect_json: Only cache (and serve from cache) bodies that parse as JSON
+
+    Returns:
+        CachedResponse (from_cache tells whether the network was skipped)
+
+    Raises:
+        CacheMiss: Offline and nothing cached
+        requests.exceptions.RequestException: Network or HTTP error (including
+            requests.exceptions.JSONDecodeError for a non-JSON body with expect_json)
+    """
+    key = _cache_key(url, params)
+    entry = _read_entry(key)
+    ttl = CACHE_TTLS.get(source, DEFAULT_TTL) if ttl is None else ttl
+
+    if entry is not None and expect_json:
+        try:
+            json.loads(entry[1])
+        except ValueError:
+            # Stored before bodies were checked (e.g. a proxy error page); never serve it
+            _drop_entry(key)
+            entry = None
+
+    if entry is not None:
+        meta, body = entry
+        age = time.time() - meta['fetched_at']
+        if OFFLINE or age < ttl:
+            _stats['cached'] += 1
+            return CachedResponse(meta['status'], meta['headers'], body, from_cache=True, age=age)
+    elif OFFLINE:
+        raise CacheMiss(f"Offline and no cached {source} response for {url}")
+
+    request_headers = dict(headers or {})
+    if entry is not None:
+        if meta['headers'].get('ETag'):
+            request_headers['If-None-Match'] = meta['headers']['ETag']
+        if meta['headers'].get('Last-Modified'):
+            request_headers['If-Modified-Since'] = meta['headers']['Last-Modified']
+
+    response = get_session().get(url, params=params, headers=request_headers, timeout=timeout)
+
+    if response.status_code == 304 and entry is not None:
+        # Unchanged: keep the body, restart its TTL, take any new quota headers
+        meta['fetched_at'] = time.time()
+        meta['headers'].update({name: response.headers[name] for name in KEPT_HEADERS if name in response.headers})
+        _write_entry(key, meta)
+        _stats['revalidated'] += 1
+        return CachedResponse(meta['status'], meta['headers'], body, from_cache=True)
+
+    response.raise_for_status()
+    result = CachedResponse(response.status_code, {}, response.content)
+    if expect_json:
+        result.json()  # raises before a body the caller can't parse is cached
+
+    meta = {
+        'source': source,
+        'fetched_at': time.time(),
+        'status': response.status_code,
+        'headers': {name: response.headers[name] for name in KEPT_HEADERS if name in response.headers},
+    }
+    _write_entry(key, meta, response.content)
+    _stats['network'] += 1
+    result.headers = CaseInsensitiveDict(meta['headers'])
+    return result
+
+
+def stats():
+    """Responses served from the network, the cache, and by revalidation since start"""
+    return dict(_stats)
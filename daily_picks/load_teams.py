@@ -1,26 +1,33 @@
 """
-Load teams database from SQL Server
+Load teams database from the SportsAnalytics database
 Creates a mapping of team names to conference types
+
+The database is SQL Server or the embedded SQLite file, per DB_BACKEND
+(dashboard/storage.py).
 """
 
-import pyodbc
 import json
+import sys
+from pathlib import Path
+
+# Add dashboard to path (for the storage backends)
+sys.path.append(str(Path(__file__).parent.parent / 'dashboard'))
+
+import storage
 
 
-def load_teams_from_db():
+def load_teams_from_db(timeout=None):
     """
-    Load teams and conference types from SQL Server
+    Load teams and conference types from the database
+
+    Args:
+        timeout: Seconds for the connection and the query (None: driver default)
 
     Returns:
         Dict mapping team names to conference types
     """
     try:
-        conn = pyodbc.connect(
-            'DRIVER={ODBC Driver 17 for SQL Server};'
-            'SERVER=MSI\\SQLEXPRESS;'
-            'DATABASE=SportsAnalytics;'
-            'Trusted_Connection=yes;'
-        )
+        conn = storage.connect(timeout=timeout)
 
         query = """
         SELECT DISTINCT
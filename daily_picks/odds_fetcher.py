@@ -6,14 +6,21 @@ Fetches spreads from FanDuel, BetMGM, and DraftKings
 import requests
 from datetime import datetime
 
+import http_client
 
-def fetch_ncaab_odds(api_key, bookmakers=['fanduel', 'betmgm', 'draftkings']):
+
+def fetch_ncaab_odds(api_key, bookmakers=['fanduel', 'betmgm', 'draftkings'], timeout=None, quota=None, ttl=None,
+                     raise_errors=False):
     """
     Fetch NCAAB spreads from The Odds API
 
     Args:
         api_key: Your Odds API key
         bookmakers: List of bookmakers to fetch (default: FanDuel, BetMGM, DraftKings)
+        timeout: Seconds to wait for the API to connect and to send each chunk (None waits forever)
+        quota: Optional dict, filled with 'used', 'remaining' (ints) and 'from_cache' on success
+        ttl: Seconds a cached response may be reused (None: http_client's odds TTL, 0: always ask)
+        raise_errors: Re-raise request errors instead of printing them and returning []
 
     Returns:
         List of dicts with game odds
@@ -32,15 +39,20 @@ def fetch_ncaab_odds(api_key, bookmakers=['fanduel', 'betmgm', 'draftkings']):
     print(f"Bookmakers: {', '.join(bookmakers)}")
 
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
+        response = http_client.get(url, 'odds', params=params, timeout=timeout, ttl=ttl, expect_json=True)
 
         data = response.json()
 
-        # Check remaining requests
+        # Check remaining requests (as of the last call that reached the API)
         remaining = response.headers.get('x-requests-remaining')
         used = response.headers.get('x-requests-used')
+        if response.from_cache:
+            print(f"Using cached odds ({response.age / 60:.0f} min old)")
         print(f"API Requests - Used: {used}, Remaining: {remaining}")
+        if quota is not None:
+            quota['used'] = int(float(used)) if used is not None else None
+            quota['remaining'] = int(float(remaining)) if remaining is not None else None
+            quota['from_cache'] = response.from_cache
 
         games = []
 
@@ -83,6 +95,8 @@ def fetch_ncaab_odds(api_key, bookmakers=['fanduel', 'betmgm', 'draftkings']):
         return games
 
     except requests.exceptions.RequestException as e:
+        if raise_errors:
+            raise
         print(f"Error fetching odds: {e}")
         return []
 
@@ -0,0 +1,269 @@
+"""
+Odds Poller
+Long-running scheduler that polls The Odds API and keeps every line move.
+
+Each poll appends the spreads that changed since the previous poll to an
+append-only snapshot store (data/odds_snapshots/, one CSV per month keyed
+by game id, book and timestamp), so the history of every line can be
+replayed without storing unchanged lines again.
+
+The wait between polls comes from two limits, and the longer one wins:
+  - cadence: the nearer the next tip-off, the more often (CADENCE)
+  - budget:  the quota left after RESERVE_REQUESTS, spread evenly over the
+             time until the monthly reset
+When only the reserve is left the poller waits for the reset, so
+generate_picks.py always has requests to spare.
+
+Run: python odds_poller.py [--once] [--reserve N] [--store DIR]
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add daily_picks to path
+sys.path.append(str(Path(__file__).parent))
+
+from odds_fetcher import fetch_ncaab_odds
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+STORE_DIR = Path(os.getenv('ODDS_SNAPSHOT_DIR', PROJECT_ROOT / 'data' / 'odds_snapshots'))
+
+# (hours until the next tip-off, seconds between polls); first row that fits wins
+CADENCE = [
+    (1, 5 * 60),
+    (6, 20 * 60),
+    (24, 60 * 60),
+    (None, 3 * 60 * 60),
+]
+IDLE_INTERVAL = 6 * 60 * 60   # No upcoming games in the feed
+ERROR_INTERVAL = 15 * 60      # The last poll failed
+MIN_INTERVAL = 60
+MAX_INTERVAL = 12 * 60 * 60
+
+# Requests left alone for generate_picks.py runs
+RESERVE_REQUESTS = 50
+
+SNAPSHOT_FIELDS = ['game_id', 'book', 'fetched_at', 'home_spread', 'away_spread']
+GAME_FIELDS = ['game_id', 'commence_time', 'home_team', 'away_team']
+
+
+def _timestamp(moment):
+    return moment.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _parse_time(value):
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+class SnapshotStore:
+    """
+    Append-only line history
+
+    snapshots-YYYY-MM.csv holds one row per (game id, book, timestamp) whose
+    spreads differ from that game and book's previous row; games.csv holds
+    each game's teams and tip-off once.
+    """
+
+    def __init__(self, path=STORE_DIR):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.last = {}
+        self.games = set()
+
+        # Latest spreads per game and book, so only changes are appended
+        for snapshot_file in sorted(self.path.glob('snapshots-*.csv')):
+            for row in self._read(snapshot_file):
+                self.last[(row['game_id'], row['book'])] = (row['home_spread'], row['away_spread'])
+        self.games = {row['game_id'] for row in self._read(self.path / 'games.csv')}
+
+    def _read(self, path):
+        try:
+            with open(path, 'r', newline='', encoding='utf-8') as f:
+                return list(csv.DictReader(f))
+        except FileNotFoundError:
+            return []
+
+    def _append(self, path, fields, rows):
+        if not rows:
+            return
+        new_file = not path.exists()
+        with open(path, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            if new_file:
+                writer.writeheader()
+            writer.writerows(rows)
+
+    def append(self, odds_games, fetched_at):
+        """
+        Record one poll
+
+        Args:
+            odds_games: Games from fetch_ncaab_odds
+            fetched_at: When the poll ran (aware datetime)
+
+        Returns:
+            Number of snapshot rows written (changed lines)
+        """
+        stamp = _timestamp(fetched_at)
+        snapshots = []
+        new_games = []
+
+        for game in odds_games:
+            if game['id'] not in self.games:
+                self.games.add(game['id'])
+                new_games.append({'game_id': game['id'], 'commence_time': game['commence_time'],
+                                  'home_team': game['home_team'], 'away_team': game['away_team']})
+
+            for book, spreads in game.get('bookmakers', {}).items():
+                # Strings, as they read back from the CSV
+                line = tuple('' if spreads.get(side) is None else str(spreads[side])
+                             for side in ('home_spread', 'away_spread'))
+                if self.last.get((game['id'], book)) == line:
+                    continue
+                self.last[(game['id'], book)] = line
+                snapshots.append({'game_id': game['id'], 'book': book, 'fetched_at': stamp,
+                                  'home_spread': line[0], 'away_spread': line[1]})
+
+        self._append(self.path / 'games.csv', GAME_FIELDS, new_games)
+        self._append(self.path / f"snapshots-{fetched_at:%Y-%m}.csv", SNAPSHOT_FIELDS, snapshots)
+        return len(snapshots)
+
+    def history(self, game_id):
+        """All snapshots of one game, oldest first"""
+        rows = []
+        for snapshot_file in sorted(self.path.glob('snapshots-*.csv')):
+            rows.extend(row for row in self._read(snapshot_file) if row['game_id'] == game_id)
+        return rows
+
+
+def next_reset(now):
+    """Start of next month (UTC), when The Odds API quota renews"""
+    return (now.replace(day=1, hour=0, minute=0, second=0, microsecond=0) + timedelta(days=32)).replace(day=1)
+
+
+def cadence_interval(odds_games, now):
+    """Seconds between polls wanted for the nearest upcoming tip-off"""
+    upcoming = [_parse_time(game['commence_time']) for game in odds_games]
+    upcoming = [tip_off for tip_off in upcoming if tip_off > now]
+    if not upcoming:
+        return IDLE_INTERVAL
+
+    hours = (min(upcoming) - now).total_seconds() / 3600
+    for max_hours, interval in CADENCE:
+        if max_hours is None or hours <= max_hours:
+            return interval
+
+
+def budget_interval(remaining, now, reserve=RESERVE_REQUESTS):
+    """
+    Shortest wait that lasts the quota until the reset
+
+    Args:
+        remaining: x-requests-remaining from the last poll
+        now: Current time (aware datetime)
+        reserve: Requests not to spend
+
+    Returns:
+        Seconds, or None when only the reserve is left (wait for the reset)
+    """
+    spendable = remaining - reserve
+    if spendable <= 0:
+        return None
+    return (next_reset(now) - now).total_seconds() / spendable
+
+
+def plan_next_poll(odds_games, remaining, now, reserve=RESERVE_REQUESTS):
+    """
+    Seconds until the next poll, and why
+
+    Returns:
+        (seconds, reason)
+    """
+    cadence = cadence_interval(odds_games, now)
+    if remaining is None:
+        return cadence, 'cadence (quota unknown)'
+
+    budget = budget_interval(remaining, now, reserve)
+    if budget is None:
+        seconds = (next_reset(now) - now).total_seconds()
+        return seconds, f"quota reserve reached ({remaining} left), waiting for the reset"
+    if budget > cadence:
+        return min(max(budget, MIN_INTERVAL), MAX_INTERVAL), f"budget ({remaining} left)"
+    return max(cadence, MIN_INTERVAL), 'cadence'
+
+
+def poll_once(api_key, bookmakers, store):
+    """
+    One poll: fetch the odds and append the changed lines
+
+    Returns:
+        (odds_games, quota dict, snapshot rows written); quota is empty when the poll failed
+    """
+    quota = {}
+    fetched_at = datetime.now(timezone.utc)
+    # ttl=0: always ask the API (a 304 or a fresh body), never reuse a cached response
+    odds_games = fetch_ncaab_odds(api_key, bookmakers, timeout=30, quota=quota, ttl=0)
+    written = store.append(odds_games, fetched_at) if quota else 0
+    return odds_games, quota, written
+
+
+def run(api_key, bookmakers, store, reserve=RESERVE_REQUESTS, max_polls=None):
+    """
+    Poll until interrupted (or max_polls)
+
+    Args:
+        api_key: Odds API key
+        bookmakers: Bookmakers to fetch
+        store: SnapshotStore
+        reserve: Requests left for generate_picks.py
+        max_polls: Stop after this many polls (None: forever)
+    """
+    polls = 0
+    while max_polls is None or polls < max_polls:
+        error = None
+        try:
+            odds_games, quota, written = poll_once(api_key, bookmakers, store)
+        except Exception as e:
+            # A malformed response (bad JSON, a game missing a field) must not stop the poller
+            odds_games, quota, written, error = [], {}, 0, e
+        polls += 1
+        now = datetime.now(timezone.utc)
+
+        if quota:
+            seconds, reason = plan_next_poll(odds_games, quota.get('remaining'), now, reserve)
+            print(f"✓ {_timestamp(now)}: {len(odds_games)} games, {written} line changes stored")
+        else:
+            seconds, reason = ERROR_INTERVAL, 'retry after a failed poll'
+            print(f"✗ {_timestamp(now)}: poll failed" + (f": {error!r}" if error else ''))
+
+        if max_polls is not None and polls >= max_polls:
+            break
+        print(f"  Next poll in {seconds / 60:.0f} min ({reason})")
+        time.sleep(seconds)
+
+
+def main():
+    from generate_picks import ODDS_API_KEY, BOOKMAKERS
+
+    parser = argparse.ArgumentParser(description='Poll The Odds API on a quota-aware schedule and store line moves')
+    parser.add_argument('--once', action='store_true', help='Poll once and exit')
+    parser.add_argument('--reserve', type=int, default=RESERVE_REQUESTS, help='Requests to leave unspent')
+    parser.add_argument('--store', default=str(STORE_DIR), help='Snapshot folder')
+    args = parser.parse_args()
+
+    store = SnapshotStore(args.store)
+    print(f"Snapshot store: {store.path} ({len(store.games)} games, {len(store.last)} lines tracked)")
+    try:
+        run(ODDS_API_KEY, BOOKMAKERS, store, reserve=args.reserve, max_polls=1 if args.once else None)
+    except KeyboardInterrupt:
+        print("\nStopped")
+
+
+if __name__ == '__main__':
+    main()
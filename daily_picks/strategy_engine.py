@@ -5,6 +5,8 @@ Applies monthly betting strategies to game edges
 
 from datetime import datetime
 
+from team_index import TeamIndex
+
 
 # Monthly strategies from STRATEGY_PLAYBOOK.md
 STRATEGIES = {
@@ -63,33 +65,18 @@ STRATEGIES = {
 }
 
 
-def get_team_conference_type(team_name, teams_db):
+def get_team_conference_type(team_name, team_index):
     """
     Look up team's conference type from database
 
     Args:
         team_name: Team name to lookup
-        teams_db: Dict mapping team names to conference types
+        team_index: TeamIndex built from the teams database
 
     Returns:
         'Major', 'Mid-Major', 'Minor', or 'Unknown'
     """
-    # Try exact match first
-    if team_name in teams_db:
-        return teams_db[team_name]
-
-    # Try case-insensitive match
-    team_lower = team_name.lower()
-    for db_team, conf_type in teams_db.items():
-        if db_team.lower() == team_lower:
-            return conf_type
-
-    # Try partial match
-    for db_team, conf_type in teams_db.items():
-        if team_name in db_team or db_team in team_name:
-            return conf_type
-
-    return 'Unknown'
+    return team_index.conference_type(team_name)
 
 
 def calculate_edge(espn_spread, consensus_spread):
@@ -128,7 +115,7 @@ def determine_direction(edge):
     return 'UNDERDOG' if edge > 0 else 'FAVORITE'
 
 
-def apply_strategies(game_data, teams_db, current_month=None):
+def apply_strategies(game_data, team_index, current_month=None):
     """
     Apply monthly strategies to game data
 
@@ -137,7 +124,7 @@ def apply_strategies(game_data, teams_db, current_month=None):
             - home_team, away_team
             - espn_spread, consensus_spread
             - edge
-        teams_db: Dict mapping team names to conference types
+        team_index: TeamIndex built from the teams database
         current_month: Month number (1-12), defaults to current month
 
     Returns:
@@ -154,8 +141,8 @@ def apply_strategies(game_data, teams_db, current_month=None):
     matches = []
 
     # Get conference types
-    home_conf = get_team_conference_type(game_data['home_team'], teams_db)
-    away_conf = get_team_conference_type(game_data['away_team'], teams_db)
+    home_conf = get_team_conference_type(game_data['home_team'], team_index)
+    away_conf = get_team_conference_type(game_data['away_team'], team_index)
 
     # Calculate edge
     edge = calculate_edge(game_data.get('espn_spread'), game_data.get('consensus_spread'))
@@ -259,7 +246,7 @@ if __name__ == '__main__':
         'consensus_spread': 18.0,  # Duke favored by 18
     }
 
-    matches = apply_strategies(sample_game, teams_db, current_month=11)
+    matches = apply_strategies(sample_game, TeamIndex(teams_db), current_month=11)
 
     print(f"Game: {sample_game['away_team']} @ {sample_game['home_team']}")
     print(f"ESPN Spread: {sample_game['espn_spread']}")
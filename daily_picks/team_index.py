@@ -0,0 +1,241 @@
+"""
+Team Index
+Resolves team names from ESPN, The Odds API and the database to one
+canonical team ID, so games from different sources can be joined on
+(home ID, away ID) with dictionary lookups instead of comparing names.
+
+Names are reduced to a key (lowercase words, punctuation dropped,
+St./State/Saint all written 'st'), looked up in a map built once from
+teams_cache.json plus TEAM_ALIASES. Odds API names carry the mascot
+("Kansas Jayhawks"), so up to MAX_MASCOT_WORDS trailing words are dropped
+until a known team is found. Whole-word keys keep "Kansas" from matching
+"Arkansas".
+
+conference_type() answers strategy_engine's lookups in this order, first
+hit wins, each result memoized per name:
+  1. exact name, case-insensitive
+  2. resolve() (aliases, spelling variations, mascot dropped)
+  3. word fallback: a team whose key words all appear in the name, or
+     that contains all of the name's words; most shared words wins, then
+     the shorter key, then alphabetical
+  4. 'Unknown'
+"""
+
+import re
+from collections import defaultdict
+
+
+# Other spellings -> name in dbo.Teams / teams_cache.json. The CSV variations
+# (sql/27_AddTeamAliases.sql, 28_AddAllTeamAliases.sql) are separate rows in
+# dbo.Teams; listing them here gives them the same ID as the team they stand for.
+TEAM_ALIASES = {
+    # ESPN / Odds API spellings
+    'UConn': 'Connecticut',
+    'Pitt': 'Pittsburgh',
+    'Ole Miss': 'Mississippi',
+    'Miami': 'Miami FL',
+    'Miami (FL)': 'Miami FL',
+    'Miami (OH)': 'Miami OH',
+    'UMass': 'Massachusetts',
+    'UTRGV': 'UT Rio Grande Valley',
+    'FGCU': 'Florida Gulf Coast',
+    'FIU': 'Florida International',
+    'ETSU': 'East Tennessee St.',
+    'WKU': 'Western Kentucky',
+    'MTSU': 'Middle Tennessee St.',
+    'Middle Tennessee': 'Middle Tennessee St.',
+    'La Tech': 'Louisiana Tech',
+    'UL Lafayette': 'Louisiana',
+    'ULM': 'Louisiana-Monroe',
+    'App State': 'Appalachian St.',
+    'Ga. Southern': 'Georgia Southern',
+    'Coastal': 'Coastal Carolina',
+    'JMU': 'James Madison',
+    'UNCG': 'UNC Greensboro',
+    'Mich. St.': 'Michigan St.',
+    'Southeastern Louisiana': 'SE Louisiana',
+    'SF Austin': 'Stephen F. Austin',
+    'USC Upstate': 'South Carolina Upstat',
+    'Hawai\'i': 'Hawaii',
+    'Texas A&M-CC': 'Texas A&M-Corpus Christi',
+
+    # CSV variations -> the team they stand for
+    'Central Florida': 'UCF',
+    'CS Bakersfield': 'Cal St. Bakersfield',
+    'CS Northridge': 'Cal St. Northridge',
+    'CS Sacramento': 'Sacramento St.',
+    'Cal Poly SLO': 'Cal Poly',
+    'Cal Riverside': 'UC Riverside',
+    'Central Conn. St.': 'Central Connecticut St.',
+    'Middle Tenn St.': 'Middle Tennessee St.',
+    'Miami-Florida': 'Miami FL',
+    'Miami-Ohio': 'Miami OH',
+    'North Carolina St.': 'NC State',
+    'NC Central': 'North Carolina Central',
+    'NC A&T': 'North Carolina A&T',
+    'NC Wilmington': 'UNC Wilmington',
+    'NC Greensboro': 'UNC Greensboro',
+    'NC Asheville': 'UNC Asheville',
+    'NC Charlotte': 'Charlotte',
+    'Md. Eastern Shore': 'Maryland-Eastern Shore',
+    'MD Baltimore Co': 'UMBC',
+    'Nebraska Omaha': 'Omaha',
+    'Mo Kansas City': 'Kansas City',
+    'IPFW': 'Purdue Fort Wayne',
+    'Wisconsin-Green Bay': 'Green Bay',
+    'Wisconsin-Milwaukee': 'Milwaukee',
+    'Iu Indianapolis': 'IUPUI',
+    'Louisiana-Lafayette': 'Louisiana',
+    'UL Monroe': 'Louisiana-Monroe',
+    'Troy St.': 'Troy',
+    'Texas Arlington': 'UT Arlington',
+    'Texas San Antonio': 'UTSA',
+    'Texas A&M Corpus': 'Texas A&M-Corpus Christi',
+    'East Texas A&M': 'Texas A&M-Commerce',
+    'Texas A&M Commerce': 'Texas A&M-Commerce',
+    'A&M-Commerce': 'Texas A&M-Commerce',
+    'SW Missouri St.': 'Missouri St.',
+    'Tennessee-Martin': 'UT Martin',
+    'Prairie View': 'Prairie View A&M',
+    'Miss Valley St.': 'Mississippi Valley St.',
+    'Loyola-Maryland': 'Loyola-MD',
+    "St. Joseph's PA": "Saint Joseph's",
+    'St. Francis (PA)': 'Saint Francis-PA',
+    'St. Thomas (Mn)': 'St. Thomas',
+    'VA Commonwealth': 'VCU',
+    'Nevada Wolf': 'Nevada',
+    'LIU Brooklyn': 'LIU',
+    'Little Rock': 'Arkansas-Little Rock',
+    'Illinois-Chicago': 'UIC',
+}
+
+# Longest mascot dropped from an Odds API name ("Fighting Irish", "Red Storm")
+MAX_MASCOT_WORDS = 2
+
+# Same word written several ways; St./State/Saint are never ambiguous in context
+WORD_ALIASES = {
+    'state': 'st',
+    'saint': 'st',
+    'mt': 'mount',
+}
+
+_PUNCTUATION = re.compile(r"[.'()]")
+_SEPARATORS = re.compile(r'[\s\-,/]+')
+
+
+def team_key(name):
+    """Lowercase words of a team name with punctuation and spelling variations removed"""
+    words = _SEPARATORS.split(_PUNCTUATION.sub('', name.lower()).strip())
+    return ' '.join(WORD_ALIASES.get(word, word) for word in words if word)
+
+
+class TeamIndex:
+    """
+    Team name -> canonical team ID, built once per run
+
+    IDs are small ints, one per team however many spellings it has;
+    names[id] is the spelling aliases point to (or the teams_cache.json name).
+    """
+
+    def __init__(self, teams_db, aliases=TEAM_ALIASES):
+        self.ids = {}
+        self.names = []
+
+        # Aliases first, so an alias's own dbo.Teams row gets its target's ID
+        for alias, team_name in aliases.items():
+            self.ids[team_key(alias)] = self._add(team_key(team_name), team_name)
+
+        # Conference types: by lowercase name, and by ID for every other spelling
+        self.exact = {}
+        self.conferences = {}
+        for team_name, conf_type in teams_db.items():
+            self.exact.setdefault(team_name.lower(), conf_type)
+            self.conferences.setdefault(self._add(team_key(team_name), team_name), conf_type)
+
+        # Word -> keys containing it, for the fallback match
+        self.keys_by_word = defaultdict(set)
+        for key in self.ids:
+            for word in key.split(' '):
+                self.keys_by_word[word].add(key)
+
+        self._conference_memo = {}
+
+    def _add(self, key, team_name):
+        if key not in self.ids:
+            self.ids[key] = len(self.names)
+            self.names.append(team_name)
+        return self.ids[key]
+
+    def __len__(self):
+        return len(self.names)
+
+    def resolve(self, name):
+        """
+        Canonical ID for a team name from any source
+
+        Args:
+            name: Team name, with or without a mascot
+
+        Returns:
+            Team ID, or None for an unknown team
+        """
+        words = team_key(name).split(' ')
+        for drop in range(min(MAX_MASCOT_WORDS, len(words) - 1) + 1):
+            team_id = self.ids.get(' '.join(words[:len(words) - drop]))
+            if team_id is not None:
+                return team_id
+        return None
+
+    def name(self, team_id):
+        """Canonical name for an ID"""
+        return self.names[team_id]
+
+    def conference_type(self, name):
+        """
+        Conference type for a team name (see the module docstring for the rules)
+
+        Args:
+            name: Team name from any source
+
+        Returns:
+            'Major', 'Mid-Major', 'Minor', or 'Unknown'
+        """
+        conf_type = self._conference_memo.get(name)
+        if conf_type is None:
+            conf_type = self.exact.get(name.lower())
+            if conf_type is None:
+                conf_type = self.conferences.get(self.resolve(name))
+            if conf_type is None:
+                conf_type = self.conferences.get(self._word_match(name))
+            if conf_type is None:
+                conf_type = 'Unknown'
+            self._conference_memo[name] = conf_type
+        return conf_type
+
+    def _word_match(self, name):
+        """ID of the best team sharing whole words with the name, or None"""
+        words = set(team_key(name).split(' '))
+        best = None
+        for key in set().union(*(self.keys_by_word.get(word, ()) for word in words)):
+            key_words = set(key.split(' '))
+            if key_words <= words or words <= key_words:
+                rank = (-len(key_words & words), len(key), key)
+                if best is None or rank < best[0]:
+                    best = (rank, key)
+        return self.ids[best[1]] if best else None
+
+
+if __name__ == '__main__':
+    # Resolve a few names against the cached teams
+    import json
+    from pathlib import Path
+
+    with open(Path(__file__).parent / 'teams_cache.json', 'r') as f:
+        index = TeamIndex(json.load(f))
+
+    print(f"{len(index)} teams, {len(index.ids)} spellings")
+    for sample in ['Kansas Jayhawks', 'Arkansas Razorbacks', 'Kansas St Wildcats', "Saint Mary's Gaels",
+                   'UConn Huskies', 'Miami (OH) RedHawks', 'Cal State Fullerton Titans', 'Nowhere Tech']:
+        team_id = index.resolve(sample)
+        name = index.name(team_id) if team_id is not None else '-'
+        print(f"  {sample:<30} -> {name:<25} {index.conference_type(sample)}")
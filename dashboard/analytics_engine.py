@@ -0,0 +1,358 @@
+"""
+Analytics Engine
+In-memory NumPy backend for the dashboard's get_* functions
+
+The rows of vw_ESPNvsClosingLine are loaded once into column arrays (from SQL
+Server, or straight from the season CSVs for offline use) and every dashboard
+aggregate is answered with boolean masks and bincount instead of a query.
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from filter_cube import DIRECTIONS, summarize
+from season_cache import read_season
+from storage import team_name_key
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Same season mapping as sql/import_data.py
+CSV_FILES = {
+    'ncaabb22.csv': '2021-22',
+    'ncaabb23.csv': '2022-23',
+    'ncaabb24.csv': '2023-24'
+}
+
+TEAMS_CACHE = PROJECT_ROOT / 'daily_picks' / 'teams_cache.json'
+
+# Minimum |ESPNEdge| built into vw_ESPNvsClosingLine
+VIEW_MIN_EDGE = 3
+
+COVERED, MISSED, NO_RESULT = 1, 0, -1
+
+FACT_QUERY = """
+SELECT
+    v.GameID,
+    v.SeasonYear,
+    v.GameDate,
+    v.HomeTeam,
+    v.RoadTeam,
+    v.HomeScore,
+    v.RoadScore,
+    v.ClosingLine,
+    v.ESPNLine,
+    v.ESPNEdge,
+    v.ActualMargin,
+    v.CoverResult,
+    COALESCE(c.HomeConferenceType, 'Unknown') AS ConferenceType
+FROM dbo.vw_ESPNvsClosingLine v
+LEFT JOIN dbo.vw_GamesWithConferences c ON v.GameID = c.GameID
+"""
+
+
+def cover_result(closing_line, espn_line, margin):
+    """
+    Vectorized CoverResult from vw_ESPNvsClosingLine
+
+    Returns:
+        int8 array of COVERED / MISSED / NO_RESULT
+    """
+    road_pick = (closing_line > 0) & (espn_line < closing_line)
+    home_pick = (closing_line < 0) & (espn_line > closing_line)
+
+    result = np.full(len(closing_line), NO_RESULT, dtype=np.int8)
+    result[road_pick] = np.where(margin[road_pick] < closing_line[road_pick], COVERED, MISSED)
+    result[home_pick] = np.where(margin[home_pick] > closing_line[home_pick], COVERED, MISSED)
+    result[np.isnan(margin)] = NO_RESULT
+    return result
+
+
+def games_from_csv(csv_dir=PROJECT_ROOT, csv_files=CSV_FILES, teams_cache=TEAMS_CACHE):
+    """
+    Rebuild the vw_ESPNvsClosingLine rows from the season CSVs
+
+    Mirrors the database: one game per (season, date, home, road) with the
+    first row's scores and ESPN line, MAX(line) as the closing line (as in
+    21_ImportClosingLine.sql), and the home team's conference type looked up
+    by team name like the HomeTeamID resolution in import_data.py. The
+    seasons are read through season_cache, projected to the columns used here.
+
+    Returns:
+        DataFrame shaped like FACT_QUERY output
+    """
+    frames = []
+    for csv_file, season_year in csv_files.items():
+        path = Path(csv_dir) / csv_file
+        if not path.exists():
+            continue
+        df = read_season(path, columns=['date', 'home', 'road', 'hscore', 'rscore', 'line', 'lineespn'])
+        # Team names as plain strings: the seasons' categories differ
+        df = df.astype({'home': object, 'road': object})
+        df['SeasonYear'] = season_year
+        frames.append(df)
+
+    if not frames:
+        raise FileNotFoundError(f"No season CSVs found in {csv_dir}")
+
+    raw = pd.concat(frames, ignore_index=True)
+    games = raw.groupby(['SeasonYear', 'date', 'home', 'road'], sort=False, as_index=False).agg(
+        hscore=('hscore', 'first'),
+        rscore=('rscore', 'first'),
+        line=('line', 'max'),
+        lineespn=('lineespn', 'first'),
+    )
+
+    # DECIMAL(10,2) columns in the database (the cache stores float32)
+    games['ClosingLine'] = games['line'].astype(np.float64).round(2)
+    games['ESPNLine'] = games['lineespn'].astype(np.float64).round(2)
+    games = games.dropna(subset=['ClosingLine', 'ESPNLine'])
+    games['ESPNEdge'] = (games['ClosingLine'] - games['ESPNLine']).round(2)
+    games = games[games['ESPNEdge'].abs() >= VIEW_MIN_EDGE]
+
+    games = games.rename(columns={
+        'home': 'HomeTeam', 'road': 'RoadTeam', 'hscore': 'HomeScore', 'rscore': 'RoadScore'
+    })
+    games = games.astype({'HomeScore': np.float64, 'RoadScore': np.float64})
+    games['GameDate'] = games['date']
+    games['ActualMargin'] = games['HomeScore'] - games['RoadScore']
+
+    try:
+        with open(teams_cache, 'r') as f:
+            teams_db = json.load(f)
+    except FileNotFoundError:
+        teams_db = {}
+    # Names matched like the importer matches them to dbo.Teams, so both backends agree
+    conferences = {team_name_key(name): conf_type for name, conf_type in teams_db.items()}
+    games['ConferenceType'] = games['HomeTeam'].map(team_name_key).map(conferences).fillna('Unknown')
+
+    games = games.sort_values(['SeasonYear', 'GameDate', 'HomeTeam']).reset_index(drop=True)
+    games['GameID'] = np.arange(1, len(games) + 1)
+
+    codes = cover_result(games['ClosingLine'].to_numpy(float), games['ESPNLine'].to_numpy(float),
+                         games['ActualMargin'].to_numpy(float))
+    games['CoverResult'] = pd.Series(codes).map({COVERED: 'COVERED', MISSED: 'MISSED'}).to_numpy()
+
+    return games[['GameID', 'SeasonYear', 'GameDate', 'HomeTeam', 'RoadTeam', 'HomeScore', 'RoadScore',
+                  'ClosingLine', 'ESPNLine', 'ESPNEdge', 'ActualMargin', 'CoverResult', 'ConferenceType']]
+
+
+class AnalyticsEngine:
+    """
+    Column arrays over vw_ESPNvsClosingLine with the get_* query API
+
+    Args:
+        games: DataFrame shaped like FACT_QUERY output
+    """
+
+    def __init__(self, games):
+        games = games.reset_index(drop=True)
+
+        self.seasons, season_code = np.unique(games['SeasonYear'].to_numpy(str), return_inverse=True)
+        self.conference_types, conf_code = np.unique(games['ConferenceType'].to_numpy(str), return_inverse=True)
+        self.seasons = self.seasons.tolist()
+        self.conference_types = self.conference_types.tolist()
+
+        self.season_code = season_code.astype(np.int16)
+        self.conf_code = conf_code.astype(np.int16)
+        self.game_id = games['GameID'].to_numpy(np.int64)
+        self.game_date = pd.to_datetime(games['GameDate']).to_numpy('datetime64[D]')
+        self.month = (self.game_date.astype('datetime64[M]').astype(np.int64) % 12 + 1).astype(np.int8)
+        self.edge = games['ESPNEdge'].to_numpy(np.float64)
+        self.abs_edge = np.abs(self.edge)
+        self.closing_line = games['ClosingLine'].to_numpy(np.float64)
+        self.espn_line = games['ESPNLine'].to_numpy(np.float64)
+        self.margin = pd.to_numeric(games['ActualMargin']).to_numpy(np.float64)
+        self.home_score = pd.to_numeric(games['HomeScore']).to_numpy(np.float64)
+        self.road_score = pd.to_numeric(games['RoadScore']).to_numpy(np.float64)
+        self.home_team = games['HomeTeam'].to_numpy(object)
+        self.road_team = games['RoadTeam'].to_numpy(object)
+
+        result = games['CoverResult'].to_numpy(object)
+        self.cover = np.full(len(games), NO_RESULT, dtype=np.int8)
+        self.cover[result == 'COVERED'] = COVERED
+        self.cover[result == 'MISSED'] = MISSED
+
+        self.covered = self.cover == COVERED
+        self.missed = self.cover == MISSED
+        self.decided = self.cover != NO_RESULT
+
+    def __len__(self):
+        return len(self.edge)
+
+    @classmethod
+    def from_connection(cls, conn):
+        """Load the fact rows from the database in one query"""
+        return cls(pd.read_sql(FACT_QUERY, conn))
+
+    @classmethod
+    def from_csv(cls, csv_dir=PROJECT_ROOT):
+        """Build the fact rows from the season CSVs (no database needed)"""
+        return cls(games_from_csv(csv_dir))
+
+    def _code(self, labels, value):
+        return labels.index(value) if value in labels else -1
+
+    def _mask(self, season=None, min_edge=3, direction='UNDERDOG', month=None, conference_type=None,
+              decided_only=True):
+        """Boolean mask for a filter state (over decided games unless decided_only=False)"""
+        mask = self.abs_edge >= min_edge
+        if decided_only:
+            mask &= self.decided
+        if season is not None:
+            mask &= self.season_code == self._code(self.seasons, season)
+        if month is not None and month != 'ALL':
+            mask &= self.month == int(month)
+        if conference_type is not None and conference_type != 'ALL':
+            mask &= self.conf_code == self._code(self.conference_types, conference_type)
+        if direction == 'UNDERDOG':
+            mask &= self.edge > 0
+        elif direction == 'FAVORITE':
+            mask &= self.edge < 0
+        return mask
+
+    def _grouped(self, mask, codes, n_groups):
+        wins = np.bincount(codes[mask & self.covered], minlength=n_groups)
+        losses = np.bincount(codes[mask & self.missed], minlength=n_groups)
+        return summarize(wins, losses)
+
+    def get_strategy_comparison(self, season=None, min_edge=3, conference_type=None, direction='UNDERDOG', month=None):
+        """Get ESPN vs Closing Line performance"""
+        mask = self._mask(season, min_edge, direction, month, conference_type)
+        totals = summarize(np.count_nonzero(mask & self.covered), np.count_nonzero(mask & self.missed))
+
+        if totals['Games'] == 0:
+            return pd.DataFrame(columns=['Strategy', 'Games', 'Wins', 'Losses', 'WinPct', 'Profit'])
+
+        return pd.DataFrame([{'Strategy': 'ESPN vs Line', **{k: v.item() for k, v in totals.items()}}])
+
+    def get_performance_by_season(self, season=None, min_edge=3, direction='UNDERDOG', month=None):
+        """Get performance data filtered by season"""
+        mask = self._mask(season, min_edge, direction, month)
+        totals = self._grouped(mask, self.season_code, len(self.seasons))
+
+        df = pd.DataFrame({'SeasonYear': self.seasons, **totals}).rename(columns={'Games': 'TotalGames'})
+        return df[df['TotalGames'] > 0].reset_index(drop=True)
+
+    def get_conference_comparison(self, season=None, min_edge=3, direction='UNDERDOG', month=None):
+        """Get performance by conference type - shows all types for comparison"""
+        mask = self._mask(season, min_edge, direction, month)
+        totals = self._grouped(mask, self.conf_code, len(self.conference_types))
+
+        df = pd.DataFrame({'ConferenceType': self.conference_types, **totals}).rename(columns={'Games': 'TotalGames'})
+        df = df[(df['TotalGames'] > 0) & (df['ConferenceType'] != 'Unknown')]
+        return df.sort_values('WinPct', ascending=False).reset_index(drop=True)
+
+    def get_filtered_games(self, season=None, min_edge=3, direction='UNDERDOG', month=None):
+        """Get the decided games matching the shared filters"""
+        rows = np.flatnonzero(self._mask(season, min_edge, direction, month))
+        return pd.DataFrame({
+            'SeasonYear': np.array(self.seasons, dtype=object)[self.season_code[rows]],
+            'ConferenceType': np.array(self.conference_types, dtype=object)[self.conf_code[rows]],
+            'CoverResult': np.where(self.covered[rows], 'COVERED', 'MISSED'),
+            'AbsESPNEdge': self.abs_edge[rows],
+        })
+
+    def get_recent_picks(self, season=None, limit=20):
+        """Get recent ESPN picks"""
+        mask = self.abs_edge >= VIEW_MIN_EDGE
+        if season is not None:
+            mask &= self.season_code == self._code(self.seasons, season)
+
+        rows = np.flatnonzero(mask)
+        # Newest first; GameID breaks ties so the order is stable
+        order = np.lexsort((-self.game_id[rows], -self.game_date[rows].astype(np.int64)))
+        rows = rows[order[:limit]]
+
+        return self._pick_rows(rows).drop(columns=['GameID'])
+
+    def _pick_rows(self, rows):
+        result = np.array([None, 'MISSED', 'COVERED'], dtype=object)[self.cover[rows] + 1]
+        return pd.DataFrame({
+            'GameID': self.game_id[rows],
+            'GameDate': self.game_date[rows],
+            'HomeTeam': self.home_team[rows],
+            'RoadTeam': self.road_team[rows],
+            'ClosingLine': self.closing_line[rows],
+            'ESPNLine': self.espn_line[rows],
+            'ESPNEdge': self.edge[rows],
+            'HomeScore': pd.array(self.home_score[rows], dtype='Int64'),
+            'RoadScore': pd.array(self.road_score[rows], dtype='Int64'),
+            'CoverResult': result,
+        })
+
+    def get_recent_picks_page(self, season=None, min_edge=3, conference_type=None, direction='UNDERDOG', month=None,
+                              sort_column='GameDate', descending=True, after=None, offset=0, page_size=20):
+        """Get one page of ESPN picks ordered by (sort_column, GameID), starting after the cursor"""
+        columns = {
+            'GameDate': self.game_date.astype(np.int64).astype(np.float64),
+            'ClosingLine': self.closing_line,
+            'ESPNLine': self.espn_line,
+            'ESPNEdge': self.edge,
+        }
+        key = columns.get(sort_column, columns['GameDate'])
+        if sort_column not in columns:
+            sort_column = 'GameDate'
+
+        mask = self._mask(season, min_edge, direction, month, conference_type, decided_only=False)
+
+        if after is not None:
+            value = after[0]
+            if sort_column == 'GameDate':
+                value = float(np.datetime64(str(value)[:10], 'D').astype(np.int64))
+            value, game_id = float(value), int(after[1])
+            if descending:
+                mask &= (key < value) | ((key == value) & (self.game_id < game_id))
+            else:
+                mask &= (key > value) | ((key == value) & (self.game_id > game_id))
+            offset = 0
+
+        rows = np.flatnonzero(mask)
+        sign = -1 if descending else 1
+        order = np.lexsort((sign * self.game_id[rows], sign * key[rows]))
+        return self._pick_rows(rows[order[offset:offset + page_size]])
+
+    def count_recent_picks(self, season=None, min_edge=3, conference_type=None, direction='UNDERDOG', month=None):
+        """Get the number of ESPN picks matching the filters"""
+        return int(np.count_nonzero(self._mask(season, min_edge, direction, month, conference_type,
+                                               decided_only=False)))
+
+    def get_available_seasons(self):
+        """Get list of available seasons"""
+        return list(self.seasons)
+
+    def cube_rows(self):
+        """
+        Aggregate the fact rows into FilterCube input (same shape as CUBE_QUERY)
+
+        Returns:
+            DataFrame with one row per non-empty (season, month, conference, direction, |edge|) cell
+        """
+        decided = self.decided
+        direction = np.where(self.edge > 0, 0, np.where(self.edge < 0, 1, 2))[decided]
+        edge_cents = np.rint(self.abs_edge[decided] * 100).astype(np.int64)
+        max_edge = int(edge_cents.max()) + 1 if len(edge_cents) else 1
+
+        dims = (len(self.seasons), 12, len(self.conference_types), len(DIRECTIONS), max_edge)
+        cell = np.ravel_multi_index(
+            (self.season_code[decided], self.month[decided] - 1, self.conf_code[decided], direction, edge_cents),
+            dims,
+        )
+        size = int(np.prod(dims))
+        wins = np.bincount(cell, weights=self.covered[decided], minlength=size).astype(np.int64)
+        losses = np.bincount(cell, weights=self.missed[decided], minlength=size).astype(np.int64)
+
+        occupied = np.flatnonzero(wins + losses)
+        season, month, conf, dirn, edge = np.unravel_index(occupied, dims)
+        return pd.DataFrame({
+            'SeasonYear': np.array(self.seasons, dtype=object)[season],
+            'GameMonth': month + 1,
+            'ConferenceType': np.array(self.conference_types, dtype=object)[conf],
+            'Direction': np.array(DIRECTIONS, dtype=object)[dirn],
+            'AbsEdge': edge / 100,
+            'Wins': wins[occupied],
+            'Losses': losses[occupied],
+        })
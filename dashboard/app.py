@@ -3,307 +3,562 @@ ESPN Strategy Dashboard - Interactive Web Application
 Deploy to Azure: az webapp up --name espn-strategy-dashboard --runtime PYTHON:3.11
 """
 
+import os
+import sys
+import json
+import math
 import dash
-from dash import dcc, html, Input, Output, dash_table
+from dash import dcc, html, Input, Output, State, dash_table
+from dash.dependencies import ClientsideFunction
+from dash.exceptions import PreventUpdate
+from flask import Response, g, jsonify, request
 import plotly.graph_objs as go
 import plotly.express as px
 import pandas as pd
-import pyodbc
+import numpy as np
+import logging
+import threading
+import time
 from datetime import datetime
-
-# Database connection
+from pathlib import Path
+
+# Add dashboard to path
+sys.path.append(str(Path(__file__).parent))
+
+from db_pool import ConnectionPool
+import storage
+from analytics_engine import AnalyticsEngine, VIEW_MIN_EDGE
+from data_version import VersionedValue, track_database
+from filter_cube import FilterCube, games_at_edge, profit_curve_from_games, summarize_games
+from query_cache import QueryCache, cached_query
+import query_builder
+from query_builder import run_query
+import metrics
+from metrics import instrumented
+
+# DASHBOARD_LOG_LEVEL=DEBUG also logs SQL compile time and plan reuse per query
+logging.basicConfig(level=os.getenv('DASHBOARD_LOG_LEVEL', 'INFO').upper())
+
+# Database connection (DB_BACKEND=sqlserver or sqlite, see storage.py)
 def get_connection():
-    """Create SQL Server connection"""
-    conn_str = (
-        'DRIVER={ODBC Driver 17 for SQL Server};'
-        'SERVER=MSI\\SQLEXPRESS;'
-        'DATABASE=SportsAnalytics;'
-        'Trusted_Connection=yes;'
-    )
-    return pyodbc.connect(conn_str)
+    """Create a connection to the configured database"""
+    # Dashboard queries are read-only, so skip per-query transactions
+    return storage.connect(autocommit=True)
+
+# Shared connection pool used by every data function
+db_pool = ConnectionPool(
+    get_connection,
+    max_size=int(os.getenv('DB_POOL_SIZE', '5')),
+    max_idle=int(os.getenv('DB_POOL_MAX_IDLE', '300')),
+    acquire_timeout=int(os.getenv('DB_POOL_TIMEOUT', '10')),
+)
+
+# Result cache in front of the get_* queries (cleared when an import bumps the data version)
+query_cache = QueryCache(
+    max_entries=int(os.getenv('QUERY_CACHE_SIZE', '256')),
+    ttl=int(os.getenv('QUERY_CACHE_TTL', '600')),
+)
 
-# Data fetching functions
+# Data backend for the get_* functions:
+#   sql     - query the database per filter (default; SQL Server or SQLite per DB_BACKEND)
+#   numpy   - load vw_ESPNvsClosingLine once from the database and answer in memory
+#   offline - build the same arrays from the season CSVs, no database needed
+DATA_BACKEND = os.getenv('DASHBOARD_BACKEND', 'sql').lower()
+CSV_DIR = Path(os.getenv('DASHBOARD_CSV_DIR', Path(__file__).parent.parent))
+
+# Chart rendering:
+#   server - build figures and tables in Python on every filter change (default)
+#   client - send the filter cube to the browser once; assets/clientside.js slices
+#            and renders it, so filter changes never reach the server for the charts
+CLIENTSIDE_RENDERING = os.getenv('DASHBOARD_RENDERING', 'server').lower() == 'client'
+
+def _load_analytics_engine():
+    if DATA_BACKEND == 'offline':
+        return AnalyticsEngine.from_csv(CSV_DIR)
+    with db_pool.connection() as conn:
+        return AnalyticsEngine.from_connection(conn)
+
+def _load_filter_cube():
+    if DATA_BACKEND != 'sql':
+        engine = get_analytics_engine()
+        if engine is None:
+            raise RuntimeError("Analytics engine unavailable")
+        return FilterCube(engine.cube_rows())
+    with db_pool.connection() as conn:
+        return FilterCube.from_connection(conn)
+
+def _database_data_version():
+    row = run_query(db_pool, query_builder.data_version()).iloc[0]
+    return tuple(str(value) for value in row)
+
+# Imports from another host only show up in the database, so follow its version too
+if DATA_BACKEND != 'offline':
+    track_database(_database_data_version)
+
+# Both are rebuilt when an import bumps the data version
+_analytics_engine = VersionedValue(_load_analytics_engine, 'analytics engine')
+_filter_cube = VersionedValue(_load_filter_cube, 'filter cube')
+
+def get_analytics_engine():
+    """Return the in-memory fact arrays, loading them on first use and after imports"""
+    return _analytics_engine.get()
+
+def get_filter_cube():
+    """Return the filter cube, building it on first use and after imports (None if the build fails)"""
+    return _filter_cube.get()
+
+# Data fetching functions (SQL lives in query_builder; every filter is a ? parameter)
+@instrumented('query')
+@cached_query(query_cache)
 def get_strategy_comparison(season=None, min_edge=3, conference_type=None, direction='UNDERDOG', month=None):
     """Get ESPN vs Closing Line performance"""
-    conn = get_connection()
-
-    season_filter = f"AND v.SeasonYear = '{season}'" if season else ""
-    month_filter = f"AND MONTH(v.GameDate) = {month}" if month and month != 'ALL' else ""
-    conf_join = ""
-    conf_filter = ""
-    direction_filter = ""
-
-    if conference_type and conference_type != 'ALL':
-        conf_join = "INNER JOIN dbo.vw_GamesWithConferences c ON v.GameID = c.GameID"
-        conf_filter = f"AND c.HomeConferenceType = '{conference_type}'"
-
-    # Direction filter: UNDERDOG (ESPNEdge > 0), FAVORITE (ESPNEdge < 0), BOTH (no filter)
-    if direction == 'UNDERDOG':
-        direction_filter = "AND v.ESPNEdge > 0"
-    elif direction == 'FAVORITE':
-        direction_filter = "AND v.ESPNEdge < 0"
-    # BOTH = no filter
-
-    query = f"""
-    SELECT
-        'ESPN vs Line' AS Strategy,
-        COUNT(*) AS Games,
-        SUM(CASE WHEN v.CoverResult = 'COVERED' THEN 1 ELSE 0 END) AS Wins,
-        SUM(CASE WHEN v.CoverResult = 'MISSED' THEN 1 ELSE 0 END) AS Losses,
-        CAST(SUM(CASE WHEN v.CoverResult = 'COVERED' THEN 1 ELSE 0 END) AS FLOAT) /
-            SUM(CASE WHEN v.CoverResult IN ('COVERED', 'MISSED') THEN 1 ELSE 0 END) * 100 AS WinPct,
-        (SUM(CASE WHEN v.CoverResult = 'COVERED' THEN 1 ELSE 0 END) * 100) -
-        (SUM(CASE WHEN v.CoverResult = 'MISSED' THEN 1 ELSE 0 END) * 110) AS Profit
-    FROM dbo.vw_ESPNvsClosingLine v
-    {conf_join}
-    WHERE ABS(v.ESPNEdge) >= {min_edge} AND v.CoverResult IS NOT NULL {season_filter} {month_filter} {conf_filter} {direction_filter}
-    """
-    df = pd.read_sql(query, conn)
-    conn.close()
-    return df
+    return run_query(db_pool, query_builder.strategy_comparison(season, min_edge, conference_type, direction, month))
 
+@instrumented('query')
+@cached_query(query_cache)
 def get_performance_by_season(season=None, min_edge=3, direction='UNDERDOG', month=None):
     """Get performance data filtered by season"""
-    conn = get_connection()
-
-    season_filter = f"AND SeasonYear = '{season}'" if season else ""
-    month_filter = f"AND MONTH(GameDate) = {month}" if month and month != 'ALL' else ""
-    direction_filter = ""
-
-    if direction == 'UNDERDOG':
-        direction_filter = "AND ESPNEdge > 0"
-    elif direction == 'FAVORITE':
-        direction_filter = "AND ESPNEdge < 0"
-
-    query = f"""
-    SELECT
-        SeasonYear,
-        COUNT(*) AS TotalGames,
-        SUM(CASE WHEN CoverResult = 'COVERED' THEN 1 ELSE 0 END) AS Wins,
-        SUM(CASE WHEN CoverResult = 'MISSED' THEN 1 ELSE 0 END) AS Losses,
-        CAST(SUM(CASE WHEN CoverResult = 'COVERED' THEN 1 ELSE 0 END) AS FLOAT) /
-            SUM(CASE WHEN CoverResult IN ('COVERED', 'MISSED') THEN 1 ELSE 0 END) * 100 AS WinPct,
-        (SUM(CASE WHEN CoverResult = 'COVERED' THEN 1 ELSE 0 END) * 100) -
-        (SUM(CASE WHEN CoverResult = 'MISSED' THEN 1 ELSE 0 END) * 110) AS Profit
-    FROM dbo.vw_ESPNvsClosingLine
-    WHERE ABS(ESPNEdge) >= {min_edge} AND CoverResult IS NOT NULL {season_filter} {month_filter} {direction_filter}
-    GROUP BY SeasonYear
-    ORDER BY SeasonYear
-    """
-    df = pd.read_sql(query, conn)
-    conn.close()
-    return df
+    return run_query(db_pool, query_builder.performance_by_season(season, min_edge, direction, month))
 
+@instrumented('query')
 def get_available_seasons():
     """Get list of available seasons"""
-    conn = get_connection()
-    df = pd.read_sql("SELECT DISTINCT SeasonYear FROM dbo.Seasons WHERE SportID = 1 ORDER BY SeasonYear", conn)
-    conn.close()
+    df = run_query(db_pool, query_builder.available_seasons())
     return df['SeasonYear'].tolist()
 
+@instrumented('query')
+@cached_query(query_cache)
 def get_recent_picks(season=None, limit=20):
     """Get recent ESPN picks"""
-    conn = get_connection()
-
-    season_filter = f"AND SeasonYear = '{season}'" if season else ""
-
-    query = f"""
-    SELECT TOP {limit}
-        GameDate,
-        HomeTeam,
-        RoadTeam,
-        ClosingLine,
-        ESPNLine,
-        ESPNEdge,
-        HomeScore,
-        RoadScore,
-        CoverResult
-    FROM dbo.vw_ESPNvsClosingLine
-    WHERE ABS(ESPNEdge) >= 3 {season_filter}
-    ORDER BY GameDate DESC
+    return run_query(db_pool, query_builder.recent_picks(season, limit))
+
+# Recent Picks paging: sortable columns (all NOT NULL in the view) and rows per page
+RECENT_PICK_SORT_COLUMNS = query_builder.RECENT_PICK_SORT_COLUMNS
+RECENT_PICKS_PAGE_SIZE = 20
+RECENT_PICK_COLUMNS = ['GameDate', 'Matchup', 'Score', 'ClosingLine', 'ESPNLine', 'ESPNEdge', 'CoverResult']
+
+@instrumented('query')
+def get_recent_picks_page(season=None, min_edge=3, conference_type=None, direction='UNDERDOG', month=None,
+                          sort_column='GameDate', descending=True, after=None, offset=0,
+                          page_size=RECENT_PICKS_PAGE_SIZE):
     """
-    df = pd.read_sql(query, conn)
-    conn.close()
-    return df
+    Get one page of ESPN picks with keyset pagination on (sort_column, GameID)
 
+    Args:
+        after: [sort value, GameID] of the last row on the previous page; the page
+               starts right after it, so deep pages cost the same as the first
+        offset: Rows to skip when no cursor is known (e.g. jumping straight to page 40)
+
+    Returns:
+        DataFrame of picks including GameID
+    """
+    return run_query(db_pool, query_builder.recent_picks_page(
+        season, min_edge, conference_type, direction, month,
+        sort_column=sort_column, descending=descending, after=after, offset=offset, page_size=page_size,
+    ))
+
+@instrumented('query')
+@cached_query(query_cache)
+def count_recent_picks(season=None, min_edge=3, conference_type=None, direction='UNDERDOG', month=None):
+    """Get the number of ESPN picks matching the filters (for the page count)"""
+    df = run_query(db_pool, query_builder.recent_picks_count(season, min_edge, conference_type, direction, month))
+    return int(df['Picks'].iloc[0])
+
+@instrumented('query')
+@cached_query(query_cache)
 def get_conference_comparison(season=None, min_edge=3, direction='UNDERDOG', month=None):
     """Get performance by conference type - shows all types for comparison"""
-    conn = get_connection()
-
-    season_filter = f"AND v.SeasonYear = '{season}'" if season else ""
-    month_filter = f"AND MONTH(v.GameDate) = {month}" if month and month != 'ALL' else ""
-    direction_filter = ""
-
-    if direction == 'UNDERDOG':
-        direction_filter = "AND v.ESPNEdge > 0"
-    elif direction == 'FAVORITE':
-        direction_filter = "AND v.ESPNEdge < 0"
-
-    query = f"""
-    SELECT
-        c.HomeConferenceType AS ConferenceType,
-        COUNT(*) AS TotalGames,
-        SUM(CASE WHEN v.CoverResult = 'COVERED' THEN 1 ELSE 0 END) AS Wins,
-        SUM(CASE WHEN v.CoverResult = 'MISSED' THEN 1 ELSE 0 END) AS Losses,
-        CAST(SUM(CASE WHEN v.CoverResult = 'COVERED' THEN 1 ELSE 0 END) AS FLOAT) /
-            NULLIF(SUM(CASE WHEN v.CoverResult IN ('COVERED', 'MISSED') THEN 1 ELSE 0 END), 0) * 100 AS WinPct,
-        (SUM(CASE WHEN v.CoverResult = 'COVERED' THEN 1 ELSE 0 END) * 100) -
-        (SUM(CASE WHEN v.CoverResult = 'MISSED' THEN 1 ELSE 0 END) * 110) AS Profit
-    FROM dbo.vw_ESPNvsClosingLine v
-    INNER JOIN dbo.vw_GamesWithConferences c ON v.GameID = c.GameID
-    WHERE ABS(v.ESPNEdge) >= {min_edge} AND v.CoverResult IS NOT NULL
-        AND c.HomeConferenceType != 'Unknown' {season_filter} {month_filter} {direction_filter}
-    GROUP BY c.HomeConferenceType
-    ORDER BY WinPct DESC
-    """
-    df = pd.read_sql(query, conn)
-    conn.close()
-    return df
+    return run_query(db_pool, query_builder.conference_comparison(season, min_edge, direction, month))
+
+@instrumented('query')
+@cached_query(query_cache)
+def get_filtered_games(season=None, min_edge=3, direction='UNDERDOG', month=None):
+    """Get the decided games matching the shared filters (one row per game)"""
+    return run_query(db_pool, query_builder.filtered_games(season, min_edge, direction, month))
+
+def _engine_backed(name):
+    """Route a get_* function to the in-memory analytics engine"""
+    def call(*args, **kwargs):
+        engine = get_analytics_engine()
+        if engine is None:
+            raise RuntimeError(f"{DATA_BACKEND} backend is not available")
+        return getattr(engine, name)(*args, **kwargs)
+    call.__name__ = name
+    return instrumented('query')(call)
+
+# In-memory backends are drop-in replacements with the same signatures
+if DATA_BACKEND in ('numpy', 'offline'):
+    get_strategy_comparison = _engine_backed('get_strategy_comparison')
+    get_performance_by_season = _engine_backed('get_performance_by_season')
+    get_available_seasons = _engine_backed('get_available_seasons')
+    get_recent_picks = _engine_backed('get_recent_picks')
+    get_recent_picks_page = _engine_backed('get_recent_picks_page')
+    count_recent_picks = _engine_backed('count_recent_picks')
+    get_conference_comparison = _engine_backed('get_conference_comparison')
+    get_filtered_games = _engine_backed('get_filtered_games')
+
+# Season list for the layout, loaded by the background warmup
+_available_seasons = VersionedValue(lambda: get_available_seasons(), 'season list')
+
+def get_cached_seasons():
+    """Seasons for the dropdown without waiting on the database ([] until warmup has loaded them)"""
+    if not _available_seasons.is_current():
+        start_warmup()
+    return _available_seasons.peek() or []
+
+# Background warmup: seasons, in-memory data and caches load off the request path
+_warmup_lock = threading.Lock()
+_warmup_thread = None
+_warmup_status = {'started': None, 'finished': None, 'steps': {}}
+
+def _run_warmup():
+    steps = [('seasons', _available_seasons.get)]
+    if DATA_BACKEND != 'sql':
+        steps.append(('analytics_engine', get_analytics_engine))
+    steps += [
+        ('filter_cube', get_filter_cube),
+        ('recent_picks', lambda: count_recent_picks(None)),
+    ]
+
+    _warmup_status['started'] = time.time()
+    _warmup_status['finished'] = None
+    for name, step in steps:
+        started = time.perf_counter()
+        try:
+            ok = step() is not None
+            error = None if ok else 'unavailable (see log)'
+        except Exception as e:
+            ok, error = False, str(e)
+        _warmup_status['steps'][name] = {
+            'ok': ok,
+            'seconds': round(time.perf_counter() - started, 3),
+            'error': error,
+        }
+    _warmup_status['finished'] = time.time()
+
+def start_warmup():
+    """Start the background warmup unless one is already running"""
+    global _warmup_thread
+    with _warmup_lock:
+        if _warmup_thread is not None and _warmup_thread.is_alive():
+            return
+        _warmup_thread = threading.Thread(target=_run_warmup, name='dashboard-warmup', daemon=True)
+        _warmup_thread.start()
+
+def is_ready():
+    """True once the seasons and the filter cube are loaded"""
+    return _available_seasons.peek() is not None and _filter_cube.peek() is not None
 
 # Initialize Dash app
 app = dash.Dash(__name__, suppress_callback_exceptions=True)
 server = app.server  # For Azure deployment
 
-# App layout
-app.layout = html.Div([
-    html.Div([
-        html.H1('ESPN BPI vs Closing Line Dashboard',
-                style={'textAlign': 'center', 'color': '#2c3e50', 'marginBottom': 10}),
-        html.H3('NCAA Basketball Betting Strategy Analysis',
-                style={'textAlign': 'center', 'color': '#7f8c8d', 'marginTop': 0}),
-    ], style={'backgroundColor': '#ecf0f1', 'padding': '20px'}),
-
-    # Filters
-    html.Div([
-        html.Div([
-            html.Label('Season Filter:', style={'fontWeight': 'bold'}),
-            dcc.Dropdown(
-                id='season-dropdown',
-                options=[{'label': 'All Seasons', 'value': 'ALL'}] +
-                        [{'label': season, 'value': season} for season in get_available_seasons()],
-                value='ALL',
-                style={'width': '200px'}
-            ),
-        ], style={'display': 'inline-block', 'marginRight': '20px'}),
+@server.route('/ready')
+def readiness():
+    """Readiness probe: 200 once warmed up, 503 while still loading"""
+    ready = is_ready()
+    body = {
+        'ready': ready,
+        'backend': DATA_BACKEND,
+        'warmup': _warmup_status,
+        'query_cache': query_cache.stats(),
+    }
+    # The offline backend reads the CSVs and never opens the database
+    if DATA_BACKEND != 'offline':
+        body['storage'] = storage.get_backend().describe()
+        body['pool'] = db_pool.stats()
+    return jsonify(body), 200 if ready else 503
+
+# Pool and cache counters alongside the latency histograms on /metrics
+metrics.register(metrics.Gauge('dashboard_db_pool', 'Connection pool counters', db_pool.stats))
+metrics.register(metrics.Gauge('dashboard_query_cache', 'Query result cache counters', query_cache.stats))
+
+@server.route('/metrics')
+def prometheus_metrics():
+    """Prometheus scrape endpoint (per worker process)"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+# Whole callback requests: the gap between this and the callback's own time is
+# Dash/Plotly JSON serialization and framework overhead
+@server.before_request
+def _start_request_timer():
+    g.request_started = time.perf_counter()
+
+@server.after_request
+def _record_request_time(response):
+    if request.path.endswith('/_dash-update-component') and 'request_started' in g:
+        output = (request.get_json(silent=True) or {}).get('output', 'unknown')
+        metrics.request_seconds.observe(time.perf_counter() - g.request_started, output)
+        metrics.response_bytes.observe(response.calculate_content_length() or 0, output)
+    return response
+
+# App layout (built per page load so it never waits on the database)
+# Minimum edge slider range; the threshold curve is drawn at every slider step.
+# Starts at the views' own |ESPNEdge| floor: no row below it ever reaches the dashboard.
+EDGE_SLIDER_MIN = VIEW_MIN_EDGE
+EDGE_SLIDER_MAX = 15
+EDGE_SLIDER_STEP = 0.1
+EDGE_THRESHOLDS = np.round(np.arange(EDGE_SLIDER_MIN, EDGE_SLIDER_MAX + EDGE_SLIDER_STEP / 2, EDGE_SLIDER_STEP), 1)
+
+def _summary_table(table_id, columns, data=None):
+    """Summary DataTable styled like the strategy and conference tables"""
+    return dash_table.DataTable(
+        id=table_id,
+        data=data or [],
+        columns=[{'name': i, 'id': i} for i in columns],
+        style_cell={'textAlign': 'left', 'padding': '10px'},
+        style_header={'backgroundColor': '#3498db', 'color': 'white', 'fontWeight': 'bold'},
+        style_data_conditional=[
+            {
+                'if': {'row_index': 0},
+                'backgroundColor': '#d5f4e6',
+                'fontWeight': 'bold'
+            }
+        ]
+    )
 
+def serve_layout():
+    """Build the page; seasons come from the warmed-up cache"""
+    seasons = get_cached_seasons()
+    season_range = f'{seasons[0]} through {seasons[-1]}' if seasons else '2021-22 through 2023-24'
+
+    return html.Div([
         html.Div([
-            html.Label('Minimum Edge:', style={'fontWeight': 'bold'}),
-            dcc.Dropdown(
-                id='edge-dropdown',
-                options=[
-                    {'label': '1+ points', 'value': 1},
-                    {'label': '2+ points', 'value': 2},
-                    {'label': '3+ points', 'value': 3},
-                    {'label': '4+ points', 'value': 4},
-                    {'label': '5+ points', 'value': 5},
-                    {'label': '7+ points', 'value': 7},
-                ],
-                value=3,
-                style={'width': '150px'}
-            ),
-        ], style={'display': 'inline-block', 'marginRight': '20px'}),
+            html.H1('ESPN BPI vs Closing Line Dashboard',
+                    style={'textAlign': 'center', 'color': '#2c3e50', 'marginBottom': 10}),
+            html.H3('NCAA Basketball Betting Strategy Analysis',
+                    style={'textAlign': 'center', 'color': '#7f8c8d', 'marginTop': 0}),
+        ], style={'backgroundColor': '#ecf0f1', 'padding': '20px'}),
+
+        # Data for the charts: the whole cube once (client rendering) or the
+        # current filter state's aggregates (server rendering)
+        *([dcc.Store(id='cube-payload'), dcc.Interval(id='cube-payload-poll', interval=2000)]
+          if CLIENTSIDE_RENDERING else [dcc.Store(id='filtered-data')]),
+
+        # Filters
+        html.Div([
+            html.Div([
+                html.Label('Season Filter:', style={'fontWeight': 'bold'}),
+                dcc.Dropdown(
+                    id='season-dropdown',
+                    options=[{'label': 'All Seasons', 'value': 'ALL'}] +
+                            [{'label': season, 'value': season} for season in seasons],
+                    value='ALL',
+                    style={'width': '200px'}
+                ),
+            ], style={'display': 'inline-block', 'marginRight': '20px'}),
+
+            html.Div([
+                html.Label('Minimum Edge:', style={'fontWeight': 'bold'}),
+                dcc.Slider(
+                    id='edge-slider',
+                    min=EDGE_SLIDER_MIN,
+                    max=EDGE_SLIDER_MAX,
+                    step=EDGE_SLIDER_STEP,
+                    value=3,
+                    marks={edge: f'{edge}+' for edge in [3, 5, 7, 10, 15]},
+                    tooltip={'placement': 'bottom', 'always_visible': True},
+                    updatemode='mouseup',
+                ),
+            ], style={'display': 'inline-block', 'width': '320px', 'verticalAlign': 'top', 'marginRight': '20px'}),
+
+            html.Div([
+                html.Label('ESPN Favors:', style={'fontWeight': 'bold'}),
+                dcc.Dropdown(
+                    id='direction-dropdown',
+                    options=[
+                        {'label': 'Underdog', 'value': 'UNDERDOG'},
+                        {'label': 'Favorite', 'value': 'FAVORITE'},
+                        {'label': 'Both', 'value': 'BOTH'},
+                    ],
+                    value='UNDERDOG',
+                    style={'width': '150px'}
+                ),
+            ], style={'display': 'inline-block', 'marginRight': '20px'}),
+
+            html.Div([
+                html.Label('Conference Type:', style={'fontWeight': 'bold'}),
+                dcc.Dropdown(
+                    id='conference-dropdown',
+                    options=[
+                        {'label': 'All Conferences', 'value': 'ALL'},
+                        {'label': 'Major (Power 6)', 'value': 'Major'},
+                        {'label': 'Mid-Major', 'value': 'Mid-Major'},
+                        {'label': 'Minor', 'value': 'Minor'},
+                    ],
+                    value='ALL',
+                    style={'width': '200px'}
+                ),
+            ], style={'display': 'inline-block', 'marginRight': '20px'}),
+
+            html.Div([
+                html.Label('Month:', style={'fontWeight': 'bold'}),
+                dcc.Dropdown(
+                    id='month-dropdown',
+                    options=[
+                        {'label': 'All Months', 'value': 'ALL'},
+                        {'label': 'November', 'value': 11},
+                        {'label': 'December', 'value': 12},
+                        {'label': 'January', 'value': 1},
+                        {'label': 'February', 'value': 2},
+                        {'label': 'March', 'value': 3},
+                        {'label': 'April', 'value': 4},
+                    ],
+                    value='ALL',
+                    style={'width': '150px'}
+                ),
+            ], style={'display': 'inline-block'}),
+
+        ], style={'padding': '20px', 'backgroundColor': '#f8f9fa'}),
+
+        # Strategy Comparison Section
+        html.Div([
+            html.H2('Strategy Comparison', style={'color': '#2c3e50'}),
+            html.P('Comparing ESPN predictions against different benchmarks',
+                   style={'color': '#7f8c8d'}),
+            dcc.Graph(id='strategy-comparison-chart'),
+            html.Div(id='strategy-table', children=_summary_table(
+                'strategy-data-table', ['Strategy', 'Games', 'Wins', 'Losses', 'WinPct', 'Profit'])
+                if CLIENTSIDE_RENDERING else None),
+        ], style={'padding': '20px', 'backgroundColor': 'white', 'margin': '20px', 'borderRadius': '5px', 'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'}),
+
+        # Profit vs Edge Threshold
+        html.Div([
+            html.H2('Profit vs Edge Threshold', style={'color': '#2c3e50'}),
+            html.P('Profit and win rate at every minimum edge for the current filters',
+                   style={'color': '#7f8c8d'}),
+            dcc.Graph(id='threshold-curve-chart'),
+        ], style={'padding': '20px', 'backgroundColor': 'white', 'margin': '20px', 'borderRadius': '5px', 'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'}),
 
+        # Performance by Season
         html.Div([
-            html.Label('ESPN Favors:', style={'fontWeight': 'bold'}),
-            dcc.Dropdown(
-                id='direction-dropdown',
-                options=[
-                    {'label': 'Underdog', 'value': 'UNDERDOG'},
-                    {'label': 'Favorite', 'value': 'FAVORITE'},
-                    {'label': 'Both', 'value': 'BOTH'},
-                ],
-                value='UNDERDOG',
-                style={'width': '150px'}
-            ),
-        ], style={'display': 'inline-block', 'marginRight': '20px'}),
+            html.H2('Performance by Season', style={'color': '#2c3e50'}),
+            dcc.Graph(id='season-performance-chart'),
+        ], style={'padding': '20px', 'backgroundColor': 'white', 'margin': '20px', 'borderRadius': '5px', 'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'}),
 
+        # Conference Performance Comparison
         html.Div([
-            html.Label('Conference Type:', style={'fontWeight': 'bold'}),
-            dcc.Dropdown(
-                id='conference-dropdown',
-                options=[
-                    {'label': 'All Conferences', 'value': 'ALL'},
-                    {'label': 'Major (Power 6)', 'value': 'Major'},
-                    {'label': 'Mid-Major', 'value': 'Mid-Major'},
-                    {'label': 'Minor', 'value': 'Minor'},
+            html.H2('Performance by Conference Type', style={'color': '#2c3e50'}),
+            html.P('Compare win rates across Major, Mid-Major, and Minor conferences',
+                   style={'color': '#7f8c8d'}),
+            dcc.Graph(id='conference-comparison-chart'),
+            html.Div(id='conference-table', children=_summary_table(
+                'conference-data-table', ['Conference Type', 'Games', 'Wins', 'Losses', 'Win %', 'Profit/Loss'])
+                if CLIENTSIDE_RENDERING else None),
+        ], style={'padding': '20px', 'backgroundColor': 'white', 'margin': '20px', 'borderRadius': '5px', 'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'}),
+
+        # Recent Picks
+        html.Div([
+            html.H2('Recent Picks', style={'color': '#2c3e50'}),
+            dcc.Store(id='recent-picks-cursors'),
+            dash_table.DataTable(
+                id='recent-picks-table',
+                columns=[{'name': i, 'id': i} for i in RECENT_PICK_COLUMNS],
+                page_action='custom',
+                page_current=0,
+                page_size=RECENT_PICKS_PAGE_SIZE,
+                sort_action='custom',
+                sort_mode='single',
+                sort_by=[],
+                style_cell={'textAlign': 'left', 'padding': '10px'},
+                style_header={'backgroundColor': '#3498db', 'color': 'white', 'fontWeight': 'bold'},
+                style_data_conditional=[
+                    {
+                        'if': {
+                            'filter_query': '{CoverResult} = "COVERED"',
+                            'column_id': 'CoverResult'
+                        },
+                        'backgroundColor': '#d5f4e6',
+                        'color': 'green',
+                        'fontWeight': 'bold'
+                    },
+                    {
+                        'if': {
+                            'filter_query': '{CoverResult} = "MISSED"',
+                            'column_id': 'CoverResult'
+                        },
+                        'backgroundColor': '#fadbd8',
+                        'color': 'red',
+                        'fontWeight': 'bold'
+                    }
                 ],
-                value='ALL',
-                style={'width': '200px'}
             ),
-        ], style={'display': 'inline-block', 'marginRight': '20px'}),
+        ], style={'padding': '20px', 'backgroundColor': 'white', 'margin': '20px', 'borderRadius': '5px', 'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'}),
 
+        # Footer
         html.Div([
-            html.Label('Month:', style={'fontWeight': 'bold'}),
-            dcc.Dropdown(
-                id='month-dropdown',
-                options=[
-                    {'label': 'All Months', 'value': 'ALL'},
-                    {'label': 'November', 'value': 11},
-                    {'label': 'December', 'value': 12},
-                    {'label': 'January', 'value': 1},
-                    {'label': 'February', 'value': 2},
-                    {'label': 'March', 'value': 3},
-                    {'label': 'April', 'value': 4},
-                ],
-                value='ALL',
-                style={'width': '150px'}
-            ),
-        ], style={'display': 'inline-block'}),
-
-    ], style={'padding': '20px', 'backgroundColor': '#f8f9fa'}),
-
-    # Strategy Comparison Section
-    html.Div([
-        html.H2('Strategy Comparison', style={'color': '#2c3e50'}),
-        html.P('Comparing ESPN predictions against different benchmarks',
-               style={'color': '#7f8c8d'}),
-        dcc.Graph(id='strategy-comparison-chart'),
-        html.Div(id='strategy-table'),
-    ], style={'padding': '20px', 'backgroundColor': 'white', 'margin': '20px', 'borderRadius': '5px', 'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'}),
-
-    # Performance by Season
-    html.Div([
-        html.H2('Performance by Season', style={'color': '#2c3e50'}),
-        dcc.Graph(id='season-performance-chart'),
-    ], style={'padding': '20px', 'backgroundColor': 'white', 'margin': '20px', 'borderRadius': '5px', 'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'}),
-
-    # Conference Performance Comparison
-    html.Div([
-        html.H2('Performance by Conference Type', style={'color': '#2c3e50'}),
-        html.P('Compare win rates across Major, Mid-Major, and Minor conferences',
-               style={'color': '#7f8c8d'}),
-        dcc.Graph(id='conference-comparison-chart'),
-        html.Div(id='conference-table'),
-    ], style={'padding': '20px', 'backgroundColor': 'white', 'margin': '20px', 'borderRadius': '5px', 'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'}),
-
-    # Recent Picks
-    html.Div([
-        html.H2('Recent Picks', style={'color': '#2c3e50'}),
-        html.Div(id='recent-picks-table'),
-    ], style={'padding': '20px', 'backgroundColor': 'white', 'margin': '20px', 'borderRadius': '5px', 'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'}),
-
-    # Footer
-    html.Div([
-        html.P(f'Last updated: {datetime.now().strftime("%Y-%m-%d %H:%M")} | Data: 2021-22 through 2023-24 seasons',
-               style={'textAlign': 'center', 'color': '#95a5a6', 'fontSize': '12px'})
-    ], style={'padding': '20px'}),
-])
+            html.P(f'Last updated: {datetime.now().strftime("%Y-%m-%d %H:%M")} | Data: {season_range} seasons',
+                   style={'textAlign': 'center', 'color': '#95a5a6', 'fontSize': '12px'})
+        ], style={'padding': '20px'}),
+    ])
+
+app.layout = serve_layout
+
+# Store payloads are plain JSON: records plus column order (kept even when empty)
+def _frame_to_store(df):
+    df = df.copy()
+    for column in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[column]):
+            df[column] = df[column].dt.strftime('%Y-%m-%d')
+    df = df.astype(object).where(df.notna(), None)
+    return {'columns': list(df.columns), 'records': df.to_dict('records')}
+
+def _frame_from_store(payload):
+    return pd.DataFrame(payload['records'], columns=payload['columns'])
+
+def server_callback(*args, **kwargs):
+    """app.callback for the server-rendered charts (not registered with client rendering)"""
+    if CLIENTSIDE_RENDERING:
+        return lambda func: func
+    return app.callback(*args, **kwargs)
 
 # Callbacks
-@app.callback(
-    [Output('strategy-comparison-chart', 'figure'),
-     Output('strategy-table', 'children')],
+@server_callback(
+    Output('filtered-data', 'data'),
     [Input('season-dropdown', 'value'),
-     Input('edge-dropdown', 'value'),
+     Input('edge-slider', 'value'),
      Input('direction-dropdown', 'value'),
      Input('conference-dropdown', 'value'),
      Input('month-dropdown', 'value')]
 )
-def update_strategy_comparison(season, min_edge, direction, conference_type, month):
+@instrumented('callback')
+def load_filtered_data(season, min_edge, direction, conference_type, month):
+    """One data access per filter change; every chart and the threshold curve render from the result"""
     season_param = None if season == 'ALL' else season
     conf_param = None if conference_type == 'ALL' else conference_type
     month_param = None if month == 'ALL' else month
-    df = get_strategy_comparison(season_param, min_edge, conf_param, direction, month_param)
+
+    cube = get_filter_cube()
+    if cube is not None:
+        strategy = cube.strategy_comparison(season_param, min_edge, conf_param, direction, month_param)
+        by_season = cube.performance_by_season(season_param, min_edge, direction, month_param)
+        by_conference = cube.conference_comparison(season_param, min_edge, direction, month_param)
+        # One vectorized pass over the sorted-edge index for every slider step
+        curve = cube.profit_curve(EDGE_THRESHOLDS, season_param, conf_param, direction, month_param)
+    else:
+        # Games from the slider's lowest step serve the curve, and the summaries cut them at min_edge
+        games = get_filtered_games(season_param, EDGE_SLIDER_MIN, direction, month_param)
+        strategy, by_season, by_conference = summarize_games(games_at_edge(games, min_edge), conf_param)
+        curve = profit_curve_from_games(games, EDGE_THRESHOLDS, conf_param)
+
+    return {
+        'strategy': _frame_to_store(strategy),
+        'seasons': _frame_to_store(by_season),
+        'conferences': _frame_to_store(by_conference),
+        'curve': _frame_to_store(curve),
+        'min_edge': min_edge,
+    }
+
+@server_callback(
+    [Output('strategy-comparison-chart', 'figure'),
+     Output('strategy-table', 'children')],
+    [Input('filtered-data', 'data')]
+)
+@instrumented('callback')
+def update_strategy_comparison(data):
+    if not data:
+        raise PreventUpdate
+    df = _frame_from_store(data['strategy'])
 
     # Check if dataframe is empty or has no valid data
     if df.empty or len(df) == 0 or df['Profit'].isna().all():
@@ -341,33 +596,19 @@ def update_strategy_comparison(season, min_edge, direction, conference_type, mon
     df_display['WinPct'] = df_display['WinPct'].round(2).astype(str) + '%'
     df_display['Profit'] = df_display['Profit'].apply(lambda x: f'${x:,.0f}')
 
-    table = dash_table.DataTable(
-        data=df_display.to_dict('records'),
-        columns=[{'name': i, 'id': i} for i in df_display.columns],
-        style_cell={'textAlign': 'left', 'padding': '10px'},
-        style_header={'backgroundColor': '#3498db', 'color': 'white', 'fontWeight': 'bold'},
-        style_data_conditional=[
-            {
-                'if': {'row_index': 0},
-                'backgroundColor': '#d5f4e6',
-                'fontWeight': 'bold'
-            }
-        ]
-    )
+    table = _summary_table('strategy-data-table', df_display.columns, df_display.to_dict('records'))
 
     return fig, table
 
-@app.callback(
+@server_callback(
     Output('season-performance-chart', 'figure'),
-    [Input('season-dropdown', 'value'),
-     Input('edge-dropdown', 'value'),
-     Input('direction-dropdown', 'value'),
-     Input('month-dropdown', 'value')]
+    [Input('filtered-data', 'data')]
 )
-def update_season_performance(season, min_edge, direction, month):
-    season_param = None if season == 'ALL' else season
-    month_param = None if month == 'ALL' else month
-    df = get_performance_by_season(season_param, min_edge, direction, month_param)
+@instrumented('callback')
+def update_season_performance(data):
+    if not data:
+        raise PreventUpdate
+    df = _frame_from_store(data['seasons'])
 
     fig = go.Figure()
 
@@ -404,14 +645,58 @@ def update_season_performance(season, min_edge, direction, month):
 
     return fig
 
-@app.callback(
-    Output('recent-picks-table', 'children'),
-    [Input('season-dropdown', 'value')]
+@server_callback(
+    Output('threshold-curve-chart', 'figure'),
+    [Input('filtered-data', 'data')]
 )
-def update_recent_picks(season):
-    season_param = None if season == 'ALL' else season
-    df = get_recent_picks(season_param)
+@instrumented('callback')
+def update_threshold_curve(data):
+    if not data:
+        raise PreventUpdate
+    df = _frame_from_store(data['curve'])
+    min_edge = data['min_edge']
 
+    fig = go.Figure()
+
+    fig.add_trace(go.Scatter(
+        name='Profit/Loss',
+        x=df['MinEdge'],
+        y=df['Profit'],
+        yaxis='y',
+        mode='lines',
+        line=dict(color='#2c3e50', width=3),
+        customdata=df['Games'],
+        hovertemplate='Edge %{x}+: $%{y:,.0f} over %{customdata} games<extra></extra>'
+    ))
+
+    fig.add_trace(go.Scatter(
+        name='Win %',
+        x=df['MinEdge'],
+        y=df['WinPct'],
+        yaxis='y2',
+        mode='lines',
+        line=dict(color='blue', width=2, dash='dot')
+    ))
+
+    fig.add_vline(x=min_edge, line_dash="dash", line_color="gray",
+                  annotation_text=f"Current: {min_edge}+")
+    fig.add_hline(y=0, line_color="#bdc3c7", yref='y')
+
+    fig.update_layout(
+        title='Profit and Win Rate by Minimum Edge',
+        xaxis=dict(title='Minimum Edge (points)'),
+        yaxis=dict(title='Profit/Loss ($)'),
+        yaxis2=dict(title='Win Percentage (%)', overlaying='y', side='right'),
+        hovermode='x unified',
+        height=450,
+        margin=dict(t=80, b=80, l=60, r=60)
+    )
+
+    return fig
+
+@instrumented('format')
+def _format_recent_picks(df):
+    """Display columns for the Recent Picks table"""
     df_display = df.copy()
     df_display['GameDate'] = pd.to_datetime(df_display['GameDate']).dt.strftime('%Y-%m-%d')
 
@@ -425,52 +710,75 @@ def update_recent_picks(season):
         else:
             return f"{row['HomeTeam']} vs {row['RoadTeam']} (Pick'em)"
 
+    if df_display.empty:
+        return pd.DataFrame(columns=RECENT_PICK_COLUMNS)
+
     df_display['Matchup'] = df_display.apply(format_matchup, axis=1)
     df_display['Score'] = df_display['HomeScore'].astype(str) + '-' + df_display['RoadScore'].astype(str)
-    df_display = df_display[['GameDate', 'Matchup', 'Score', 'ClosingLine', 'ESPNLine', 'ESPNEdge', 'CoverResult']]
-
-    table = dash_table.DataTable(
-        data=df_display.to_dict('records'),
-        columns=[{'name': i, 'id': i} for i in df_display.columns],
-        style_cell={'textAlign': 'left', 'padding': '10px'},
-        style_header={'backgroundColor': '#3498db', 'color': 'white', 'fontWeight': 'bold'},
-        style_data_conditional=[
-            {
-                'if': {
-                    'filter_query': '{CoverResult} = "COVERED"',
-                    'column_id': 'CoverResult'
-                },
-                'backgroundColor': '#d5f4e6',
-                'color': 'green',
-                'fontWeight': 'bold'
-            },
-            {
-                'if': {
-                    'filter_query': '{CoverResult} = "MISSED"',
-                    'column_id': 'CoverResult'
-                },
-                'backgroundColor': '#fadbd8',
-                'color': 'red',
-                'fontWeight': 'bold'
-            }
-        ],
-        page_size=20
-    )
-
-    return table
+    df_display = df_display[RECENT_PICK_COLUMNS].astype(object)
+    return df_display.where(df_display.notna(), None)
 
 @app.callback(
-    [Output('conference-comparison-chart', 'figure'),
-     Output('conference-table', 'children')],
+    [Output('recent-picks-table', 'data'),
+     Output('recent-picks-table', 'page_count'),
+     Output('recent-picks-table', 'page_current'),
+     Output('recent-picks-cursors', 'data')],
     [Input('season-dropdown', 'value'),
-     Input('edge-dropdown', 'value'),
+     Input('edge-slider', 'value'),
      Input('direction-dropdown', 'value'),
-     Input('month-dropdown', 'value')]
+     Input('conference-dropdown', 'value'),
+     Input('month-dropdown', 'value'),
+     Input('recent-picks-table', 'page_current'),
+     Input('recent-picks-table', 'sort_by')],
+    [State('recent-picks-cursors', 'data')]
 )
-def update_conference_comparison(season, min_edge, direction, month):
+@instrumented('callback')
+def update_recent_picks(season, min_edge, direction, conference_type, month, page_current, sort_by, cursors):
     season_param = None if season == 'ALL' else season
+    conf_param = None if conference_type == 'ALL' else conference_type
     month_param = None if month == 'ALL' else month
-    df = get_conference_comparison(season_param, min_edge, direction, month_param)
+
+    sort_column, descending = 'GameDate', True
+    if sort_by and sort_by[0]['column_id'] in RECENT_PICK_SORT_COLUMNS:
+        sort_column = sort_by[0]['column_id']
+        descending = sort_by[0]['direction'] == 'desc'
+
+    # Cursors are only valid for the filter/sort state that produced them;
+    # a new state starts over on the first page
+    signature = json.dumps([season, min_edge, direction, conference_type, month, sort_column, descending])
+    if not cursors or cursors.get('signature') != signature:
+        cursors = {'signature': signature, 'pages': {}}
+        page_current = 0
+    page_current = page_current or 0
+
+    df = get_recent_picks_page(
+        season_param, min_edge, conf_param, direction, month_param,
+        sort_column=sort_column, descending=descending,
+        after=cursors['pages'].get(str(page_current)),
+        offset=page_current * RECENT_PICKS_PAGE_SIZE,
+    )
+
+    if not df.empty:
+        last = df.iloc[-1]
+        key = last[sort_column]
+        key = pd.Timestamp(key).strftime('%Y-%m-%d') if sort_column == 'GameDate' else float(key)
+        cursors['pages'][str(page_current + 1)] = [key, int(last['GameID'])]
+
+    total = count_recent_picks(season_param, min_edge, conf_param, direction, month_param)
+    page_count = max(math.ceil(total / RECENT_PICKS_PAGE_SIZE), 1)
+
+    return _format_recent_picks(df).to_dict('records'), page_count, page_current, cursors
+
+@server_callback(
+    [Output('conference-comparison-chart', 'figure'),
+     Output('conference-table', 'children')],
+    [Input('filtered-data', 'data')]
+)
+@instrumented('callback')
+def update_conference_comparison(data):
+    if not data:
+        raise PreventUpdate
+    df = _frame_from_store(data['conferences'])
 
     if df.empty:
         # No data available
@@ -536,21 +844,63 @@ def update_conference_comparison(season, min_edge, direction, month):
         'Profit': 'Profit/Loss'
     }, inplace=True)
 
-    table = dash_table.DataTable(
-        data=df_display.to_dict('records'),
-        columns=[{'name': i, 'id': i} for i in df_display.columns],
-        style_cell={'textAlign': 'left', 'padding': '10px'},
-        style_header={'backgroundColor': '#3498db', 'color': 'white', 'fontWeight': 'bold'},
-        style_data_conditional=[
-            {
-                'if': {'row_index': 0},
-                'backgroundColor': '#d5f4e6',
-                'fontWeight': 'bold'
-            }
-        ]
-    )
+    table = _summary_table('conference-data-table', df_display.columns, df_display.to_dict('records'))
 
     return fig, table
 
+# Client rendering: the cube goes to the browser once, then every filter change
+# is handled by assets/clientside.js without a server round trip
+if CLIENTSIDE_RENDERING:
+    @app.callback(
+        [Output('cube-payload', 'data'),
+         Output('cube-payload-poll', 'disabled')],
+        [Input('cube-payload-poll', 'n_intervals')]
+    )
+    @instrumented('callback')
+    def load_cube_payload(n_intervals):
+        """Send the filter cube once it is built (polls until the warmup finishes)"""
+        cube = get_filter_cube()
+        if cube is None:
+            raise PreventUpdate
+        return cube.to_payload(), True
+
+    chart_filters = [Input('season-dropdown', 'value'),
+                     Input('edge-slider', 'value'),
+                     Input('direction-dropdown', 'value')]
+
+    app.clientside_callback(
+        ClientsideFunction(namespace='dashboard', function_name='strategyComparison'),
+        [Output('strategy-comparison-chart', 'figure'),
+         Output('strategy-data-table', 'data')],
+        [Input('cube-payload', 'data')] + chart_filters +
+        [Input('conference-dropdown', 'value'),
+         Input('month-dropdown', 'value')]
+    )
+    app.clientside_callback(
+        ClientsideFunction(namespace='dashboard', function_name='thresholdCurve'),
+        Output('threshold-curve-chart', 'figure'),
+        [Input('cube-payload', 'data')] + chart_filters +
+        [Input('conference-dropdown', 'value'),
+         Input('month-dropdown', 'value')],
+        State('edge-slider', 'min'),
+        State('edge-slider', 'max'),
+        State('edge-slider', 'step'),
+    )
+    app.clientside_callback(
+        ClientsideFunction(namespace='dashboard', function_name='seasonPerformance'),
+        Output('season-performance-chart', 'figure'),
+        [Input('cube-payload', 'data')] + chart_filters + [Input('month-dropdown', 'value')]
+    )
+    app.clientside_callback(
+        ClientsideFunction(namespace='dashboard', function_name='conferenceComparison'),
+        [Output('conference-comparison-chart', 'figure'),
+         Output('conference-data-table', 'data')],
+        [Input('cube-payload', 'data')] + chart_filters + [Input('month-dropdown', 'value')]
+    )
+
+# Load data in the background so importing this module never waits on the database
+if os.getenv('DASHBOARD_WARMUP', '1') != '0':
+    start_warmup()
+
 if __name__ == '__main__':
     app.run_server(debug=True, host='0.0.0.0', port=8050)
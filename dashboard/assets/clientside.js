@@ -0,0 +1,298 @@
+/*
+ * ESPN Strategy Dashboard - clientside rendering
+ * Slices the filter cube payload (FilterCube.to_payload) in the browser and
+ * builds the charts and summary tables without a server round trip.
+ * Used when the dashboard runs with DASHBOARD_RENDERING=client.
+ */
+
+(function () {
+    var BREAKEVEN_PCT = 52.4;
+
+    function formatMoney(x) {
+        // Same text as Python's f'${x:,.0f}'
+        return '$' + Math.round(x).toLocaleString('en-US');
+    }
+
+    function formatPct(x) {
+        // Same text as Python's str(round(x, 2)) + '%' (whole numbers keep their '.0')
+        var rounded = Math.round(x * 100) / 100;
+        return (Number.isInteger(rounded) ? rounded.toFixed(1) : String(rounded)) + '%';
+    }
+
+    function summarize(wins, losses) {
+        var games = wins + losses;
+        return {
+            Games: games,
+            Wins: wins,
+            Losses: losses,
+            WinPct: games > 0 ? wins / games * 100 : null,
+            Profit: wins * 100 - losses * 110
+        };
+    }
+
+    /*
+     * Sum wins/losses over the rows matching the filters into `size` slots;
+     * slotOf(i) picks row i's slot (omit it for a single total).
+     */
+    function slice(payload, filters, slotOf, size) {
+        var minEdge = Number(filters.minEdge) || 0;
+        var season = filters.season === 'ALL' ? null : payload.seasons.indexOf(filters.season);
+        var month = filters.month === 'ALL' || filters.month === null ? null : Number(filters.month);
+        var direction = payload.directions.indexOf(filters.direction);  // -1 for BOTH
+        var conference = null;
+        if (filters.conference && filters.conference !== 'ALL') {
+            conference = payload.conferenceTypes.indexOf(filters.conference);
+        }
+
+        size = size || 1;
+        var wins = new Array(size).fill(0);
+        var losses = new Array(size).fill(0);
+
+        for (var i = 0; i < payload.wins.length; i++) {
+            if (payload.edge[i] < minEdge - 1e-9) continue;
+            if (season !== null && payload.season[i] !== season) continue;
+            if (month !== null && payload.month[i] !== month) continue;
+            if (direction >= 0 && payload.direction[i] !== direction) continue;
+            if (conference !== null && payload.conference[i] !== conference) continue;
+
+            var slot = slotOf ? slotOf(i) : 0;
+            wins[slot] += payload.wins[i];
+            losses[slot] += payload.losses[i];
+        }
+
+        return {wins: wins, losses: losses};
+    }
+
+    function emptyFigure() {
+        return {
+            data: [],
+            layout: {
+                annotations: [{
+                    text: 'No data available for selected filters',
+                    xref: 'paper', yref: 'paper', x: 0.5, y: 0.5,
+                    showarrow: false, font: {size: 16}
+                }]
+            }
+        };
+    }
+
+    function barColors(values, threshold, above, below) {
+        return values.map(function (x) { return x > threshold ? above : below; });
+    }
+
+    function filtersFrom(season, minEdge, direction, conference, month) {
+        return {season: season, minEdge: minEdge, direction: direction, conference: conference, month: month};
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        dashboard: {
+            strategyComparison: function (payload, season, minEdge, direction, conference, month) {
+                if (!payload) {
+                    throw window.dash_clientside.PreventUpdate;
+                }
+                var sums = slice(payload, filtersFrom(season, minEdge, direction, conference, month));
+                var row = summarize(sums.wins[0], sums.losses[0]);
+
+                if (row.Games === 0) {
+                    return [emptyFigure(), []];
+                }
+
+                var figure = {
+                    data: [{
+                        type: 'bar', name: 'Profit/Loss',
+                        x: ['ESPN vs Line'], y: [row.Profit],
+                        marker: {color: barColors([row.Profit], 0, 'green', 'red')},
+                        text: [formatMoney(row.Profit)], textposition: 'outside'
+                    }],
+                    layout: {
+                        title: {text: 'Profitability Comparison'},
+                        yaxis: {title: {text: 'Profit/Loss (per $100 bet)'}},
+                        showlegend: false,
+                        height: 450,
+                        margin: {t: 80, b: 80, l: 60, r: 40}
+                    }
+                };
+
+                var table = [{
+                    Strategy: 'ESPN vs Line',
+                    Games: row.Games,
+                    Wins: row.Wins,
+                    Losses: row.Losses,
+                    WinPct: formatPct(row.WinPct),
+                    Profit: formatMoney(row.Profit)
+                }];
+
+                return [figure, table];
+            },
+
+            thresholdCurve: function (payload, season, minEdge, direction, conference, month, lo, hi, step) {
+                if (!payload) {
+                    throw window.dash_clientside.PreventUpdate;
+                }
+                // Bucket each row at the highest slider step it clears, then a suffix
+                // sum gives wins/losses at every threshold in one pass
+                var steps = Math.round((hi - lo) / step) + 1;
+                var wins = new Array(steps).fill(0);
+                var losses = new Array(steps).fill(0);
+                var filters = filtersFrom(season, lo, direction, conference, month);
+                var sums = slice(payload, filters, function (i) {
+                    return Math.min(Math.floor((payload.edge[i] - lo) / step + 1e-9), steps - 1);
+                }, steps);
+
+                var thresholds = [], profit = [], winPct = [], games = [];
+                var w = 0, l = 0;
+                for (var k = steps - 1; k >= 0; k--) {
+                    w += sums.wins[k];
+                    l += sums.losses[k];
+                    wins[k] = w;
+                    losses[k] = l;
+                }
+                for (k = 0; k < steps; k++) {
+                    var row = summarize(wins[k], losses[k]);
+                    thresholds.push(Math.round((lo + k * step) * 10) / 10);
+                    profit.push(row.Profit);
+                    winPct.push(row.WinPct);
+                    games.push(row.Games);
+                }
+
+                return {
+                    data: [{
+                        type: 'scatter', name: 'Profit/Loss', x: thresholds, y: profit, yaxis: 'y',
+                        mode: 'lines', line: {color: '#2c3e50', width: 3}, customdata: games,
+                        hovertemplate: 'Edge %{x}+: $%{y:,.0f} over %{customdata} games<extra></extra>'
+                    }, {
+                        type: 'scatter', name: 'Win %', x: thresholds, y: winPct, yaxis: 'y2',
+                        mode: 'lines', line: {color: 'blue', width: 2, dash: 'dot'}
+                    }],
+                    layout: {
+                        title: {text: 'Profit and Win Rate by Minimum Edge'},
+                        xaxis: {title: {text: 'Minimum Edge (points)'}},
+                        yaxis: {title: {text: 'Profit/Loss ($)'}},
+                        yaxis2: {title: {text: 'Win Percentage (%)'}, overlaying: 'y', side: 'right'},
+                        hovermode: 'x unified',
+                        height: 450,
+                        margin: {t: 80, b: 80, l: 60, r: 60},
+                        shapes: [{
+                            type: 'line', yref: 'paper', y0: 0, y1: 1, x0: minEdge, x1: minEdge,
+                            line: {dash: 'dash', color: 'gray'}
+                        }, {
+                            type: 'line', xref: 'paper', x0: 0, x1: 1, yref: 'y', y0: 0, y1: 0,
+                            line: {color: '#bdc3c7'}
+                        }],
+                        annotations: [{
+                            text: 'Current: ' + minEdge + '+', x: minEdge, yref: 'paper', y: 1,
+                            xanchor: 'left', showarrow: false
+                        }]
+                    }
+                };
+            },
+
+            seasonPerformance: function (payload, season, minEdge, direction, month) {
+                if (!payload) {
+                    throw window.dash_clientside.PreventUpdate;
+                }
+                var sums = slice(payload, filtersFrom(season, minEdge, direction, null, month),
+                                 function (i) { return payload.season[i]; }, payload.seasons.length);
+                var seasons = [], profit = [], winPct = [];
+
+                payload.seasons.forEach(function (name, i) {
+                    var row = summarize(sums.wins[i], sums.losses[i]);
+                    if (row.Games > 0) {
+                        seasons.push(name);
+                        profit.push(row.Profit);
+                        winPct.push(row.WinPct);
+                    }
+                });
+
+                return {
+                    data: [{
+                        type: 'bar', name: 'Profit/Loss', x: seasons, y: profit, yaxis: 'y',
+                        marker: {color: barColors(profit, 0, 'green', 'red')},
+                        text: profit.map(formatMoney), textposition: 'outside'
+                    }, {
+                        type: 'scatter', name: 'Win %', x: seasons, y: winPct, yaxis: 'y2',
+                        mode: 'lines+markers', line: {color: 'blue', width: 3}, marker: {size: 10}
+                    }],
+                    layout: {
+                        title: {text: 'Profit and Win Rate by Season'},
+                        yaxis: {title: {text: 'Profit/Loss ($)'}},
+                        yaxis2: {title: {text: 'Win Percentage (%)'}, overlaying: 'y', side: 'right'},
+                        hovermode: 'x unified',
+                        height: 450,
+                        margin: {t: 80, b: 80, l: 60, r: 60}
+                    }
+                };
+            },
+
+            conferenceComparison: function (payload, season, minEdge, direction, month) {
+                if (!payload) {
+                    throw window.dash_clientside.PreventUpdate;
+                }
+                var sums = slice(payload, filtersFrom(season, minEdge, direction, null, month),
+                                 function (i) { return payload.conference[i]; }, payload.conferenceTypes.length);
+                var rows = [];
+
+                payload.conferenceTypes.forEach(function (name, i) {
+                    var row = summarize(sums.wins[i], sums.losses[i]);
+                    if (row.Games > 0 && name !== 'Unknown') {
+                        row.ConferenceType = name;
+                        rows.push(row);
+                    }
+                });
+
+                if (rows.length === 0) {
+                    return [emptyFigure(), []];
+                }
+
+                rows.sort(function (a, b) { return b.WinPct - a.WinPct; });
+                var names = rows.map(function (r) { return r.ConferenceType; });
+                var winPct = rows.map(function (r) { return r.WinPct; });
+                var profit = rows.map(function (r) { return r.Profit; });
+
+                var figure = {
+                    data: [{
+                        type: 'bar', name: 'Win %', x: names, y: winPct, yaxis: 'y',
+                        marker: {color: barColors(winPct, BREAKEVEN_PCT, '#27ae60', '#e74c3c')},
+                        text: winPct.map(function (x) { return x.toFixed(1) + '%'; }),
+                        textposition: 'outside'
+                    }, {
+                        type: 'scatter', name: 'Profit/Loss', x: names, y: profit, yaxis: 'y2',
+                        mode: 'lines+markers', line: {color: '#3498db', width: 3}, marker: {size: 10},
+                        text: profit.map(formatMoney), hovertemplate: '%{text}<extra></extra>'
+                    }],
+                    layout: {
+                        title: {text: 'Win Rate and Profitability by Conference Type'},
+                        yaxis: {title: {text: 'Win Percentage (%)'}},
+                        yaxis2: {title: {text: 'Profit/Loss ($)'}, overlaying: 'y', side: 'right'},
+                        hovermode: 'x unified',
+                        height: 450,
+                        margin: {t: 80, b: 80, l: 60, r: 60},
+                        showlegend: true,
+                        shapes: [{
+                            type: 'line', xref: 'paper', x0: 0, x1: 1, yref: 'y',
+                            y0: BREAKEVEN_PCT, y1: BREAKEVEN_PCT,
+                            line: {dash: 'dash', color: 'gray'}
+                        }],
+                        annotations: [{
+                            text: 'Breakeven (52.4%)', xref: 'paper', x: 1, xanchor: 'right',
+                            yref: 'y', y: BREAKEVEN_PCT, yanchor: 'bottom', showarrow: false
+                        }]
+                    }
+                };
+
+                var table = rows.map(function (r) {
+                    return {
+                        'Conference Type': r.ConferenceType,
+                        'Games': r.Games,
+                        'Wins': r.Wins,
+                        'Losses': r.Losses,
+                        'Win %': formatPct(r.WinPct),
+                        'Profit/Loss': formatMoney(r.Profit)
+                    };
+                });
+
+                return [figure, table];
+            }
+        }
+    });
+})();
@@ -0,0 +1,128 @@
+"""
+Data Version Marker
+Lets sql/import_data.py tell running dashboard workers that the game data changed
+
+Two signals make up the version: the local marker file, bumped by an import on
+the same host, and (once app.py registers it with track_database) a version read
+from the database itself, re-checked every DATABASE_CHECK_SECONDS, which picks
+up imports run from another host.
+"""
+
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+VERSION_FILE = Path(os.getenv('DASHBOARD_DATA_VERSION_FILE', Path(__file__).parent / '.data_version'))
+
+# Seconds between reads of the database's version
+DATABASE_CHECK_SECONDS = int(os.getenv('DASHBOARD_DATA_VERSION_CHECK', '60'))
+
+_database = {'fetch': None, 'interval': DATABASE_CHECK_SECONDS, 'version': None, 'checked_at': None}
+_database_lock = threading.Lock()
+
+
+def bump_data_version():
+    """Mark the data as changed (call after an import commits)"""
+    VERSION_FILE.write_text(str(time.time()))
+
+
+def track_database(fetch, interval=DATABASE_CHECK_SECONDS):
+    """
+    Also follow a version read from the database
+
+    Args:
+        fetch: Zero-argument callable returning a comparable version of the data
+               in the database (e.g. the latest import and refresh times)
+        interval: Seconds between calls
+    """
+    with _database_lock:
+        _database.update(fetch=fetch, interval=interval, version=None, checked_at=None)
+
+
+def _database_version():
+    """Last database version read, re-reading it once the interval has passed"""
+    if _database['fetch'] is None:
+        return None
+    due = _database['checked_at'] is None or time.monotonic() - _database['checked_at'] >= _database['interval']
+    # One thread reads; the others keep the last version meanwhile
+    if due and _database_lock.acquire(blocking=False):
+        try:
+            try:
+                _database['version'] = _database['fetch']()
+            except Exception as e:
+                logger.warning("Reading the database data version failed: %s", e)
+            _database['checked_at'] = time.monotonic()
+        finally:
+            _database_lock.release()
+    return _database['version']
+
+
+def current_data_version():
+    """
+    Current data version
+
+    Returns:
+        (modification time of the marker file in ns or 0 if it was never bumped,
+         database version or None when not tracked)
+    """
+    try:
+        marker = VERSION_FILE.stat().st_mtime_ns
+    except FileNotFoundError:
+        marker = 0
+    return marker, _database_version()
+
+
+class VersionedValue:
+    """
+    Lazily built value that is rebuilt when the data version changes
+
+    A failed build is logged and retried after retry_seconds; until then the
+    previous value (possibly None) keeps being served.
+
+    Args:
+        build: Zero-argument callable producing the value
+        name: Label used in log messages
+        retry_seconds: Seconds to wait after a failed build before trying again
+    """
+
+    def __init__(self, build, name, retry_seconds=60):
+        self._build = build
+        self.name = name
+        self.retry_seconds = retry_seconds
+        self._value = None
+        self._version = None
+        self._retry_at = 0
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Current value, building it first if missing or stale (None if it cannot be built)"""
+        version = current_data_version()
+        if self._value is not None and self._version == version:
+            return self._value
+        if time.time() < self._retry_at:
+            return self._value
+
+        with self._lock:
+            if (self._value is None or self._version != version) and time.time() >= self._retry_at:
+                started = time.perf_counter()
+                try:
+                    self._value = self._build()
+                    self._version = version
+                    logger.info("Built %s in %.2fs", self.name, time.perf_counter() - started)
+                except Exception:
+                    self._retry_at = time.time() + self.retry_seconds
+                    logger.exception("Building %s failed", self.name)
+        return self._value
+
+    def is_current(self):
+        """True once built for the latest data version"""
+        return self._value is not None and self._version == current_data_version()
+
+    def peek(self):
+        """Current value without building (None until the first successful build)"""
+        return self._value
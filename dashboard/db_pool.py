@@ -0,0 +1,229 @@
+"""
+Connection Pool
+Shares a bounded set of database connections across Dash worker threads
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import storage
+
+
+class PoolTimeout(Exception):
+    """Raised when no pooled connection frees up within the acquire timeout"""
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of database connections
+
+    Connections are handed to one thread at a time (DB-API connections are not
+    safe to share), returned on release, health-checked before reuse when they
+    have been idle for a while, and closed once they sit unused past max_idle.
+
+    Args:
+        connect: Zero-argument callable returning a new DB-API connection
+        max_size: Maximum number of open connections (idle + in use)
+        max_idle: Seconds an idle connection is kept before it is closed
+        acquire_timeout: Seconds to wait for a free connection before PoolTimeout
+        health_check_after: Idle seconds after which a connection is pinged before reuse
+    """
+
+    def __init__(self, connect, max_size=5, max_idle=300, acquire_timeout=10, health_check_after=30):
+        self._connect = connect
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.acquire_timeout = acquire_timeout
+        self.health_check_after = health_check_after
+
+        self._cond = threading.Condition()
+        self._idle = []  # (connection, last_used) pairs, most recently used last
+        self._in_use = 0
+        self._state = {}  # id(connection) -> per-connection dict, dropped when it closes
+        self._pid = os.getpid()
+        self._closed = False  # set by close_all(): no new borrows, returned connections close
+
+        self._stats = {
+            'created': 0,
+            'closed': 0,
+            'reused': 0,
+            'evicted_idle': 0,
+            'failed_health_checks': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'wait_seconds': 0.0,
+        }
+
+    def _check_fork(self):
+        # A forked worker (e.g. gunicorn) must not reuse the parent's sockets
+        if os.getpid() != self._pid:
+            self._idle = []
+            self._in_use = 0
+            self._state = {}
+            self._pid = os.getpid()
+
+    def _evict_idle(self, now):
+        keep = []
+        for conn, last_used in self._idle:
+            if now - last_used > self.max_idle:
+                self._close(conn)
+                self._stats['evicted_idle'] += 1
+            else:
+                keep.append((conn, last_used))
+        self._idle = keep
+
+    def _close(self, conn):
+        self._state.pop(id(conn), None)
+        try:
+            conn.close()
+        except Exception:
+            pass
+        self._stats['closed'] += 1
+
+    def _is_healthy(self, conn):
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+            cursor.close()
+            return True
+        except Exception:
+            return False
+
+    def acquire(self):
+        """
+        Borrow a connection from the pool
+
+        Returns:
+            An open connection; hand it back with release()
+        """
+        deadline = time.monotonic() + self.acquire_timeout
+
+        with self._cond:
+            self._check_fork()
+            waited_from = None
+
+            while True:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+                now = time.monotonic()
+                self._evict_idle(time.time())
+
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                    self._in_use += 1
+                    break
+
+                if self._in_use < self.max_size:
+                    # Reserve the slot now, connect outside the lock
+                    conn, last_used = None, None
+                    self._in_use += 1
+                    break
+
+                if waited_from is None:
+                    waited_from = now
+                    self._stats['waits'] += 1
+
+                remaining = deadline - now
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    self._stats['wait_seconds'] += now - waited_from
+                    raise PoolTimeout(
+                        f"No database connection available after {self.acquire_timeout}s "
+                        f"({self.max_size} in use)"
+                    )
+                self._cond.wait(remaining)
+
+            if waited_from is not None:
+                self._stats['wait_seconds'] += time.monotonic() - waited_from
+
+        try:
+            if conn is not None and time.time() - last_used > self.health_check_after:
+                if not self._is_healthy(conn):
+                    with self._cond:
+                        self._stats['failed_health_checks'] += 1
+                        self._close(conn)
+                    conn = None
+
+            if conn is None:
+                conn = self._connect()
+                with self._cond:
+                    self._stats['created'] += 1
+                    self._state[id(conn)] = {}
+            else:
+                with self._cond:
+                    self._stats['reused'] += 1
+
+            return conn
+
+        except Exception:
+            # Give the reserved slot back if we could not produce a connection
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, conn, discard=False):
+        """
+        Return a borrowed connection to the pool
+
+        Args:
+            conn: Connection obtained from acquire()
+            discard: Close the connection instead of keeping it (e.g. after a driver error)
+        """
+        with self._cond:
+            self._in_use = max(self._in_use - 1, 0)
+            if discard or self._closed or os.getpid() != self._pid:
+                self._close(conn)
+            else:
+                self._idle.append((conn, time.time()))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of a with-block"""
+        conn = self.acquire()
+        discard = False
+        try:
+            yield conn
+        except storage.DB_ERRORS:
+            discard = True
+            raise
+        finally:
+            self.release(conn, discard=discard)
+
+    def state(self, conn):
+        """
+        Scratch dict that lives exactly as long as a pooled connection
+
+        Used to keep per-connection objects such as prepared cursors.
+        """
+        with self._cond:
+            return self._state.setdefault(id(conn), {})
+
+    def stats(self):
+        """
+        Snapshot of pool metrics
+
+        Returns:
+            Dict with current size/in-use/idle counts and lifetime counters
+        """
+        with self._cond:
+            snapshot = dict(self._stats)
+            snapshot['in_use'] = self._in_use
+            snapshot['idle'] = len(self._idle)
+            snapshot['size'] = self._in_use + len(self._idle)
+            snapshot['max_size'] = self.max_size
+            return snapshot
+
+    def close_all(self):
+        """Close every idle connection and the pool (in-use connections close when released)"""
+        with self._cond:
+            self._closed = True
+            for conn, _ in self._idle:
+                self._close(conn)
+            self._idle = []
+            # Wake waiting acquire() calls so they see the pool is closed
+            self._cond.notify_all()
@@ -0,0 +1,323 @@
+"""
+Filter Cube
+Precomputed Wins/Losses for every dashboard filter combination, so the
+chart callbacks slice arrays instead of running SUM(CASE ...) queries
+"""
+
+import numpy as np
+import pandas as pd
+
+
+DIRECTIONS = ['UNDERDOG', 'FAVORITE', 'NONE']  # sign of ESPNEdge (> 0, < 0, = 0)
+
+# One row per (season, month, conference type, direction, |edge|), which is exactly
+# how dbo.StrategySummary (sql/31_CreateStrategySummary.sql) is kept. Edges have two
+# decimals, so grouping on the exact value stays small and any threshold works.
+CUBE_QUERY = """
+SELECT
+    SeasonYear,
+    GameMonth,
+    ConferenceType,
+    Direction,
+    AbsEdge,
+    Covered AS Wins,
+    Missed AS Losses
+FROM dbo.StrategySummary
+"""
+
+EDGE_SCALE = 100  # edges are stored as whole hundredths so thresholds compare exactly
+
+
+def edge_key(edge):
+    """|ESPNEdge| values in whole hundredths"""
+    return np.rint(np.asarray(edge, dtype=float) * EDGE_SCALE).astype(np.int64)
+
+
+def threshold_key(min_edge):
+    """Minimum edge in hundredths: an edge passes when edge_key(edge) >= threshold_key(min_edge)"""
+    return np.ceil(np.asarray(min_edge, dtype=float) * EDGE_SCALE - 1e-6).astype(np.int64)
+
+
+def summarize(wins, losses):
+    """
+    Turn win/loss counts into the dashboard's Games/Wins/Losses/WinPct/Profit columns
+
+    Args:
+        wins: Array (or scalar) of covered counts
+        losses: Array (or scalar) of missed counts
+
+    Returns:
+        Dict of column arrays (WinPct is NaN where there are no decided games)
+    """
+    wins = np.asarray(wins, dtype=np.int64)
+    losses = np.asarray(losses, dtype=np.int64)
+    games = wins + losses
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        win_pct = np.where(games > 0, wins / np.maximum(games, 1) * 100, np.nan)
+
+    return {
+        'Games': games,
+        'Wins': wins,
+        'Losses': losses,
+        'WinPct': win_pct,
+        'Profit': wins * 100 - losses * 110,
+    }
+
+
+class FilterCube:
+    """
+    Wins/Losses for every filter partition, answerable at any edge threshold
+
+    A partition is one (season, month, conference, direction) combination. Rows
+    are kept sorted by partition and then by |ESPNEdge|, with running totals of
+    wins and losses, so "games in partition p with edge >= t" is one binary
+    search plus a subtraction. Searching every partition at once is a single
+    vectorized searchsorted call, and a whole threshold curve is one more axis.
+
+    Args:
+        rows: DataFrame shaped like CUBE_QUERY output
+    """
+
+    def __init__(self, rows):
+        self.seasons = sorted(rows['SeasonYear'].unique().tolist())
+        self.conference_types = sorted(rows['ConferenceType'].unique().tolist())
+        self.row_count = len(rows)
+
+        self._season_index = {s: i for i, s in enumerate(self.seasons)}
+        self._conf_index = {c: i for i, c in enumerate(self.conference_types)}
+        self._dir_index = {d: i for i, d in enumerate(DIRECTIONS)}
+
+        self._shape = (len(self.seasons), 12, len(self.conference_types), len(DIRECTIONS))
+        partitions = int(np.prod(self._shape))
+
+        edge = edge_key(rows['AbsEdge'].to_numpy(dtype=float))
+        self.max_edge = edge.max() / EDGE_SCALE if len(rows) else 0.0
+        self._edge_span = int(edge.max()) + 2 if len(rows) else 2
+
+        if len(rows):
+            partition = np.ravel_multi_index((
+                rows['SeasonYear'].map(self._season_index).to_numpy(),
+                rows['GameMonth'].to_numpy(dtype=np.int64) - 1,
+                rows['ConferenceType'].map(self._conf_index).to_numpy(),
+                rows['Direction'].map(self._dir_index).to_numpy(),
+            ), self._shape)
+        else:
+            partition = np.zeros(0, dtype=np.int64)
+
+        # Sort by (partition, edge); one integer key per row keeps both orders at once
+        keys = partition * self._edge_span + edge
+        order = np.argsort(keys, kind='stable')
+        self._keys = keys[order]
+
+        # Running totals with a leading 0: rows [i, j) hold cum[j] - cum[i] wins
+        zero = np.zeros(1, dtype=np.int64)
+        self._cum_wins = np.concatenate([zero, np.cumsum(rows['Wins'].to_numpy(dtype=np.int64)[order])])
+        self._cum_losses = np.concatenate([zero, np.cumsum(rows['Losses'].to_numpy(dtype=np.int64)[order])])
+
+        # Row just past each partition's last row
+        self._partition_end = np.searchsorted(self._keys, (np.arange(partitions) + 1) * self._edge_span)
+
+    @classmethod
+    def from_connection(cls, conn):
+        """Build the cube from the dbo.StrategySummary rows"""
+        return cls(pd.read_sql(CUBE_QUERY, conn))
+
+    def _threshold_key(self, min_edge):
+        """Edge threshold in hundredths, clamped into the key range of one partition"""
+        return np.clip(threshold_key(min_edge), 0, self._edge_span - 1)
+
+    def _counts(self, partitions, min_edge):
+        """
+        Wins/losses with |edge| >= min_edge for each partition
+
+        Args:
+            partitions: Array of partition ids
+            min_edge: Scalar threshold, or 1-D array of thresholds (adds a trailing axis)
+        """
+        thresholds = self._threshold_key(min_edge)
+        partitions = np.asarray(partitions, dtype=np.int64)
+        if thresholds.ndim:
+            partitions = partitions[:, None]
+
+        start = np.searchsorted(self._keys, partitions * self._edge_span + thresholds)
+        end = self._partition_end[partitions]
+        return self._cum_wins[end] - self._cum_wins[start], self._cum_losses[end] - self._cum_losses[start]
+
+    def _partitions_for(self, index):
+        """Partition ids selected by an _index_for() tuple, shaped like the sliced cube"""
+        axes = [np.arange(*ix.indices(size)) for ix, size in zip(index, self._shape)]
+        return np.ravel_multi_index(np.ix_(*axes), self._shape)
+
+    def _slice(self, season, min_edge, direction, month, conference_type=None):
+        """Wins/losses as [season, month, conference, direction] arrays for a filter state"""
+        # Only the selected partitions are searched, not the whole cube
+        partitions = self._partitions_for(self._index_for(season, month, conference_type, direction))
+        wins, losses = self._counts(partitions.ravel(), min_edge or 0)
+        return wins.reshape(partitions.shape), losses.reshape(partitions.shape)
+
+    def _index_for(self, season, month, conference_type, direction):
+        # Slices (never lists) keep every axis in place for the axis sums below
+        def pick(value, lookup):
+            if value is None:
+                return slice(None)
+            if value not in lookup:
+                return slice(0, 0)
+            i = lookup[value]
+            return slice(i, i + 1)
+
+        month_ix = slice(None) if month is None else slice(int(month) - 1, int(month))
+        dir_ix = pick(direction, self._dir_index) if direction in ('UNDERDOG', 'FAVORITE') else slice(None)
+
+        return (
+            pick(season, self._season_index),
+            month_ix,
+            pick(conference_type, self._conf_index),
+            dir_ix,
+        )
+
+    def strategy_comparison(self, season=None, min_edge=3, conference_type=None, direction='UNDERDOG', month=None):
+        """Same shape as get_strategy_comparison(); empty when no games match"""
+        wins, losses = self._slice(season, min_edge, direction, month, conference_type)
+        totals = summarize(wins.sum(), losses.sum())
+
+        if totals['Games'] == 0:
+            return pd.DataFrame(columns=['Strategy', 'Games', 'Wins', 'Losses', 'WinPct', 'Profit'])
+
+        return pd.DataFrame([{'Strategy': 'ESPN vs Line', **{k: v.item() for k, v in totals.items()}}])
+
+    def performance_by_season(self, season=None, min_edge=3, direction='UNDERDOG', month=None):
+        """Same shape as get_performance_by_season()"""
+        wins, losses = self._slice(season, min_edge, direction, month)
+        seasons = self.seasons if season is None else [s for s in self.seasons if s == season]
+
+        totals = summarize(wins.sum(axis=(1, 2, 3)), losses.sum(axis=(1, 2, 3)))
+        df = pd.DataFrame({'SeasonYear': seasons, **totals}).rename(columns={'Games': 'TotalGames'})
+        return df[df['TotalGames'] > 0].reset_index(drop=True)
+
+    def conference_comparison(self, season=None, min_edge=3, direction='UNDERDOG', month=None):
+        """Same shape as get_conference_comparison() (Unknown conferences excluded)"""
+        wins, losses = self._slice(season, min_edge, direction, month)
+
+        conf_wins = wins.sum(axis=(0, 1, 3))
+        conf_losses = losses.sum(axis=(0, 1, 3))
+
+        df = pd.DataFrame({'ConferenceType': self.conference_types, **summarize(conf_wins, conf_losses)})
+        df = df.rename(columns={'Games': 'TotalGames'})
+        df = df[(df['TotalGames'] > 0) & (df['ConferenceType'] != 'Unknown')]
+        return df.sort_values('WinPct', ascending=False).reset_index(drop=True)
+
+    def profit_curve(self, thresholds, season=None, conference_type=None, direction='UNDERDOG', month=None):
+        """
+        Results at every edge threshold for one filter state
+
+        Args:
+            thresholds: Increasing minimum edges to evaluate (e.g. 3 to 15 by 0.1)
+
+        Returns:
+            DataFrame with MinEdge plus the summarize() columns, one row per threshold
+        """
+        thresholds = np.asarray(thresholds, dtype=float)
+        selected = self._partitions_for(self._index_for(season, month, conference_type, direction)).ravel()
+
+        wins, losses = self._counts(selected, thresholds)
+        return pd.DataFrame({'MinEdge': thresholds, **summarize(wins.sum(axis=0), losses.sum(axis=0))})
+
+    def to_payload(self):
+        """
+        Compact JSON form of the cube for slicing in the browser
+
+        Only non-empty (partition, |edge|) rows are sent, as parallel lists of
+        axis indexes and counts, so the clientside code can apply any filter
+        with one pass over the rows.
+
+        Returns:
+            Dict with the axis labels and the row columns
+        """
+        partition, edge = np.divmod(self._keys, self._edge_span)
+        season, month, conf, direction = np.unravel_index(partition, self._shape)
+        return {
+            'seasons': self.seasons,
+            'conferenceTypes': self.conference_types,
+            'directions': DIRECTIONS,
+            'season': season.tolist(),
+            'month': (month + 1).tolist(),
+            'conference': conf.tolist(),
+            'direction': direction.tolist(),
+            'edge': (edge / EDGE_SCALE).tolist(),
+            'wins': np.diff(self._cum_wins).tolist(),
+            'losses': np.diff(self._cum_losses).tolist(),
+        }
+
+
+def games_at_edge(games, min_edge):
+    """The rows of get_filtered_games() output whose AbsESPNEdge is at least min_edge"""
+    return games[edge_key(games['AbsESPNEdge'].to_numpy(dtype=float)) >= threshold_key(min_edge)]
+
+
+def profit_curve_from_games(games, thresholds, conference_type=None):
+    """
+    FilterCube.profit_curve() from one set of filtered game rows
+
+    Args:
+        games: DataFrame with ConferenceType, CoverResult and AbsESPNEdge (decided games
+               filtered by season, direction and month at the lowest threshold)
+        thresholds: Increasing minimum edges to evaluate
+        conference_type: Conference filter
+
+    Returns:
+        DataFrame with MinEdge plus the summarize() columns, one row per threshold
+    """
+    thresholds = np.asarray(thresholds, dtype=float)
+    if conference_type is not None:
+        games = games[games['ConferenceType'] == conference_type]
+    edge = edge_key(games['AbsESPNEdge'].to_numpy(dtype=float))
+    keys = threshold_key(thresholds)
+
+    def at_least(result):
+        edges = np.sort(edge[(games['CoverResult'] == result).to_numpy()])
+        return len(edges) - np.searchsorted(edges, keys)
+
+    return pd.DataFrame({'MinEdge': thresholds, **summarize(at_least('COVERED'), at_least('MISSED'))})
+
+
+def summarize_games(games, conference_type=None):
+    """
+    Derive the three chart datasets from one set of filtered game rows
+
+    Args:
+        games: DataFrame with SeasonYear, ConferenceType and CoverResult (decided games
+               already filtered by season, edge, direction and month)
+        conference_type: Conference filter applied to the strategy comparison only
+
+    Returns:
+        (strategy_comparison, performance_by_season, conference_comparison) DataFrames
+        shaped like the matching get_* functions
+    """
+    covered = (games['CoverResult'] == 'COVERED').to_numpy()
+    missed = (games['CoverResult'] == 'MISSED').to_numpy()
+
+    in_conf = np.ones(len(games), dtype=bool)
+    if conference_type is not None:
+        in_conf = (games['ConferenceType'] == conference_type).to_numpy()
+
+    totals = summarize(np.count_nonzero(covered & in_conf), np.count_nonzero(missed & in_conf))
+    if totals['Games'] == 0:
+        strategy = pd.DataFrame(columns=['Strategy', 'Games', 'Wins', 'Losses', 'WinPct', 'Profit'])
+    else:
+        strategy = pd.DataFrame([{'Strategy': 'ESPN vs Line', **{k: v.item() for k, v in totals.items()}}])
+
+    def grouped(column):
+        seasons, codes = np.unique(games[column].to_numpy(str), return_inverse=True)
+        stats = summarize(np.bincount(codes[covered], minlength=len(seasons)),
+                          np.bincount(codes[missed], minlength=len(seasons)))
+        df = pd.DataFrame({column: seasons.tolist(), **stats}).rename(columns={'Games': 'TotalGames'})
+        return df[df['TotalGames'] > 0].reset_index(drop=True)
+
+    by_season = grouped('SeasonYear')
+
+    by_conf = grouped('ConferenceType')
+    by_conf = by_conf[by_conf['ConferenceType'] != 'Unknown']
+    by_conf = by_conf.sort_values('WinPct', ascending=False).reset_index(drop=True)
+
+    return strategy, by_season, by_conf
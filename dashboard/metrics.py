@@ -0,0 +1,229 @@
+"""
+Dashboard Metrics
+Latency histograms, counters and row counts for the data functions, SQL
+stages and callbacks, rendered in the Prometheus text format for /metrics
+"""
+
+import functools
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+slow_query_logger = logging.getLogger('dashboard.slow_queries')
+
+# Latency buckets in seconds (sub-millisecond cube slices up to multi-second SQL)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+ROW_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000)
+BYTE_BUCKETS = (1000, 5000, 10000, 50000, 100000, 500000, 1000000)
+
+# Queries slower than this many ms are written to the slow query log (unset = off)
+SLOW_QUERY_MS = float(os.getenv('DASHBOARD_SLOW_QUERY_MS', '0')) or None
+SLOW_QUERY_LOG = os.getenv('DASHBOARD_SLOW_QUERY_LOG')
+
+if SLOW_QUERY_LOG:
+    _handler = logging.FileHandler(SLOW_QUERY_LOG)
+    _handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+    slow_query_logger.addHandler(_handler)
+    slow_query_logger.setLevel(logging.INFO)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram family keyed by label values
+
+    Args:
+        name: Metric name
+        help_text: # HELP line
+        labels: Label names, in the order values are passed to observe()
+        buckets: Upper bounds (the +Inf bucket is implicit)
+    """
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}  # label values -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        """Record one observation"""
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for label_values, series in sorted(self._series.items()):
+                for bound, count in zip(self.buckets, series):
+                    labels = _format_labels(self.labels, label_values, ('le', repr(float(bound))))
+                    lines.append(f'{self.name}_bucket{labels} {count}')
+                labels = _format_labels(self.labels, label_values, ('le', '+Inf'))
+                lines.append(f'{self.name}_bucket{labels} {series[-2]}')
+                labels = _format_labels(self.labels, label_values)
+                lines.append(f'{self.name}_sum{labels} {series[-1]:.6f}')
+                lines.append(f'{self.name}_count{labels} {series[-2]}')
+        return lines
+
+
+class Counter:
+    """Monotonic counter family keyed by label values"""
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._series[label_values] = self._series.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for label_values, value in sorted(self._series.items()):
+                lines.append(f'{self.name}{_format_labels(self.labels, label_values)} {value}')
+        return lines
+
+
+class Gauge:
+    """
+    Gauge family read from a callback at render time
+
+    Args:
+        read: Zero-argument callable returning {label value: number}
+        label: Name of the single label the dict keys fill in
+    """
+
+    def __init__(self, name, help_text, read, label='stat'):
+        self.name = name
+        self.help_text = help_text
+        self.read = read
+        self.label = label
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} gauge']
+        try:
+            values = self.read()
+        except Exception:
+            return lines
+        for key, value in sorted(values.items()):
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                lines.append(f'{self.name}{_format_labels((self.label,), (key,))} {value}')
+        return lines
+
+
+function_seconds = Histogram(
+    'dashboard_function_seconds', 'Wall time of dashboard data functions and callbacks',
+    labels=('kind', 'function'))
+sql_stage_seconds = Histogram(
+    'dashboard_sql_stage_seconds', 'SQL time split into acquire (pool/connect), execute and fetch (materialize)',
+    labels=('query', 'stage'))
+sql_rows = Histogram(
+    'dashboard_sql_rows', 'Rows returned per SQL query', labels=('query',), buckets=ROW_BUCKETS)
+sql_queries = Counter(
+    'dashboard_sql_queries_total', 'SQL queries run, by query shape and text fingerprint',
+    labels=('query', 'fingerprint'))
+slow_queries = Counter(
+    'dashboard_slow_queries_total', 'SQL queries slower than DASHBOARD_SLOW_QUERY_MS', labels=('query',))
+errors = Counter(
+    'dashboard_errors_total', 'Exceptions raised by instrumented functions', labels=('kind', 'function'))
+request_seconds = Histogram(
+    'dashboard_request_seconds', 'Full Dash callback request time, including JSON/Plotly serialization',
+    labels=('output',))
+response_bytes = Histogram(
+    'dashboard_response_bytes', 'Dash callback response size', labels=('output',), buckets=BYTE_BUCKETS)
+
+_families = [function_seconds, sql_stage_seconds, sql_rows, sql_queries, slow_queries, errors,
+             request_seconds, response_bytes]
+
+
+def register(family):
+    """Add a family (e.g. a Gauge over pool stats) to the /metrics output"""
+    _families.append(family)
+    return family
+
+
+def render():
+    """All metrics in the Prometheus text exposition format"""
+    lines = []
+    for family in _families:
+        lines.extend(family.render())
+    return '\n'.join(lines) + '\n'
+
+
+def fingerprint(sql):
+    """Short stable id for a query text (whitespace-insensitive)"""
+    return hashlib.sha1(re.sub(r'\s+', ' ', sql).strip().encode()).hexdigest()[:12]
+
+
+@contextmanager
+def span(query, stage):
+    """Time one stage of a SQL query into dashboard_sql_stage_seconds"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        sql_stage_seconds.observe(time.perf_counter() - started, query, stage)
+
+
+def record_query(name, sql, params, rows, seconds):
+    """Count a finished query and write it to the slow query log if it crossed the threshold"""
+    sql_rows.observe(rows, name)
+    sql_queries.inc(name, fingerprint(sql))
+
+    if SLOW_QUERY_MS is not None and seconds * 1000 >= SLOW_QUERY_MS:
+        slow_queries.inc(name)
+        slow_query_logger.warning("slow query %s [%s] %.1f ms, %d rows, params=%r",
+                                  name, fingerprint(sql), seconds * 1000, rows, list(params))
+
+
+def instrumented(kind):
+    """
+    Decorator timing a function into dashboard_function_seconds
+
+    Args:
+        kind: 'query' for get_* functions, 'callback' for Dash callbacks
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                # PreventUpdate is control flow, not a failure
+                if type(e).__name__ != 'PreventUpdate':
+                    errors.inc(kind, func.__name__)
+                raise
+            finally:
+                function_seconds.observe(time.perf_counter() - started, kind, func.__name__)
+        return wrapper
+
+    return decorator
@@ -0,0 +1,429 @@
+"""
+Dashboard Query Builder
+Parameterized SQL for the dashboard datasets. Every dataset has one fixed query
+text (filters are ? parameters, never spliced in), so SQL Server compiles each
+shape once and reuses the cached plan for every filter combination.
+
+The same texts run on the embedded SQLite backend (storage.py); only the row
+limits are written per DIALECT.
+"""
+
+import logging
+import os
+import re
+import time
+from collections import namedtuple
+from datetime import datetime
+
+import pandas as pd
+
+import metrics
+import storage
+
+try:
+    import pyodbc
+except ImportError:  # SQLite backend only; it takes no declared types
+    pyodbc = None
+
+logger = logging.getLogger(__name__)
+
+
+# A ready-to-run statement: name (also tagged into the SQL), text, values and declared types
+Query = namedtuple('Query', ['name', 'sql', 'params', 'types'])
+
+# 'tsql' (SQL Server) or 'sqlite', from DB_BACKEND
+DIALECT = storage.get_backend().dialect
+
+
+def _sql_type(name, size, digits):
+    return (getattr(pyodbc, name), size, digits) if pyodbc else None
+
+
+# Declared parameter types. pyodbc sizes string parameters by their length, which
+# would give '2021-22' and 'Mid-Major' different sp_prepexec signatures (and plans);
+# fixed declarations matching the column types keep one signature per query.
+SEASON = _sql_type('SQL_WVARCHAR', 20, 0)       # Seasons.SeasonYear NVARCHAR(20)
+CONFERENCE = _sql_type('SQL_WVARCHAR', 20, 0)   # Conferences.ConferenceType NVARCHAR(20)
+DIRECTION = _sql_type('SQL_WVARCHAR', 10, 0)
+EDGE = _sql_type('SQL_DECIMAL', 10, 2)          # DECIMAL(10,2) like the line columns
+INTEGER = _sql_type('SQL_INTEGER', 0, 0)
+GAME_DATE = _sql_type('SQL_TYPE_DATE', 10, 0)
+
+# Prepared-statement reuse: keep one cursor per query shape on each pooled connection.
+# pyodbc skips SQLPrepare when a cursor executes the same text again.
+PREPARED_STATEMENTS = os.getenv('DASHBOARD_PREPARED_STATEMENTS', '1') != '0'
+
+# Filters shared by every dataset. Each filter is always present; a NULL parameter
+# switches it off, so the query text does not depend on which filters are in use.
+FILTER_SQL = """
+    v.AbsESPNEdge >= ?
+    AND (? IS NULL OR v.SeasonYear = ?)
+    AND (? IS NULL OR MONTH(v.GameDate) = ?)
+    AND (? = 'BOTH' OR (? = 'UNDERDOG' AND v.ESPNEdge > 0) OR (? = 'FAVORITE' AND v.ESPNEdge < 0))
+"""
+CONFERENCE_FILTER_SQL = """
+    AND (? IS NULL OR c.HomeConferenceType = ?)
+"""
+
+# Home conference type per game. The view joins Teams/Conferences on the integer
+# Games.HomeTeamID key (sql/32_AddTeamKeysToGames.sql), so it has one row per game.
+CONFERENCE_JOIN_SQL = """
+LEFT JOIN dbo.vw_GamesWithConferences c ON v.GameID = c.GameID
+"""
+
+SUMMARY_COLUMNS_SQL = """
+    SUM(CASE WHEN v.CoverResult = 'COVERED' THEN 1 ELSE 0 END) AS Wins,
+    SUM(CASE WHEN v.CoverResult = 'MISSED' THEN 1 ELSE 0 END) AS Losses,
+    CAST(SUM(CASE WHEN v.CoverResult = 'COVERED' THEN 1 ELSE 0 END) AS FLOAT) /
+        NULLIF(SUM(CASE WHEN v.CoverResult IN ('COVERED', 'MISSED') THEN 1 ELSE 0 END), 0) * 100 AS WinPct,
+    (SUM(CASE WHEN v.CoverResult = 'COVERED' THEN 1 ELSE 0 END) * 100) -
+    (SUM(CASE WHEN v.CoverResult = 'MISSED' THEN 1 ELSE 0 END) * 110) AS Profit
+"""
+
+# The chart aggregates read dbo.StrategySummary (sql/31_CreateStrategySummary.sql):
+# covered/missed counts pre-summed per season, month, conference type, direction
+# and exact |edge|, so they add up a few thousand rows instead of scanning games.
+STRATEGY_SUMMARY_FILTER_SQL = """
+    s.AbsEdge >= ?
+    AND (? IS NULL OR s.SeasonYear = ?)
+    AND (? IS NULL OR s.GameMonth = ?)
+    AND (? = 'BOTH' OR s.Direction = ?)
+"""
+STRATEGY_SUMMARY_COLUMNS_SQL = """
+    SUM(s.Covered + s.Missed) AS {games},
+    SUM(s.Covered) AS Wins,
+    SUM(s.Missed) AS Losses,
+    CAST(SUM(s.Covered) AS FLOAT) / NULLIF(SUM(s.Covered + s.Missed), 0) * 100 AS WinPct,
+    SUM(s.Profit) AS Profit
+"""
+
+RECENT_PICK_SORT_COLUMNS = ['GameDate', 'ClosingLine', 'ESPNLine', 'ESPNEdge']
+
+
+def _clean(value):
+    """'ALL' / '' mean no filter, same as None"""
+    return None if value in (None, '', 'ALL') else value
+
+
+def _filter_params(season, min_edge, direction, month):
+    """Values and types for FILTER_SQL"""
+    season = _clean(season)
+    month = _clean(month)
+    month = int(month) if month is not None else None
+    direction = (_clean(direction) or 'BOTH').upper()
+    min_edge = float(min_edge or 0)
+
+    params = [min_edge, season, season, month, month, direction, direction, direction]
+    types = [EDGE, SEASON, SEASON, INTEGER, INTEGER, DIRECTION, DIRECTION, DIRECTION]
+    return params, types
+
+
+def _summary_filter_params(season, min_edge, direction, month):
+    """Values and types for STRATEGY_SUMMARY_FILTER_SQL"""
+    params, types = _filter_params(season, min_edge, direction, month)
+    # Direction is a stored column there, so it is compared twice instead of three times
+    return params[:7], types[:7]
+
+
+def _conference_params(conference_type):
+    """Values and types for CONFERENCE_FILTER_SQL"""
+    conference_type = _clean(conference_type)
+    return [conference_type, conference_type], [CONFERENCE, CONFERENCE]
+
+
+def _tagged(name, sql):
+    # The tag makes the statement easy to find in the plan cache and in traces
+    return f"/* dashboard:{name} */\n{sql}"
+
+
+def strategy_comparison(season=None, min_edge=3, conference_type=None, direction='UNDERDOG', month=None):
+    """Query for get_strategy_comparison()"""
+    sql = f"""
+SELECT
+    'ESPN vs Line' AS Strategy,
+    {STRATEGY_SUMMARY_COLUMNS_SQL.format(games='Games')}
+FROM dbo.StrategySummary s
+WHERE {STRATEGY_SUMMARY_FILTER_SQL}
+    AND (? IS NULL OR s.ConferenceType = ?)
+HAVING SUM(s.Covered + s.Missed) > 0
+"""
+    params, types = _summary_filter_params(season, min_edge, direction, month)
+    conf_params, conf_types = _conference_params(conference_type)
+    return Query('strategy_comparison', _tagged('strategy_comparison', sql), params + conf_params, types + conf_types)
+
+
+def performance_by_season(season=None, min_edge=3, direction='UNDERDOG', month=None):
+    """Query for get_performance_by_season()"""
+    sql = f"""
+SELECT
+    s.SeasonYear,
+    {STRATEGY_SUMMARY_COLUMNS_SQL.format(games='TotalGames')}
+FROM dbo.StrategySummary s
+WHERE {STRATEGY_SUMMARY_FILTER_SQL}
+GROUP BY s.SeasonYear
+ORDER BY s.SeasonYear
+"""
+    params, types = _summary_filter_params(season, min_edge, direction, month)
+    return Query('performance_by_season', _tagged('performance_by_season', sql), params, types)
+
+
+def conference_comparison(season=None, min_edge=3, direction='UNDERDOG', month=None):
+    """Query for get_conference_comparison()"""
+    sql = f"""
+SELECT
+    s.ConferenceType,
+    {STRATEGY_SUMMARY_COLUMNS_SQL.format(games='TotalGames')}
+FROM dbo.StrategySummary s
+WHERE s.ConferenceType <> 'Unknown' AND {STRATEGY_SUMMARY_FILTER_SQL}
+GROUP BY s.ConferenceType
+ORDER BY WinPct DESC
+"""
+    params, types = _summary_filter_params(season, min_edge, direction, month)
+    return Query('conference_comparison', _tagged('conference_comparison', sql), params, types)
+
+
+def filtered_games(season=None, min_edge=3, direction='UNDERDOG', month=None):
+    """Query for get_filtered_games()"""
+    sql = f"""
+SELECT
+    v.SeasonYear,
+    COALESCE(c.HomeConferenceType, 'Unknown') AS ConferenceType,
+    v.CoverResult,
+    v.AbsESPNEdge
+FROM dbo.vw_ESPNvsClosingLine v
+{CONFERENCE_JOIN_SQL}
+WHERE v.CoverResult IS NOT NULL AND {FILTER_SQL}
+"""
+    params, types = _filter_params(season, min_edge, direction, month)
+    return Query('filtered_games', _tagged('filtered_games', sql), params, types)
+
+
+def available_seasons():
+    """Query for get_available_seasons()"""
+    sql = "SELECT DISTINCT SeasonYear FROM dbo.Seasons WHERE SportID = 1 ORDER BY SeasonYear"
+    return Query('available_seasons', _tagged('available_seasons', sql), [], [])
+
+
+def data_version():
+    """Query for the database's data version: latest import plus StrategySummary totals (a few thousand rows)"""
+    sql = """
+SELECT
+    (SELECT COUNT(*) FROM dbo.ImportFiles) AS ImportedFiles,
+    (SELECT MAX(CompletedAt) FROM dbo.ImportFiles) AS LastImport,
+    s.SummaryRows,
+    s.Covered,
+    s.Missed
+FROM (
+    SELECT COUNT(*) AS SummaryRows, SUM(Covered) AS Covered, SUM(Missed) AS Missed
+    FROM dbo.StrategySummary
+) s
+"""
+    return Query('data_version', _tagged('data_version', sql), [], [])
+
+
+def recent_picks(season=None, limit=20):
+    """Query for get_recent_picks()"""
+    top, limit_sql = ('TOP (?)', '') if DIALECT == 'tsql' else ('', 'LIMIT ?')
+    sql = f"""
+SELECT {top}
+    v.GameDate,
+    v.HomeTeam,
+    v.RoadTeam,
+    v.ClosingLine,
+    v.ESPNLine,
+    v.ESPNEdge,
+    v.HomeScore,
+    v.RoadScore,
+    v.CoverResult
+FROM dbo.vw_ESPNvsClosingLine v
+WHERE (? IS NULL OR v.SeasonYear = ?)
+ORDER BY v.GameDate DESC
+{limit_sql}
+"""
+    season = _clean(season)
+    params, types = [season, season], [SEASON, SEASON]
+    if DIALECT == 'tsql':
+        return Query('recent_picks', _tagged('recent_picks', sql), [int(limit)] + params, [INTEGER] + types)
+    return Query('recent_picks', _tagged('recent_picks', sql), params + [int(limit)], types + [INTEGER])
+
+
+def recent_picks_count(season=None, min_edge=3, conference_type=None, direction='UNDERDOG', month=None):
+    """Query for count_recent_picks()"""
+    sql = f"""
+SELECT COUNT(*) AS Picks
+FROM dbo.vw_ESPNvsClosingLine v
+{CONFERENCE_JOIN_SQL}
+WHERE {FILTER_SQL} {CONFERENCE_FILTER_SQL}
+"""
+    params, types = _filter_params(season, min_edge, direction, month)
+    conf_params, conf_types = _conference_params(conference_type)
+    return Query('recent_picks_count', _tagged('recent_picks_count', sql), params + conf_params, types + conf_types)
+
+
+def _sort_key_param(sort_column, value):
+    """Cursor value and declared type for a sort column"""
+    if sort_column == 'GameDate':
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value[:10]).date()
+        elif isinstance(value, datetime):
+            value = value.date()
+        return value, GAME_DATE
+    return (float(value) if value is not None else None), EDGE
+
+
+def recent_picks_page(season=None, min_edge=3, conference_type=None, direction='UNDERDOG', month=None,
+                      sort_column='GameDate', descending=True, after=None, offset=0, page_size=20):
+    """
+    Query for get_recent_picks_page()
+
+    One text per (sort column, direction) pair - eight shapes in total. The
+    keyset condition is switched off with a NULL cursor rather than dropped.
+    """
+    if sort_column not in RECENT_PICK_SORT_COLUMNS:
+        sort_column = 'GameDate'
+    comparison = '<' if descending else '>'
+    order = 'DESC' if descending else 'ASC'
+
+    sql = f"""
+SELECT
+    v.GameID,
+    v.GameDate,
+    v.HomeTeam,
+    v.RoadTeam,
+    v.ClosingLine,
+    v.ESPNLine,
+    v.ESPNEdge,
+    v.HomeScore,
+    v.RoadScore,
+    v.CoverResult
+FROM dbo.vw_ESPNvsClosingLine v
+{CONFERENCE_JOIN_SQL}
+WHERE {FILTER_SQL} {CONFERENCE_FILTER_SQL}
+    AND (? IS NULL OR v.{sort_column} {comparison} ? OR (v.{sort_column} = ? AND v.GameID {comparison} ?))
+ORDER BY v.{sort_column} {order}, v.GameID {order}
+{'OFFSET ? ROWS FETCH NEXT ? ROWS ONLY' if DIALECT == 'tsql' else 'LIMIT ? OFFSET ?'}
+"""
+    params, types = _filter_params(season, min_edge, direction, month)
+    conf_params, conf_types = _conference_params(conference_type)
+
+    if after is not None:
+        key, key_type = _sort_key_param(sort_column, after[0])
+        game_id = int(after[1])
+        offset = 0
+    else:
+        key, key_type = None, _sort_key_param(sort_column, None)[1]
+        game_id = None
+
+    page = [int(offset), int(page_size)] if DIALECT == 'tsql' else [int(page_size), int(offset)]
+    keyset_params = [key, key, key, game_id] + page
+    keyset_types = [key_type, key_type, key_type, INTEGER, INTEGER, INTEGER]
+
+    name = f"recent_picks_page_{sort_column}_{order.lower()}"
+    return Query(name, _tagged(name, sql),
+                 params + conf_params + keyset_params, types + conf_types + keyset_types)
+
+
+# ---------------------------------------------------------------------------
+# Execution
+# ---------------------------------------------------------------------------
+
+# "SQL Server parse and compile time: CPU time = 0 ms, elapsed time = 3 ms."
+COMPILE_TIME_PATTERN = re.compile(r'parse and compile time:\s*CPU time = (\d+) ms,\s*elapsed time = (\d+) ms',
+                                  re.IGNORECASE)
+
+PLAN_USECOUNT_SQL = """
+SELECT TOP 1 p.usecounts
+FROM sys.dm_exec_cached_plans p
+CROSS APPLY sys.dm_exec_sql_text(p.plan_handle) t
+WHERE t.text LIKE ? AND t.text NOT LIKE '%dm_exec_cached_plans%'
+ORDER BY p.usecounts DESC
+"""
+
+_plan_stats_available = True
+
+
+def _cursor_for(pool, conn, query):
+    """Cursor to run a query on (reused per shape when prepared statements are on)"""
+    if not PREPARED_STATEMENTS:
+        return conn.cursor()
+    cursors = pool.state(conn).setdefault('cursors', {})
+    cursor = cursors.get(query.name)
+    if cursor is None:
+        cursor = cursors[query.name] = conn.cursor()
+    return cursor
+
+
+def _enable_statistics_time(pool, conn):
+    """SET STATISTICS TIME ON once per connection (debug logging only)"""
+    if DIALECT != 'tsql':
+        return
+    state = pool.state(conn)
+    if not state.get('statistics_time'):
+        conn.execute("SET STATISTICS TIME ON")
+        state['statistics_time'] = True
+
+
+def _compile_time(cursor):
+    """Parse/compile time in ms reported for the last execute, or None if not reported"""
+    for _, message in getattr(cursor, 'messages', None) or []:
+        match = COMPILE_TIME_PATTERN.search(str(message))
+        if match:
+            return int(match.group(2))
+    return None
+
+
+def _plan_use_count(conn, query):
+    """How many times SQL Server has used the cached plan for this query shape"""
+    global _plan_stats_available
+    if not _plan_stats_available or DIALECT != 'tsql':
+        return None
+    try:
+        row = conn.cursor().execute(PLAN_USECOUNT_SQL, f"%dashboard:{query.name} */%").fetchone()
+    except storage.DB_ERRORS:
+        # Needs VIEW SERVER STATE; stop asking if the login does not have it
+        _plan_stats_available = False
+        logger.debug("Plan cache statistics unavailable (VIEW SERVER STATE permission required)")
+        return None
+    return row[0] if row else None
+
+
+def run_query(pool, query):
+    """
+    Run a Query on a pooled connection
+
+    With the logger at DEBUG level, also reports the parse/compile time and the
+    cached plan's use count, which should climb as filters change if the plan
+    is being reused. Stage timings (acquire/execute/fetch), row counts and the
+    query fingerprint are recorded in the metrics module for /metrics.
+
+    Returns:
+        DataFrame of the result set (DECIMAL columns come back as floats)
+    """
+    debug = logger.isEnabledFor(logging.DEBUG)
+    started = time.perf_counter()
+
+    with pool.connection() as conn:
+        # Waiting for a pooled connection (or opening a new one)
+        metrics.sql_stage_seconds.observe(time.perf_counter() - started, query.name, 'acquire')
+
+        if debug:
+            _enable_statistics_time(pool, conn)
+
+        cursor = _cursor_for(pool, conn, query)
+        with metrics.span(query.name, 'execute'):
+            if query.types and DIALECT == 'tsql':
+                cursor.setinputsizes(query.types)
+            cursor.execute(query.sql, query.params)
+
+        with metrics.span(query.name, 'fetch'):
+            rows = cursor.fetchall()
+            columns = [column[0] for column in cursor.description]
+            df = pd.DataFrame.from_records([tuple(row) for row in rows], columns=columns, coerce_float=True)
+
+        if debug:
+            logger.debug("%s: %d rows in %.1f ms (compile %s ms, plan use count %s)",
+                         query.name, len(rows), (time.perf_counter() - started) * 1000,
+                         _compile_time(cursor), _plan_use_count(conn, query))
+
+    metrics.record_query(query.name, query.sql, query.params, len(df), time.perf_counter() - started)
+    return df
@@ -0,0 +1,160 @@
+"""
+Query Result Cache
+LRU + TTL cache for the dashboard's get_* query functions, keyed on the
+normalized filter values and dropped whenever an import changes the data
+"""
+
+import functools
+import inspect
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+from data_version import bump_data_version, current_data_version
+
+
+# Every cache created in this process, so invalidate_all() can reach them
+_caches = weakref.WeakSet()
+
+
+def normalize_filter(name, value):
+    """
+    Normalize one filter argument so equivalent selections share a cache key
+
+    'ALL' / '' / None all mean "no filter"; numbers compare by value; codes compare case-insensitively
+    """
+    if value is None or value == '' or value == 'ALL':
+        return None
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return float(value)
+    if name == 'direction':
+        return str(value).upper()
+    return value
+
+
+class QueryCache:
+    """
+    Thread-safe LRU cache with a time-to-live
+
+    Args:
+        max_entries: Entries kept before the least recently used is evicted
+        ttl: Seconds an entry stays valid
+    """
+
+    def __init__(self, max_entries=256, ttl=600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._version = current_data_version()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'invalidations': 0}
+        _caches.add(self)
+
+    def _check_version(self):
+        # An import in another process bumped the data version
+        version = current_data_version()
+        if version != self._version:
+            self._entries.clear()
+            self._version = version
+            self._stats['invalidations'] += 1
+
+    def get(self, key):
+        """
+        Look up a cached value
+
+        Returns:
+            (True, value) on a hit, (False, None) on a miss
+        """
+        with self._lock:
+            self._check_version()
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self._stats['misses'] += 1
+                return False, None
+
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                self._stats['expirations'] += 1
+                self._stats['misses'] += 1
+                return False, None
+
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return True, value
+
+    def put(self, key, value):
+        """Store a value, evicting the least recently used entry when full"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def invalidate(self):
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+            self._version = current_data_version()
+            self._stats['invalidations'] += 1
+
+    def stats(self):
+        """
+        Snapshot of cache counters
+
+        Returns:
+            Dict with hits, misses, hit_rate, evictions, expirations, invalidations and size
+        """
+        with self._lock:
+            snapshot = dict(self._stats)
+            lookups = snapshot['hits'] + snapshot['misses']
+            snapshot['hit_rate'] = snapshot['hits'] / lookups if lookups else 0.0
+            snapshot['size'] = len(self._entries)
+            snapshot['max_entries'] = self.max_entries
+            return snapshot
+
+
+def cached_query(cache):
+    """
+    Decorator caching a get_* function's result on its normalized arguments
+
+    Positional and keyword calls with the same values share an entry, and
+    DataFrame results are copied on the way out so callers can modify them.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (func.__name__,) + tuple(
+                (name, normalize_filter(name, value)) for name, value in bound.arguments.items()
+            )
+
+            hit, value = cache.get(key)
+            if not hit:
+                value = func(*args, **kwargs)
+                cache.put(key, value)
+
+            return value.copy() if hasattr(value, 'copy') else value
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+def invalidate_all():
+    """
+    Invalidation hook for the importer: clear caches in this process and
+    bump the data version so running dashboard workers drop theirs too
+    """
+    bump_data_version()
+    for cache in list(_caches):
+        cache.invalidate()
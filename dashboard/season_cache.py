@@ -0,0 +1,209 @@
+"""
+Season Cache
+Typed columnar copies of the season CSVs: one Parquet file per season
+(SEASON_CACHE_DIR, default data/seasons/) with a date column, dictionary
+encoded team names, nullable int16 scores and nullable float32 lines,
+sorted by date.
+
+read_season() is how everything reads season data (analytics_engine's
+offline rows, sql/bulk_import.py): it projects the requested columns and
+pushes date and team filters into the Parquet scan, so the row groups
+outside the range are never decoded. A cache file is rebuilt whenever its
+CSV's size or modified time changes.
+
+pyarrow is optional. Without it read_season parses the CSV with pandas into
+the same dtypes and filters afterwards, so callers see identical frames.
+
+Run: python season_cache.py [--csv-dir DIR]   # convert every season CSV now
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # CSV fallback only
+    pa = pq = None
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+CACHE_DIR = Path(os.getenv('SEASON_CACHE_DIR', PROJECT_ROOT / 'data' / 'seasons'))
+
+# Same season files as sql/import_data.py
+CSV_FILES = {
+    'ncaabb22.csv': '2021-22',
+    'ncaabb23.csv': '2022-23',
+    'ncaabb24.csv': '2023-24'
+}
+
+DATE_COLUMN = 'date'
+TEAM_COLUMNS = ['home', 'road']
+INT_COLUMNS = ['hscore', 'rscore', 'neutral', 'lineround']
+# Every other CSV column (line*, std) is a float32 line with at most two decimals
+
+# Three row groups per season: their date min/max statistics let a date-range read
+# skip most of a season, while smaller groups made full reads several times slower
+# (per-chunk overhead on ~30 columns)
+ROW_GROUP_SIZE = 2048
+
+SOURCE_SIZE_KEY = b'season_cache.source_size'
+SOURCE_MTIME_KEY = b'season_cache.source_mtime'
+
+
+def _typed(frame):
+    """Coerce raw CSV strings to the cache dtypes (invalid cells become missing)"""
+    typed = {}
+    for column in frame.columns:
+        values = frame[column]
+        if column == DATE_COLUMN:
+            typed[column] = pd.to_datetime(values, format='%m/%d/%Y', errors='coerce')
+        elif column in TEAM_COLUMNS:
+            typed[column] = values.astype('category')
+        elif column in INT_COLUMNS:
+            numbers = pd.to_numeric(values, errors='coerce')
+            typed[column] = numbers.where(numbers == np.round(numbers)).astype('Int16')
+        else:
+            typed[column] = pd.to_numeric(values, errors='coerce').astype(np.float32)
+    return pd.DataFrame(typed)
+
+
+def read_csv_typed(csv_path, columns=None):
+    """Parse a season CSV into the cache dtypes"""
+    # Numbers go through pandas' C parser; _typed still coerces any cell it could not read
+    raw = pd.read_csv(csv_path, dtype={column: str for column in [DATE_COLUMN, *TEAM_COLUMNS]},
+                      usecols=columns, keep_default_na=False, na_values=[''])
+    return _typed(raw)
+
+
+def cache_path(csv_path):
+    """Parquet file for a season CSV"""
+    return CACHE_DIR / (Path(csv_path).stem + '.parquet')
+
+
+def convert_season(csv_path, path=None):
+    """
+    Write the typed Parquet copy of one season CSV
+
+    Args:
+        csv_path: Season CSV
+        path: Output file (cache_path(csv_path) by default)
+
+    Returns:
+        Path of the written file
+    """
+    path = Path(path or cache_path(csv_path))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    stat = os.stat(csv_path)
+
+    # Stable sort: rows of one game keep their CSV order (the importer takes the first value)
+    frame = read_csv_typed(csv_path).sort_values(DATE_COLUMN, kind='stable')
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        SOURCE_SIZE_KEY: str(stat.st_size).encode(),
+        SOURCE_MTIME_KEY: str(stat.st_mtime_ns).encode(),
+    })
+
+    # Write to a temp file first so a reader never sees half a file
+    temp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+    pq.write_table(table, temp_path, compression='zstd', row_group_size=ROW_GROUP_SIZE,
+                   use_dictionary=TEAM_COLUMNS, write_statistics=True)
+    os.replace(temp_path, path)
+    return path
+
+
+def _is_current(path, csv_path):
+    try:
+        metadata = pq.read_schema(path).metadata or {}
+    except (OSError, pa.ArrowInvalid):
+        return False
+    stat = os.stat(csv_path)
+    return (metadata.get(SOURCE_SIZE_KEY) == str(stat.st_size).encode()
+            and metadata.get(SOURCE_MTIME_KEY) == str(stat.st_mtime_ns).encode())
+
+
+def season_file(csv_path):
+    """Up-to-date Parquet copy of a season CSV (converted on demand), or None without pyarrow"""
+    if pq is None:
+        return None
+    path = cache_path(csv_path)
+    if not path.exists() or not _is_current(path, csv_path):
+        convert_season(csv_path, path)
+    return path
+
+
+def _filters(start, end, teams):
+    """DNF filter list for pyarrow: date range AND (home in teams OR road in teams)"""
+    dates = []
+    if start is not None:
+        dates.append((DATE_COLUMN, '>=', pd.Timestamp(start)))
+    if end is not None:
+        dates.append((DATE_COLUMN, '<=', pd.Timestamp(end)))
+    if not teams:
+        return [dates] if dates else None
+    return [dates + [(column, 'in', list(teams))] for column in TEAM_COLUMNS]
+
+
+def read_season(csv_path, columns=None, start=None, end=None, teams=None):
+    """
+    Read one season's rows in CSV order within each date
+
+    Args:
+        csv_path: Season CSV (the cache file is found or built from it)
+        columns: Columns to load (all by default)
+        start: Only rows on or after this date
+        end: Only rows on or before this date
+        teams: Only rows where the home or road team is one of these names
+
+    Returns:
+        DataFrame with datetime64 date, categorical teams, Int16 scores and float32 lines
+    """
+    path = season_file(csv_path)
+    if path is not None:
+        table = pq.read_table(path, columns=columns, filters=_filters(start, end, teams))
+        return table.to_pandas(date_as_object=False).reset_index(drop=True)
+
+    # Parse only what is returned, plus the columns the sort and filters need
+    needed = None
+    if columns:
+        needed = list(dict.fromkeys([*columns, DATE_COLUMN, *(TEAM_COLUMNS if teams else [])]))
+    frame = read_csv_typed(csv_path, columns=needed).sort_values(DATE_COLUMN, kind='stable')
+    mask = np.ones(len(frame), dtype=bool)
+    if start is not None:
+        mask &= (frame[DATE_COLUMN] >= pd.Timestamp(start)).to_numpy()
+    if end is not None:
+        mask &= (frame[DATE_COLUMN] <= pd.Timestamp(end)).to_numpy()
+    if teams:
+        mask &= (frame['home'].isin(teams) | frame['road'].isin(teams)).to_numpy()
+    frame = frame[mask]
+    return (frame[columns] if columns else frame).reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert the season CSVs to the typed Parquet cache')
+    parser.add_argument('--csv-dir', default=str(PROJECT_ROOT), help='Folder with ncaabb*.csv')
+    args = parser.parse_args()
+
+    if pq is None:
+        print("✗ pyarrow is not installed (pip install pyarrow); readers will parse the CSVs")
+        sys.exit(1)
+
+    for csv_file in CSV_FILES:
+        csv_path = Path(args.csv_dir) / csv_file
+        if not csv_path.exists():
+            print(f"✗ File not found: {csv_path}")
+            continue
+        path = convert_season(csv_path)
+        rows = pq.read_metadata(path).num_rows
+        print(f"✓ {csv_file}: {rows} rows, {os.path.getsize(csv_path) / 1024:.0f} KB CSV -> "
+              f"{os.path.getsize(path) / 1024:.0f} KB {path}")
+
+
+if __name__ == '__main__':
+    main()
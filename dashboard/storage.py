@@ -0,0 +1,230 @@
+"""
+Storage Backends
+Where the SportsAnalytics data lives, chosen once by DB_BACKEND for the
+dashboard, sql/import_data.py and daily_picks:
+
+  sqlserver - SQL Server over ODBC Driver 17 (default; DB_SERVER, DB_NAME)
+  sqlite    - embedded single-file database (DB_SQLITE_PATH), no server or
+              ODBC driver needed; schema in sql/sqlite_schema.sql
+
+Both expose the same dbo.* tables and views, so the callers' queries only
+differ where T-SQL syntax has no SQLite equivalent (query_builder checks
+DIALECT for paging). Stored procedure calls go through the backend's
+refresh_* methods.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import date, datetime
+from pathlib import Path
+
+try:
+    import pyodbc
+except ImportError:  # only the embedded SQLite backend is usable
+    pyodbc = None
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+SQL_SERVER = os.getenv('DB_SERVER', r'MSI\SQLEXPRESS')
+SQL_DATABASE = os.getenv('DB_NAME', 'SportsAnalytics')
+SQLITE_PATH = Path(os.getenv('DB_SQLITE_PATH', PROJECT_ROOT / 'data' / 'sports_analytics.db'))
+
+SQLITE_SCHEMA = PROJECT_ROOT / 'sql' / 'sqlite_schema.sql'
+# Bump when sqlite_schema.sql changes so existing files recreate their views
+SCHEMA_VERSION = 1
+
+# Conference types per team, exported from dbo.Teams by daily_picks/load_teams.py
+TEAMS_CACHE = PROJECT_ROOT / 'daily_picks' / 'teams_cache.json'
+
+# Driver errors from either backend (e.g. to discard a broken pooled connection)
+DB_ERRORS = (sqlite3.Error,) + ((pyodbc.Error,) if pyodbc else ())
+
+
+class SqlServerBackend:
+    """SQL Server through pyodbc (Windows authentication)"""
+
+    name = 'sqlserver'
+    dialect = 'tsql'
+
+    def __init__(self, server=SQL_SERVER, database=SQL_DATABASE):
+        self.server = server
+        self.database = database
+
+    def describe(self):
+        return f"SQL Server {self.server}/{self.database}"
+
+    def connect(self, autocommit=False, timeout=None):
+        """Open a new pyodbc connection (timeout: seconds for the login and each query)"""
+        if pyodbc is None:
+            raise RuntimeError("pyodbc is not installed (set DB_BACKEND=sqlite for the embedded database)")
+        conn_str = (
+            'DRIVER={ODBC Driver 17 for SQL Server};'
+            f'SERVER={self.server};'
+            f'DATABASE={self.database};'
+            'Trusted_Connection=yes;'
+        )
+        if timeout is None:
+            return pyodbc.connect(conn_str, autocommit=autocommit)
+        conn = pyodbc.connect(conn_str, autocommit=autocommit, timeout=timeout)
+        conn.timeout = timeout
+        return conn
+
+    def refresh_game_facts(self, cursor, season_id=None):
+        """Rebuild the GameFacts rows for one season (all seasons when None)"""
+        cursor.execute("EXEC dbo.usp_RefreshGameFacts @SeasonID = ?", (season_id,))
+
+    def refresh_strategy_summary(self, cursor, season_id=None):
+        """Recompute the StrategySummary rows for one season (all seasons when None)"""
+        cursor.execute("EXEC dbo.usp_RefreshStrategySummary @SeasonID = ?", (season_id,))
+
+
+# usp_RefreshGameFacts / usp_RefreshStrategySummary for SQLite: delete and
+# reinsert the season's rows (the whole table is a few thousand rows per season)
+SQLITE_REFRESH_GAME_FACTS = [
+    "DELETE FROM dbo.GameFacts WHERE ? IS NULL OR SeasonID = ?",
+    "INSERT INTO dbo.GameFacts SELECT * FROM dbo.vw_GameFactsSource WHERE ? IS NULL OR SeasonID = ?",
+]
+
+SQLITE_REFRESH_STRATEGY_SUMMARY = [
+    """
+    DELETE FROM dbo.StrategySummary
+    WHERE ? IS NULL OR SeasonYear = (SELECT SeasonYear FROM dbo.Seasons WHERE SeasonID = ?)
+    """,
+    """
+    INSERT INTO dbo.StrategySummary
+        (SeasonYear, GameMonth, ConferenceType, Direction, AbsEdge, Covered, Missed, Profit)
+    SELECT
+        v.SeasonYear,
+        MONTH(v.GameDate),
+        COALESCE(c.HomeConferenceType, 'Unknown'),
+        CASE WHEN v.ESPNEdge > 0 THEN 'UNDERDOG' WHEN v.ESPNEdge < 0 THEN 'FAVORITE' ELSE 'NONE' END AS Direction,
+        v.AbsESPNEdge,
+        SUM(v.CoverResult = 'COVERED') AS Covered,
+        SUM(v.CoverResult = 'MISSED') AS Missed,
+        SUM(v.CoverResult = 'COVERED') * 100 - SUM(v.CoverResult = 'MISSED') * 110
+    FROM dbo.vw_ESPNvsClosingLine v
+    LEFT JOIN dbo.vw_GamesWithConferences c ON v.GameID = c.GameID
+    WHERE v.CoverResult IS NOT NULL
+      AND (? IS NULL OR v.SeasonYear = (SELECT SeasonYear FROM dbo.Seasons WHERE SeasonID = ?))
+    GROUP BY 1, 2, 3, 4, 5
+    """,
+]
+
+
+def _month(value):
+    """MONTH() for ISO date text"""
+    return int(value[5:7]) if value else None
+
+
+# Dates are stored as ISO text and come back as date/datetime like pyodbc returns them
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(sep=' '))
+sqlite3.register_converter('DATE', lambda value: date.fromisoformat(value.decode()))
+sqlite3.register_converter('DATETIME2', lambda value: datetime.fromisoformat(value.decode()))
+
+
+class SQLiteBackend:
+    """
+    Embedded SQLite file attached as schema "dbo"
+
+    Each connection opens an in-memory main database and attaches the file as
+    dbo, so dbo.Games and plain Games both resolve. The schema (and the team
+    list from teams_cache.json) is applied on first connect.
+    """
+
+    name = 'sqlite'
+    dialect = 'sqlite'
+
+    def __init__(self, path=SQLITE_PATH):
+        self.path = Path(path)
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    def describe(self):
+        return f"SQLite {self.path}"
+
+    def connect(self, autocommit=False, timeout=None):
+        """Open a new connection (usable from any thread, one thread at a time; timeout: seconds to wait on a lock)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(':memory:', timeout=30 if timeout is None else timeout, detect_types=sqlite3.PARSE_DECLTYPES,
+                               isolation_level=None, check_same_thread=False)
+        conn.execute("ATTACH DATABASE ? AS dbo", (str(self.path),))
+        conn.create_function('MONTH', 1, _month, deterministic=True)
+        if not self._schema_ready:
+            self._ensure_schema(conn)
+        if not autocommit:
+            conn.isolation_level = ''
+        return conn
+
+    def _ensure_schema(self, conn):
+        with self._schema_lock:
+            if self._schema_ready:
+                return
+            # WAL lets the dashboard read while an import writes
+            conn.execute("PRAGMA dbo.journal_mode = WAL")
+            # Every statement in the script is idempotent, so processes racing here are harmless
+            if conn.execute("PRAGMA dbo.user_version").fetchone()[0] < SCHEMA_VERSION:
+                conn.executescript(f"BEGIN IMMEDIATE;\n{SQLITE_SCHEMA.read_text(encoding='utf-8')}\n"
+                                   f"PRAGMA dbo.user_version = {SCHEMA_VERSION};\nCOMMIT;")
+            if conn.execute("SELECT COUNT(*) FROM dbo.Teams").fetchone()[0] == 0:
+                with conn:
+                    self._load_teams(conn)
+            self._schema_ready = True
+
+    def _load_teams(self, conn):
+        """Teams and conference types from teams_cache.json (one conference row per type)"""
+        try:
+            with open(TEAMS_CACHE, 'r') as f:
+                teams_db = json.load(f)
+        except FileNotFoundError:
+            return
+        conn.executemany("INSERT OR IGNORE INTO dbo.Conferences (ConferenceName, ConferenceType) VALUES (?, ?)",
+                         [(conf_type, conf_type) for conf_type in sorted(set(teams_db.values()))])
+        conn.executemany("""
+            INSERT OR IGNORE INTO dbo.Teams (TeamName, ConferenceID)
+            SELECT ?, ConferenceID FROM dbo.Conferences WHERE ConferenceName = ?
+        """, sorted(teams_db.items()))
+
+    def _run(self, cursor, statements, season_id):
+        for sql in statements:
+            cursor.execute(sql, (season_id, season_id))
+
+    def refresh_game_facts(self, cursor, season_id=None):
+        """Rebuild the GameFacts rows for one season (all seasons when None)"""
+        self._run(cursor, SQLITE_REFRESH_GAME_FACTS, season_id)
+
+    def refresh_strategy_summary(self, cursor, season_id=None):
+        """Recompute the StrategySummary rows for one season (all seasons when None)"""
+        self._run(cursor, SQLITE_REFRESH_STRATEGY_SUMMARY, season_id)
+
+
+BACKENDS = {
+    SqlServerBackend.name: SqlServerBackend,
+    SQLiteBackend.name: SQLiteBackend,
+}
+
+_backend = None
+
+
+def get_backend():
+    """The configured backend (DB_BACKEND, default sqlserver)"""
+    global _backend
+    if _backend is None:
+        name = os.getenv('DB_BACKEND', SqlServerBackend.name).lower()
+        if name not in BACKENDS:
+            raise ValueError(f"Unknown DB_BACKEND {name!r} (expected one of {', '.join(BACKENDS)})")
+        _backend = BACKENDS[name]()
+    return _backend
+
+
+def team_name_key(name):
+    """How a CSV team name is matched to dbo.Teams (by the importer and the offline engine)"""
+    return name.strip().lower()
+
+
+def connect(autocommit=False, timeout=None):
+    """New connection to the configured backend (timeout: seconds before giving up, None for the driver default)"""
+    return get_backend().connect(autocommit=autocommit, timeout=timeout)
@@ -21,6 +21,11 @@ ESSENTIAL SCRIPTS (in order):
 14. 26_FixConferenceTypes.sql      - Fixes conference classifications (Mid-Major = 4 only)
 15. 28_AddAllTeamAliases.sql       - Adds 58 team name variations from CSVs
 16. 29_RecreateGamesWithConferencesView.sql - Recreates view to use Teams table
+17. 30_CreateGameFacts.sql         - Materialized GameFacts table; vw_GamesWithPredictions and
+                                     vw_ESPNvsClosingLine read from it (rerun after 22)
+18. 31_CreateStrategySummary.sql   - Pre-aggregated strategy results the dashboard charts sum over
+19. 32_AddTeamKeysToGames.sql      - HomeTeamID/RoadTeamID on Games; vw_GamesWithConferences joins on them
+20. 33_CreateImportManifest.sql    - File and row hashes that make import_data.py incremental and resumable
 
 OBSOLETE/DUPLICATE SCRIPTS (safe to archive):
 - 07-14: Early import attempts with various issues (duplicates, wrong terminators)
@@ -32,6 +37,11 @@ NOTES:
 - Scripts 07-14 were iterative attempts to solve CSV import issues
 - Script 15 is the FINAL working version that handles all 3 seasons
 - Script 18 is the FINAL working version for predictions
+- GameFacts and StrategySummary are refreshed by import_data.py; after importing
+  with SQL scripts (e.g. 21) run EXEC dbo.usp_RefreshGameFacts; and then
+  EXEC dbo.usp_RefreshStrategySummary; (the latter also after team/conference changes)
+- After adding team aliases run EXEC dbo.usp_ResolveGameTeams; then refresh the
+  strategy summary. dbo.vw_UnresolvedTeamNames lists names with no Teams row.
 - Scripts 11-14 show the debugging process but aren't needed for fresh setup
 */
 
@@ -39,8 +49,8 @@ PRINT '========================================';
 PRINT 'NCAA Basketball Prediction Tracker Setup';
 PRINT '========================================';
 PRINT '';
-PRINT 'This database requires 16 scripts to set up completely.';
-PRINT 'Run scripts 01-06, 15, 18-23, 25-26, 28-29 in order.';
+PRINT 'This database requires 20 scripts to set up completely.';
+PRINT 'Run scripts 01-06, 15, 18-23, 25-26, 28-33 in order.';
 PRINT '';
 PRINT 'See sql/SETUP_GUIDE.md for detailed instructions.';
 GO
@@ -0,0 +1,260 @@
+-- ============================================
+-- Materialized Game Facts
+-- One row per game with the consensus/opening/closing lines and the ESPN
+-- prediction already pivoted into columns. vw_GamesWithPredictions used to
+-- run five correlated subqueries per game on every read; the views below now
+-- read this table instead, and usp_RefreshGameFacts keeps it in step with
+-- Games, GameLines and GamePredictions.
+--
+-- Run after 22_CreateClosingLineViews.sql. Anything that writes games, lines
+-- or predictions outside import_data.py (e.g. 21_ImportClosingLine.sql) must
+-- be followed by:  EXEC dbo.usp_RefreshGameFacts;
+-- ============================================
+USE SportsAnalytics;
+GO
+
+-- Views depending on GameFacts are recreated below
+IF OBJECT_ID('dbo.vw_ESPNvsClosingLine', 'V') IS NOT NULL
+    DROP VIEW dbo.vw_ESPNvsClosingLine;
+GO
+
+IF OBJECT_ID('dbo.vw_GamesWithPredictions', 'V') IS NOT NULL
+    DROP VIEW dbo.vw_GamesWithPredictions;
+GO
+
+IF OBJECT_ID('dbo.GameFacts', 'U') IS NOT NULL
+    DROP TABLE dbo.GameFacts;
+GO
+
+CREATE TABLE dbo.GameFacts (
+    GameID INT NOT NULL,
+    SportID INT NOT NULL,
+    SportName NVARCHAR(50) NOT NULL,
+    SeasonID INT NOT NULL,
+    SeasonYear NVARCHAR(20) NOT NULL,
+    GameDate DATE NOT NULL,
+    HomeTeam NVARCHAR(100) NOT NULL,
+    RoadTeam NVARCHAR(100) NOT NULL,
+    HomeScore INT NULL,
+    RoadScore INT NULL,
+    IsNeutralSite BIT NULL,
+    RoundNumber INT NULL,
+    ConsensusLine DECIMAL(10,2) NULL,
+    OpeningLine DECIMAL(10,2) NULL,
+    ClosingLine DECIMAL(10,2) NULL,
+    LineStdDev DECIMAL(10,4) NULL,
+    ESPNLine DECIMAL(10,2) NULL,
+    ActualMargin AS (HomeScore - RoadScore) PERSISTED,
+    Winner AS (
+        CASE
+            WHEN HomeScore > RoadScore THEN 'HOME'
+            WHEN RoadScore > HomeScore THEN 'ROAD'
+            WHEN HomeScore = RoadScore THEN 'TIE'
+        END
+    ) PERSISTED,
+    ESPNEdge AS (ClosingLine - ESPNLine) PERSISTED,
+    AbsESPNEdge AS (ABS(ClosingLine - ESPNLine)) PERSISTED,
+    RefreshedAt DATETIME2(0) NOT NULL CONSTRAINT DF_GameFacts_RefreshedAt DEFAULT SYSUTCDATETIME(),
+    CONSTRAINT PK_GameFacts PRIMARY KEY CLUSTERED (GameID)
+);
+GO
+
+-- Season/date browsing (vw_GamesWithPredictions, per-season refresh)
+CREATE INDEX IX_GameFacts_Season_Date ON dbo.GameFacts (SeasonID, GameDate)
+    INCLUDE (SeasonYear, HomeTeam, RoadTeam, HomeScore, RoadScore, ClosingLine, ESPNLine);
+
+-- ESPN vs closing line strategy rows only: the dashboard's edge filter...
+CREATE INDEX IX_GameFacts_ESPN_Edge ON dbo.GameFacts (AbsESPNEdge)
+    INCLUDE (SeasonYear, GameDate, HomeTeam, RoadTeam, HomeScore, RoadScore, ClosingLine, ESPNLine, ESPNEdge)
+    WHERE ESPNLine IS NOT NULL AND ClosingLine IS NOT NULL;
+
+-- ...and the recent picks table, newest first
+CREATE INDEX IX_GameFacts_ESPN_Date ON dbo.GameFacts (GameDate DESC, GameID DESC)
+    INCLUDE (SeasonYear, HomeTeam, RoadTeam, HomeScore, RoadScore, ClosingLine, ESPNLine, ESPNEdge)
+    WHERE ESPNLine IS NOT NULL AND ClosingLine IS NOT NULL;
+GO
+
+-- ============================================
+-- Stored Procedure: Refresh GameFacts
+-- @SeasonID = NULL refreshes every game; otherwise only that season's games.
+-- Rows are only rewritten when something actually changed.
+-- ============================================
+IF OBJECT_ID('dbo.usp_RefreshGameFacts', 'P') IS NOT NULL
+    DROP PROCEDURE dbo.usp_RefreshGameFacts;
+GO
+
+CREATE PROCEDURE dbo.usp_RefreshGameFacts
+    @SeasonID INT = NULL
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    -- One pass over GameLines per refresh instead of one lookup per game and line type
+    WITH Lines AS (
+        SELECT
+            gl.GameID,
+            MAX(CASE WHEN gl.LineType = 'CONSENSUS' THEN gl.Line END) AS ConsensusLine,
+            MAX(CASE WHEN gl.LineType = 'OPENING' THEN gl.Line END) AS OpeningLine,
+            MAX(CASE WHEN gl.LineType = 'CLOSING' THEN gl.Line END) AS ClosingLine,
+            MAX(CASE WHEN gl.LineType = 'CONSENSUS' THEN gl.StandardDeviation END) AS LineStdDev
+        FROM dbo.GameLines gl
+        INNER JOIN dbo.Games g ON gl.GameID = g.GameID
+        WHERE @SeasonID IS NULL OR g.SeasonID = @SeasonID
+        GROUP BY gl.GameID
+    ),
+    ESPN AS (
+        SELECT gp.GameID, gp.PredictedLine AS ESPNLine
+        FROM dbo.GamePredictions gp
+        INNER JOIN dbo.PredictionModels pm ON gp.ModelID = pm.ModelID
+        WHERE pm.ModelCode = 'ESPN'
+    ),
+    Source AS (
+        SELECT
+            g.GameID,
+            g.SportID,
+            s.SportName,
+            g.SeasonID,
+            sn.SeasonYear,
+            g.GameDate,
+            g.HomeTeam,
+            g.RoadTeam,
+            g.HomeScore,
+            g.RoadScore,
+            g.IsNeutralSite,
+            g.RoundNumber,
+            l.ConsensusLine,
+            l.OpeningLine,
+            l.ClosingLine,
+            l.LineStdDev,
+            e.ESPNLine
+        FROM dbo.Games g
+        INNER JOIN dbo.Sports s ON g.SportID = s.SportID
+        INNER JOIN dbo.Seasons sn ON g.SeasonID = sn.SeasonID
+        LEFT JOIN Lines l ON g.GameID = l.GameID
+        LEFT JOIN ESPN e ON g.GameID = e.GameID
+        WHERE @SeasonID IS NULL OR g.SeasonID = @SeasonID
+    )
+    MERGE dbo.GameFacts WITH (HOLDLOCK) AS t
+    USING Source AS src
+        ON t.GameID = src.GameID
+    WHEN MATCHED AND EXISTS (
+        SELECT src.SportID, src.SportName, src.SeasonID, src.SeasonYear, src.GameDate,
+               src.HomeTeam, src.RoadTeam, src.HomeScore, src.RoadScore, src.IsNeutralSite,
+               src.RoundNumber, src.ConsensusLine, src.OpeningLine, src.ClosingLine,
+               src.LineStdDev, src.ESPNLine
+        EXCEPT
+        SELECT t.SportID, t.SportName, t.SeasonID, t.SeasonYear, t.GameDate,
+               t.HomeTeam, t.RoadTeam, t.HomeScore, t.RoadScore, t.IsNeutralSite,
+               t.RoundNumber, t.ConsensusLine, t.OpeningLine, t.ClosingLine,
+               t.LineStdDev, t.ESPNLine
+    ) THEN
+        UPDATE SET
+            SportID = src.SportID,
+            SportName = src.SportName,
+            SeasonID = src.SeasonID,
+            SeasonYear = src.SeasonYear,
+            GameDate = src.GameDate,
+            HomeTeam = src.HomeTeam,
+            RoadTeam = src.RoadTeam,
+            HomeScore = src.HomeScore,
+            RoadScore = src.RoadScore,
+            IsNeutralSite = src.IsNeutralSite,
+            RoundNumber = src.RoundNumber,
+            ConsensusLine = src.ConsensusLine,
+            OpeningLine = src.OpeningLine,
+            ClosingLine = src.ClosingLine,
+            LineStdDev = src.LineStdDev,
+            ESPNLine = src.ESPNLine,
+            RefreshedAt = SYSUTCDATETIME()
+    WHEN NOT MATCHED BY TARGET THEN
+        INSERT (GameID, SportID, SportName, SeasonID, SeasonYear, GameDate, HomeTeam, RoadTeam,
+                HomeScore, RoadScore, IsNeutralSite, RoundNumber, ConsensusLine, OpeningLine,
+                ClosingLine, LineStdDev, ESPNLine)
+        VALUES (src.GameID, src.SportID, src.SportName, src.SeasonID, src.SeasonYear, src.GameDate,
+                src.HomeTeam, src.RoadTeam, src.HomeScore, src.RoadScore, src.IsNeutralSite,
+                src.RoundNumber, src.ConsensusLine, src.OpeningLine, src.ClosingLine,
+                src.LineStdDev, src.ESPNLine)
+    WHEN NOT MATCHED BY SOURCE AND (@SeasonID IS NULL OR t.SeasonID = @SeasonID) THEN
+        DELETE
+    OPTION (RECOMPILE);
+END
+GO
+
+-- ============================================
+-- Views now read the materialized facts (same columns as before)
+-- ============================================
+CREATE VIEW dbo.vw_GamesWithPredictions
+AS
+SELECT
+    GameID,
+    SportName,
+    SeasonYear,
+    GameDate,
+    HomeTeam,
+    RoadTeam,
+    HomeScore,
+    RoadScore,
+    IsNeutralSite,
+    RoundNumber,
+    ActualMargin,
+    Winner,
+    ConsensusLine,
+    OpeningLine,
+    ClosingLine,
+    LineStdDev,
+    ESPNLine
+FROM dbo.GameFacts;
+GO
+
+CREATE VIEW dbo.vw_ESPNvsClosingLine
+AS
+SELECT
+    GameID,
+    SportName,
+    SeasonYear,
+    GameDate,
+    HomeTeam,
+    RoadTeam,
+    HomeScore,
+    RoadScore,
+    IsNeutralSite,
+    ClosingLine,
+    ESPNLine,
+    ESPNEdge,
+    AbsESPNEdge,
+    CASE
+        WHEN ClosingLine > 0 AND ESPNLine <= -3 THEN 'ROAD (Strong)'
+        WHEN ClosingLine > 0 AND ESPNLine < 0 THEN 'ROAD (Weak)'
+        WHEN ClosingLine < 0 AND ESPNLine >= 3 THEN 'HOME (Strong)'
+        WHEN ClosingLine < 0 AND ESPNLine > 0 THEN 'HOME (Weak)'
+        ELSE 'NONE'
+    END AS ESPNFavorsUnderdog,
+    ActualMargin,
+    Winner,
+    CASE
+        WHEN ActualMargin IS NULL THEN NULL
+        WHEN ClosingLine > 0 AND ESPNLine < ClosingLine THEN
+            CASE WHEN ActualMargin < ClosingLine THEN 'COVERED' ELSE 'MISSED' END
+        WHEN ClosingLine < 0 AND ESPNLine > ClosingLine THEN
+            CASE WHEN ActualMargin > ClosingLine THEN 'COVERED' ELSE 'MISSED' END
+        ELSE NULL
+    END AS CoverResult
+FROM dbo.GameFacts
+WHERE ESPNLine IS NOT NULL
+  AND ClosingLine IS NOT NULL
+  AND AbsESPNEdge >= 3;
+GO
+
+-- Initial load
+EXEC dbo.usp_RefreshGameFacts;
+GO
+
+PRINT 'GameFacts table, refresh procedure and views created!';
+GO
+
+-- Sanity check: every game has a fact row
+SELECT
+    (SELECT COUNT(*) FROM dbo.Games) AS Games,
+    (SELECT COUNT(*) FROM dbo.GameFacts) AS GameFacts,
+    (SELECT COUNT(*) FROM dbo.vw_ESPNvsClosingLine) AS ESPNvsClosingLineRows;
+GO
@@ -0,0 +1,113 @@
+-- ============================================
+-- Strategy Summary Aggregate
+-- Covered/missed counts and profit for the ESPN vs closing line strategy per
+-- (season, month, home conference type, edge direction, |edge|). The dashboard
+-- sums these rows instead of scanning every game, so its queries stay the same
+-- size as seasons are added.
+--
+-- The edge bucket is the exact |ESPNEdge| (lines have two decimals), so any
+-- minimum-edge threshold the dashboard slider picks is answered exactly.
+--
+-- Run after 30_CreateGameFacts.sql. import_data.py refreshes the imported
+-- season; after changing teams/conferences (25, 26, 28) or importing any other
+-- way, run:  EXEC dbo.usp_RefreshStrategySummary;
+-- ============================================
+USE SportsAnalytics;
+GO
+
+IF OBJECT_ID('dbo.StrategySummary', 'U') IS NOT NULL
+    DROP TABLE dbo.StrategySummary;
+GO
+
+CREATE TABLE dbo.StrategySummary (
+    SeasonYear NVARCHAR(20) NOT NULL,
+    GameMonth INT NOT NULL,
+    ConferenceType NVARCHAR(20) NOT NULL,  -- home team's; 'Unknown' when unmapped
+    Direction NVARCHAR(10) NOT NULL,       -- UNDERDOG (ESPNEdge > 0), FAVORITE (< 0)
+    AbsEdge DECIMAL(10,2) NOT NULL,
+    Covered INT NOT NULL,
+    Missed INT NOT NULL,
+    Profit AS (Covered * 100 - Missed * 110) PERSISTED,
+    UpdatedAt DATETIME2(0) NOT NULL CONSTRAINT DF_StrategySummary_UpdatedAt DEFAULT SYSUTCDATETIME(),
+    CONSTRAINT PK_StrategySummary PRIMARY KEY CLUSTERED (SeasonYear, GameMonth, ConferenceType, Direction, AbsEdge)
+);
+GO
+
+-- ============================================
+-- Stored Procedure: Refresh StrategySummary
+-- @SeasonID = NULL rebuilds every season; otherwise only that season's rows
+-- are recomputed (from GameFacts via vw_ESPNvsClosingLine) and merged in.
+-- ============================================
+IF OBJECT_ID('dbo.usp_RefreshStrategySummary', 'P') IS NOT NULL
+    DROP PROCEDURE dbo.usp_RefreshStrategySummary;
+GO
+
+CREATE PROCEDURE dbo.usp_RefreshStrategySummary
+    @SeasonID INT = NULL
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @SeasonYear NVARCHAR(20) = NULL;
+    IF @SeasonID IS NOT NULL
+        SELECT @SeasonYear = SeasonYear FROM dbo.Seasons WHERE SeasonID = @SeasonID;
+
+    WITH Source AS (
+        SELECT
+            v.SeasonYear,
+            MONTH(v.GameDate) AS GameMonth,
+            COALESCE(c.HomeConferenceType, 'Unknown') AS ConferenceType,
+            CASE WHEN v.ESPNEdge > 0 THEN 'UNDERDOG' WHEN v.ESPNEdge < 0 THEN 'FAVORITE' ELSE 'NONE' END AS Direction,
+            v.AbsESPNEdge AS AbsEdge,
+            SUM(CASE WHEN v.CoverResult = 'COVERED' THEN 1 ELSE 0 END) AS Covered,
+            SUM(CASE WHEN v.CoverResult = 'MISSED' THEN 1 ELSE 0 END) AS Missed
+        FROM dbo.vw_ESPNvsClosingLine v
+        LEFT JOIN (
+            SELECT GameID, MAX(HomeConferenceType) AS HomeConferenceType
+            FROM dbo.vw_GamesWithConferences
+            GROUP BY GameID
+        ) c ON v.GameID = c.GameID
+        WHERE v.CoverResult IS NOT NULL
+          AND (@SeasonYear IS NULL OR v.SeasonYear = @SeasonYear)
+        GROUP BY
+            v.SeasonYear,
+            MONTH(v.GameDate),
+            COALESCE(c.HomeConferenceType, 'Unknown'),
+            CASE WHEN v.ESPNEdge > 0 THEN 'UNDERDOG' WHEN v.ESPNEdge < 0 THEN 'FAVORITE' ELSE 'NONE' END,
+            v.AbsESPNEdge
+    )
+    MERGE dbo.StrategySummary WITH (HOLDLOCK) AS t
+    USING Source AS src
+        ON t.SeasonYear = src.SeasonYear
+       AND t.GameMonth = src.GameMonth
+       AND t.ConferenceType = src.ConferenceType
+       AND t.Direction = src.Direction
+       AND t.AbsEdge = src.AbsEdge
+    WHEN MATCHED AND (t.Covered <> src.Covered OR t.Missed <> src.Missed) THEN
+        UPDATE SET
+            Covered = src.Covered,
+            Missed = src.Missed,
+            UpdatedAt = SYSUTCDATETIME()
+    WHEN NOT MATCHED BY TARGET THEN
+        INSERT (SeasonYear, GameMonth, ConferenceType, Direction, AbsEdge, Covered, Missed)
+        VALUES (src.SeasonYear, src.GameMonth, src.ConferenceType, src.Direction, src.AbsEdge,
+                src.Covered, src.Missed)
+    WHEN NOT MATCHED BY SOURCE AND (@SeasonYear IS NULL OR t.SeasonYear = @SeasonYear) THEN
+        DELETE
+    OPTION (RECOMPILE);
+END
+GO
+
+-- Initial load
+EXEC dbo.usp_RefreshStrategySummary;
+GO
+
+PRINT 'StrategySummary table and refresh procedure created!';
+GO
+
+-- Sanity check: the summary adds up to the strategy view
+SELECT
+    (SELECT COUNT(*) FROM dbo.vw_ESPNvsClosingLine WHERE CoverResult IS NOT NULL) AS DecidedPicks,
+    (SELECT SUM(Covered + Missed) FROM dbo.StrategySummary) AS SummarizedPicks,
+    (SELECT COUNT(*) FROM dbo.StrategySummary) AS SummaryRows;
+GO
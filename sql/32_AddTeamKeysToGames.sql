@@ -0,0 +1,108 @@
+-- ============================================
+-- Integer Team Keys on Games
+-- Resolves HomeTeam/RoadTeam names to dbo.Teams (which includes the CSV name
+-- variations from 27/28_AddTeamAliases.sql) once, and stores the TeamIDs on
+-- Games. vw_GamesWithConferences then joins Teams and Conferences on integer
+-- keys instead of matching NVARCHAR names on every query.
+--
+-- import_data.py fills the IDs for new games. After adding aliases or teams,
+-- run:  EXEC dbo.usp_ResolveGameTeams;
+-- and check dbo.vw_UnresolvedTeamNames for names that still do not match.
+-- ============================================
+USE SportsAnalytics;
+GO
+
+IF COL_LENGTH('dbo.Games', 'HomeTeamID') IS NULL
+    ALTER TABLE dbo.Games ADD
+        HomeTeamID INT NULL CONSTRAINT FK_Games_HomeTeam FOREIGN KEY REFERENCES dbo.Teams(TeamID),
+        RoadTeamID INT NULL CONSTRAINT FK_Games_RoadTeam FOREIGN KEY REFERENCES dbo.Teams(TeamID);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Games_HomeTeamID' AND object_id = OBJECT_ID('dbo.Games'))
+    CREATE INDEX IX_Games_HomeTeamID ON dbo.Games(HomeTeamID) INCLUDE (SeasonID, GameDate);
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Games_RoadTeamID' AND object_id = OBJECT_ID('dbo.Games'))
+    CREATE INDEX IX_Games_RoadTeamID ON dbo.Games(RoadTeamID) INCLUDE (SeasonID, GameDate);
+GO
+
+-- ============================================
+-- View: team names with no matching dbo.Teams row
+-- ============================================
+IF OBJECT_ID('dbo.vw_UnresolvedTeamNames', 'V') IS NOT NULL
+    DROP VIEW dbo.vw_UnresolvedTeamNames;
+GO
+
+CREATE VIEW dbo.vw_UnresolvedTeamNames
+AS
+SELECT TeamName, COUNT(*) AS Games
+FROM (
+    SELECT HomeTeam AS TeamName FROM dbo.Games WHERE HomeTeamID IS NULL
+    UNION ALL
+    SELECT RoadTeam FROM dbo.Games WHERE RoadTeamID IS NULL
+) names
+GROUP BY TeamName;
+GO
+
+-- ============================================
+-- Stored Procedure: Resolve team names to TeamIDs
+-- @SeasonID = NULL resolves every game; otherwise only that season's games.
+-- Names are matched trimmed (the default collation is case-insensitive).
+-- ============================================
+IF OBJECT_ID('dbo.usp_ResolveGameTeams', 'P') IS NOT NULL
+    DROP PROCEDURE dbo.usp_ResolveGameTeams;
+GO
+
+CREATE PROCEDURE dbo.usp_ResolveGameTeams
+    @SeasonID INT = NULL
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    UPDATE g
+    SET HomeTeamID = ht.TeamID,
+        RoadTeamID = rt.TeamID
+    FROM dbo.Games g
+    LEFT JOIN dbo.Teams ht ON ht.TeamName = LTRIM(RTRIM(g.HomeTeam))
+    LEFT JOIN dbo.Teams rt ON rt.TeamName = LTRIM(RTRIM(g.RoadTeam))
+    WHERE (@SeasonID IS NULL OR g.SeasonID = @SeasonID)
+      AND (EXISTS (SELECT g.HomeTeamID, g.RoadTeamID EXCEPT SELECT ht.TeamID, rt.TeamID));
+
+    -- Names that still do not resolve (all seasons)
+    SELECT TeamName, Games
+    FROM dbo.vw_UnresolvedTeamNames
+    ORDER BY Games DESC, TeamName;
+END
+GO
+
+-- ============================================
+-- vw_GamesWithConferences on the integer keys (same columns as before)
+-- ============================================
+DROP VIEW IF EXISTS dbo.vw_GamesWithConferences;
+GO
+
+CREATE VIEW dbo.vw_GamesWithConferences AS
+SELECT
+    g.*,
+    hc.ConferenceID AS HomeConferenceID,
+    rc.ConferenceID AS RoadConferenceID,
+    hc.ConferenceName AS HomeConferenceName,
+    rc.ConferenceName AS RoadConferenceName,
+    COALESCE(hc.ConferenceType, 'Unknown') AS HomeConferenceType,
+    COALESCE(rc.ConferenceType, 'Unknown') AS RoadConferenceType
+FROM dbo.Games g
+LEFT JOIN dbo.Teams ht ON g.HomeTeamID = ht.TeamID
+LEFT JOIN dbo.Teams rt ON g.RoadTeamID = rt.TeamID
+LEFT JOIN dbo.Conferences hc ON ht.ConferenceID = hc.ConferenceID
+LEFT JOIN dbo.Conferences rc ON rt.ConferenceID = rc.ConferenceID;
+GO
+
+-- Backfill existing games (also lists unresolved names)
+EXEC dbo.usp_ResolveGameTeams;
+GO
+
+-- Conference types come from the new keys now
+IF OBJECT_ID('dbo.usp_RefreshStrategySummary', 'P') IS NOT NULL
+    EXEC dbo.usp_RefreshStrategySummary;
+GO
+
+PRINT 'Games.HomeTeamID/RoadTeamID added and vw_GamesWithConferences now joins on TeamID!';
+GO
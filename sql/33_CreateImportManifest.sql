@@ -0,0 +1,44 @@
+-- ============================================
+-- Import Manifest
+-- Lets import_data.py skip work it has already done:
+--   ImportFiles     - size, modified time and SHA-256 of each fully imported CSV
+--   ImportRowHashes - hash of each imported game's CSV data (date, home, road)
+-- Row hashes are written in the same transaction as each batch of games, so
+-- they double as the checkpoint: an interrupted import resumes after the last
+-- committed batch, and reruns only touch new or changed rows.
+-- ============================================
+USE SportsAnalytics;
+GO
+
+IF OBJECT_ID('dbo.ImportFiles', 'U') IS NULL
+BEGIN
+    CREATE TABLE dbo.ImportFiles (
+        FileName NVARCHAR(260) NOT NULL,
+        SeasonID INT NOT NULL FOREIGN KEY REFERENCES dbo.Seasons(SeasonID),
+        FileSize BIGINT NOT NULL,
+        FileModified DATETIME2(3) NOT NULL,
+        ContentHash CHAR(64) NOT NULL,  -- SHA-256 hex
+        GameRows INT NOT NULL,
+        CompletedAt DATETIME2(0) NOT NULL CONSTRAINT DF_ImportFiles_CompletedAt DEFAULT SYSUTCDATETIME(),
+        CONSTRAINT PK_ImportFiles PRIMARY KEY (FileName)
+    );
+END
+GO
+
+IF OBJECT_ID('dbo.ImportRowHashes', 'U') IS NULL
+BEGIN
+    CREATE TABLE dbo.ImportRowHashes (
+        SeasonID INT NOT NULL,
+        GameDate DATE NOT NULL,
+        HomeTeam NVARCHAR(100) NOT NULL,
+        RoadTeam NVARCHAR(100) NOT NULL,
+        RowHash BINARY(20) NOT NULL,    -- SHA-1 of the game's parsed CSV values
+        ImportedAt DATETIME2(0) NOT NULL CONSTRAINT DF_ImportRowHashes_ImportedAt DEFAULT SYSUTCDATETIME(),
+        CONSTRAINT PK_ImportRowHashes PRIMARY KEY (SeasonID, GameDate, HomeTeam, RoadTeam)
+    );
+END
+GO
+
+PRINT 'Import manifest tables created!';
+PRINT 'To force a full reimport: python import_data.py --full';
+GO
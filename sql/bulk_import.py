@@ -0,0 +1,485 @@
+"""
+Bulk NCAAB CSV import
+Set-based version of import_data.import_game: a season's CSV is parsed and
+de-duplicated in memory, sent to temp staging tables in a few fast_executemany
+batches, and applied with one MERGE per target table. Teams and prediction
+models come from in-memory maps, so nothing is looked up per row.
+
+The import is incremental (sql/33_CreateImportManifest.sql): a CSV whose size
+and modified time (or content hash) match its manifest entry is skipped, and
+within a changed file only games whose row hash differs from the stored one
+are staged. Batches commit together with their row hashes, so an interrupted
+run picks up after the last committed batch.
+
+As in the row-by-row import, the first value seen for a game's
+consensus/opening line or a model's prediction wins within one CSV; a changed
+value in a later version of the CSV (late score, corrected line) replaces the
+stored one.
+"""
+
+import hashlib
+import os
+import sys
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import pyodbc
+except ImportError:  # DB_BACKEND=sqlite only needs the parsing and manifest helpers
+    pyodbc = None
+
+# Add dashboard to path (for the season cache)
+sys.path.append(str(Path(__file__).parent.parent / 'dashboard'))
+
+from season_cache import read_season
+
+# Season CSV columns the import reads, besides the prediction columns
+GAME_COLUMNS = ['date', 'home', 'road', 'hscore', 'rscore', 'neutral', 'lineround', 'lineavg', 'std', 'lineopen',
+                'line']
+
+# Games (with their lines and predictions) in the first transaction; later
+# batches are sized by AdaptiveBatchSize
+BATCH_SIZE = 1000
+
+STAGE_GAMES_SQL = """
+IF OBJECT_ID('tempdb..#StageGames') IS NOT NULL DROP TABLE #StageGames;
+CREATE TABLE #StageGames (
+    GameDate DATE NOT NULL,
+    HomeTeam NVARCHAR(100) NOT NULL,
+    RoadTeam NVARCHAR(100) NOT NULL,
+    HomeScore INT NULL,
+    RoadScore INT NULL,
+    IsNeutralSite BIT NOT NULL,
+    RoundNumber INT NULL,
+    HomeTeamID INT NULL,
+    RoadTeamID INT NULL,
+    ConsensusLine DECIMAL(10,2) NULL,
+    LineStdDev DECIMAL(10,4) NULL,
+    OpeningLine DECIMAL(10,2) NULL,
+    RowHash BINARY(20) NOT NULL,
+    GameID INT NULL,
+    PRIMARY KEY (GameDate, HomeTeam, RoadTeam)
+);
+"""
+
+STAGE_PREDICTIONS_SQL = """
+IF OBJECT_ID('tempdb..#StagePredictions') IS NOT NULL DROP TABLE #StagePredictions;
+CREATE TABLE #StagePredictions (
+    GameDate DATE NOT NULL,
+    HomeTeam NVARCHAR(100) NOT NULL,
+    RoadTeam NVARCHAR(100) NOT NULL,
+    ModelID INT NOT NULL,
+    PredictedLine DECIMAL(10,2) NOT NULL,
+    PRIMARY KEY (GameDate, HomeTeam, RoadTeam, ModelID)
+);
+"""
+
+CLEAR_STAGING_SQL = "TRUNCATE TABLE #StageGames; TRUNCATE TABLE #StagePredictions;"
+
+INSERT_STAGE_GAMES_SQL = """
+INSERT INTO #StageGames (GameDate, HomeTeam, RoadTeam, HomeScore, RoadScore, IsNeutralSite, RoundNumber,
+                         HomeTeamID, RoadTeamID, ConsensusLine, LineStdDev, OpeningLine, RowHash)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_STAGE_PREDICTIONS_SQL = """
+INSERT INTO #StagePredictions (GameDate, HomeTeam, RoadTeam, ModelID, PredictedLine)
+VALUES (?, ?, ?, ?, ?)
+"""
+
+MERGE_GAMES_SQL = """
+MERGE dbo.Games WITH (HOLDLOCK) AS t
+USING #StageGames AS s
+    ON t.SportID = 1 AND t.SeasonID = ?
+   AND t.GameDate = s.GameDate AND t.HomeTeam = s.HomeTeam AND t.RoadTeam = s.RoadTeam
+WHEN MATCHED AND EXISTS (
+    SELECT s.HomeScore, s.RoadScore, s.IsNeutralSite, s.RoundNumber,
+           COALESCE(s.HomeTeamID, t.HomeTeamID), COALESCE(s.RoadTeamID, t.RoadTeamID)
+    EXCEPT
+    SELECT t.HomeScore, t.RoadScore, t.IsNeutralSite, t.RoundNumber, t.HomeTeamID, t.RoadTeamID
+) THEN
+    UPDATE SET HomeScore = s.HomeScore,
+               RoadScore = s.RoadScore,
+               IsNeutralSite = s.IsNeutralSite,
+               RoundNumber = s.RoundNumber,
+               HomeTeamID = COALESCE(s.HomeTeamID, t.HomeTeamID),
+               RoadTeamID = COALESCE(s.RoadTeamID, t.RoadTeamID)
+WHEN NOT MATCHED BY TARGET THEN
+    INSERT (SportID, SeasonID, GameDate, HomeTeam, RoadTeam, HomeScore, RoadScore, IsNeutralSite, RoundNumber,
+            HomeTeamID, RoadTeamID)
+    VALUES (1, ?, s.GameDate, s.HomeTeam, s.RoadTeam, s.HomeScore, s.RoadScore, s.IsNeutralSite, s.RoundNumber,
+            s.HomeTeamID, s.RoadTeamID);
+"""
+
+# GameIDs for the staged games (new and existing) so lines and predictions can key on them
+STAGE_GAME_IDS_SQL = """
+UPDATE s SET GameID = g.GameID
+FROM #StageGames s
+INNER JOIN dbo.Games g
+    ON g.SportID = 1 AND g.SeasonID = ?
+   AND g.GameDate = s.GameDate AND g.HomeTeam = s.HomeTeam AND g.RoadTeam = s.RoadTeam;
+"""
+
+MERGE_LINES_SQL = """
+MERGE dbo.GameLines WITH (HOLDLOCK) AS t
+USING (
+    SELECT GameID, 'CONSENSUS' AS LineType, ConsensusLine AS Line, LineStdDev AS StandardDeviation
+    FROM #StageGames WHERE GameID IS NOT NULL AND ConsensusLine IS NOT NULL
+    UNION ALL
+    SELECT GameID, 'OPENING', OpeningLine, NULL
+    FROM #StageGames WHERE GameID IS NOT NULL AND OpeningLine IS NOT NULL
+) AS s
+    ON t.GameID = s.GameID AND t.LineType = s.LineType
+WHEN MATCHED AND EXISTS (SELECT s.Line, s.StandardDeviation EXCEPT SELECT t.Line, t.StandardDeviation) THEN
+    UPDATE SET Line = s.Line, StandardDeviation = s.StandardDeviation
+WHEN NOT MATCHED BY TARGET THEN
+    INSERT (GameID, LineType, Line, StandardDeviation)
+    VALUES (s.GameID, s.LineType, s.Line, s.StandardDeviation);
+"""
+
+MERGE_PREDICTIONS_SQL = """
+MERGE dbo.GamePredictions WITH (HOLDLOCK) AS t
+USING (
+    SELECT g.GameID, p.ModelID, p.PredictedLine
+    FROM #StagePredictions p
+    INNER JOIN #StageGames g
+        ON g.GameDate = p.GameDate AND g.HomeTeam = p.HomeTeam AND g.RoadTeam = p.RoadTeam
+    WHERE g.GameID IS NOT NULL
+) AS s
+    ON t.GameID = s.GameID AND t.ModelID = s.ModelID
+WHEN MATCHED AND t.PredictedLine <> s.PredictedLine THEN
+    UPDATE SET PredictedLine = s.PredictedLine
+WHEN NOT MATCHED BY TARGET THEN
+    INSERT (GameID, ModelID, PredictedLine)
+    VALUES (s.GameID, s.ModelID, s.PredictedLine);
+"""
+
+# The batch's checkpoint: committed together with the rows it describes
+MERGE_ROW_HASHES_SQL = """
+MERGE dbo.ImportRowHashes WITH (HOLDLOCK) AS t
+USING (SELECT GameDate, HomeTeam, RoadTeam, RowHash FROM #StageGames WHERE GameID IS NOT NULL) AS s
+    ON t.SeasonID = ? AND t.GameDate = s.GameDate AND t.HomeTeam = s.HomeTeam AND t.RoadTeam = s.RoadTeam
+WHEN MATCHED THEN
+    UPDATE SET RowHash = s.RowHash, ImportedAt = SYSUTCDATETIME()
+WHEN NOT MATCHED BY TARGET THEN
+    INSERT (SeasonID, GameDate, HomeTeam, RoadTeam, RowHash)
+    VALUES (?, s.GameDate, s.HomeTeam, s.RoadTeam, s.RowHash);
+"""
+
+MERGE_FILE_SQL = """
+MERGE dbo.ImportFiles WITH (HOLDLOCK) AS t
+USING (SELECT ? AS FileName, ? AS SeasonID, ? AS FileSize, ? AS FileModified, ? AS ContentHash, ? AS GameRows) AS s
+    ON t.FileName = s.FileName
+WHEN MATCHED THEN
+    UPDATE SET SeasonID = s.SeasonID, FileSize = s.FileSize, FileModified = s.FileModified,
+               ContentHash = s.ContentHash, GameRows = s.GameRows, CompletedAt = SYSUTCDATETIME()
+WHEN NOT MATCHED BY TARGET THEN
+    INSERT (FileName, SeasonID, FileSize, FileModified, ContentHash, GameRows)
+    VALUES (s.FileName, s.SeasonID, s.FileSize, s.FileModified, s.ContentHash, s.GameRows);
+"""
+
+DROP_STAGING_SQL = "DROP TABLE #StagePredictions; DROP TABLE #StageGames;"
+
+
+def load_model_ids(cursor):
+    """Map of ModelCode -> ModelID"""
+    cursor.execute("SELECT ModelCode, ModelID FROM dbo.PredictionModels")
+    return {code: model_id for code, model_id in cursor.fetchall()}
+
+
+def file_signature(csv_path):
+    """(size in bytes, modified time) of a CSV, compared before hashing its content"""
+    stat = os.stat(csv_path)
+    return stat.st_size, datetime.fromtimestamp(stat.st_mtime).replace(microsecond=0)
+
+
+def content_hash(csv_path):
+    """SHA-256 hex digest of a CSV"""
+    digest = hashlib.sha256()
+    with open(csv_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_file_entry(cursor, file_name):
+    """Manifest entry for a CSV: (FileSize, FileModified, ContentHash) or None"""
+    cursor.execute("SELECT FileSize, FileModified, ContentHash FROM dbo.ImportFiles WHERE FileName = ?", (file_name,))
+    row = cursor.fetchone()
+    return (row[0], row[1].replace(microsecond=0), row[2]) if row else None
+
+
+def load_row_hashes(cursor, season_id):
+    """Stored row hash per (date, home, road) for a season"""
+    cursor.execute("SELECT GameDate, HomeTeam, RoadTeam, RowHash FROM dbo.ImportRowHashes WHERE SeasonID = ?",
+                   season_id)
+    return {(game_date, home, road): bytes(row_hash) for game_date, home, road, row_hash in cursor.fetchall()}
+
+
+def row_hash(game, predictions):
+    """SHA-1 over a game's parsed CSV values and predictions (team keys excluded)"""
+    values = (game[:7], game[9:12], sorted(predictions))
+    return hashlib.sha1(repr(values).encode('utf-8')).digest()
+
+
+def _values(series):
+    """Column as Python values with None for missing cells"""
+    if series.dtype == np.float32:
+        # Lines have two decimals in the CSV; rounding recovers the exact value parsed before
+        series = series.astype(np.float64).round(2)
+    return series.astype(object).where(series.notna(), None).tolist()
+
+
+def parse_season_csv(csv_path, column_models, team_id, closing_lines=None):
+    """
+    Read one season CSV into de-duplicated staging rows
+
+    The rows come from season_cache.read_season (the typed Parquet copy when
+    pyarrow is installed), projected to the columns the import uses. Cells
+    that are not valid numbers are read as missing.
+
+    Args:
+        csv_path: Season CSV
+        column_models: {csv column: ModelID} for the prediction columns
+        team_id: Callable mapping a CSV team name to its TeamID (or None)
+        closing_lines: Optional dict to fill with MAX(line) per game key, as
+            21_ImportClosingLine.sql loads the closing line
+
+    Returns:
+        (games {key: game row}, predictions {key: {ModelID: line}}, rows read, rows skipped)
+    """
+    frame = read_season(csv_path, columns=GAME_COLUMNS + list(column_models))
+    frame['date'] = frame['date'].dt.date
+    values = {column: _values(frame[column]) for column in frame.columns}
+    dates, homes, roads = values['date'], values['home'], values['road']
+    model_values = [(model_id, values[column]) for column, model_id in column_models.items()]
+
+    games = {}
+    predictions = {}
+    skipped = 0
+
+    for i in range(len(frame)):
+        game_date, home, road = dates[i], homes[i], roads[i]
+        if game_date is None or home is None or road is None:
+            skipped += 1
+            print(f"    ERROR processing game {home or 'unknown'}: missing date or team")
+            continue
+
+        key = (game_date, home, road)
+        game = games.get(key)
+        if game is None:
+            game = games[key] = [
+                game_date, home, road,
+                values['hscore'][i], values['rscore'][i],
+                1 if values['neutral'][i] == 1 else 0,
+                values['lineround'][i],
+                team_id(home),
+                team_id(road),
+                None, None, None,
+            ]
+            predictions[key] = {}
+
+        # First non-empty line per game wins (IF NOT EXISTS in the row-by-row import)
+        if game[9] is None and values['lineavg'][i] is not None:
+            game[9] = values['lineavg'][i]
+            game[10] = values['std'][i]
+        if game[11] is None and values['lineopen'][i] is not None:
+            game[11] = values['lineopen'][i]
+
+        line = values['line'][i]
+        if closing_lines is not None and line is not None:
+            if closing_lines.get(key) is None or line > closing_lines[key]:
+                closing_lines[key] = line
+
+        game_predictions = predictions[key]
+        for model_id, column_values in model_values:
+            if column_values[i] is not None and model_id not in game_predictions:
+                game_predictions[model_id] = column_values[i]
+
+    return games, predictions, len(frame), skipped
+
+
+class AdaptiveBatchSize:
+    """
+    Batch size that tracks commit latency: grows while batches commit faster
+    than target_seconds and shrinks when they are slower (e.g. under lock
+    contention from parallel workers), at most 2x either way per batch
+    """
+
+    def __init__(self, initial=BATCH_SIZE, target_seconds=2.0, minimum=100, maximum=20000):
+        self.size = initial
+        self.target_seconds = target_seconds
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def update(self, seconds):
+        factor = 2.0 if seconds <= 0 else min(max(self.target_seconds / seconds, 0.5), 2.0)
+        self.size = int(min(max(self.size * factor, self.minimum), self.maximum))
+        return self.size
+
+
+def _is_deadlock(error):
+    # SQLSTATE 40001: chosen as deadlock victim (parallel workers MERGE into the same tables)
+    return bool(error.args) and error.args[0] == '40001'
+
+
+def _apply_batch(conn, cursor, season_id, batch, predictions):
+    """Stage one batch of (key, game row, hash) and MERGE it, committing with its row hashes"""
+    cursor.execute(CLEAR_STAGING_SQL)
+    cursor.executemany(INSERT_STAGE_GAMES_SQL, [game + [digest] for _, game, digest in batch])
+    prediction_rows = [(*key, model_id, line) for key, _, _ in batch for model_id, line in predictions[key].items()]
+    if prediction_rows:
+        cursor.executemany(INSERT_STAGE_PREDICTIONS_SQL, prediction_rows)
+
+    cursor.execute(MERGE_GAMES_SQL, season_id, season_id)
+    games_written = cursor.rowcount
+    cursor.execute(STAGE_GAME_IDS_SQL, season_id)
+    cursor.execute(MERGE_LINES_SQL)
+    lines_written = cursor.rowcount
+    cursor.execute(MERGE_PREDICTIONS_SQL)
+    predictions_written = cursor.rowcount
+    cursor.execute(MERGE_ROW_HASHES_SQL, season_id, season_id)
+    conn.commit()
+
+    return games_written, lines_written, predictions_written, len(prediction_rows)
+
+
+def check_file(conn, csv_path, full=False):
+    """
+    Compare a CSV against its manifest entry
+
+    Returns:
+        (changed, signature) - signature is (file name, size, modified, content hash)
+        for record_file() once the file's games are all in and the season is refreshed
+    """
+    cursor = conn.cursor()
+    file_name = os.path.basename(csv_path)
+    size, modified = file_signature(csv_path)
+
+    entry = None if full else load_file_entry(cursor, file_name)
+    if entry and entry[:2] == (size, modified):
+        return False, None
+
+    digest = content_hash(csv_path)
+    if entry and entry[2] == digest:
+        # Touched but identical: just remember the new modified time
+        cursor.execute("UPDATE dbo.ImportFiles SET FileSize = ?, FileModified = ? WHERE FileName = ?",
+                       (size, modified, file_name))
+        conn.commit()
+        return False, None
+
+    return True, (file_name, size, modified, digest)
+
+
+def record_file(conn, season_id, signature, games):
+    """Mark a CSV as fully imported (games in, GameFacts and StrategySummary refreshed) in the manifest"""
+    file_name, size, modified, digest = signature
+    conn.cursor().execute(MERGE_FILE_SQL, file_name, season_id, size, modified, digest, games)
+    conn.commit()
+
+
+def _print_progress(committed, total, batch_size, seconds):
+    print(f"  Committed {committed}/{total} new or changed games ({seconds:.2f}s, next batch {batch_size})")
+
+
+def import_changed_games(conn, season_id, csv_path, column_models, team_id, full=False, batch=None,
+                         chunk=(0, 1), progress=_print_progress, max_retries=3):
+    """
+    Stage and MERGE the new or changed games of one season CSV
+
+    Args:
+        conn: Database connection
+        season_id: SeasonID the CSV belongs to
+        csv_path: Season CSV
+        column_models: {csv column: ModelID}
+        team_id: Callable mapping a CSV team name to its TeamID (or None)
+        full: Restage every game instead of comparing row hashes
+        batch: AdaptiveBatchSize (a fresh one by default)
+        chunk: (index, count) - only handle the games whose key hashes to
+            index, for splitting one file across count workers
+        progress: Callable(committed, total, next batch size, batch seconds)
+        max_retries: Attempts per batch when chosen as a deadlock victim
+
+    Returns:
+        dict of counts
+    """
+    batch = batch or AdaptiveBatchSize()
+    cursor = conn.cursor()
+    stats = {'rows': 0, 'skipped': 0, 'games': 0, 'staged': 0, 'games_written': 0, 'lines': 0,
+             'predictions': 0, 'predictions_written': 0, 'removed': 0, 'retries': 0}
+
+    games, predictions, stats['rows'], stats['skipped'] = parse_season_csv(csv_path, column_models, team_id)
+    stats['games'] = len(games)
+
+    stored = {} if full else load_row_hashes(cursor, season_id)
+    stats['removed'] = len(set(stored) - set(games)) if chunk[0] == 0 else 0
+
+    pending = []
+    for key, game in games.items():
+        # Chunks split by game key, so they stay disjoint however far the others have got
+        if chunk[1] > 1 and zlib.crc32(repr(key).encode('utf-8')) % chunk[1] != chunk[0]:
+            continue
+        digest_row = row_hash(game, predictions[key].items())
+        if stored.get(key) != digest_row:
+            pending.append((key, game, digest_row))
+    stats['staged'] = len(pending)
+
+    cursor.fast_executemany = True
+    cursor.execute(STAGE_GAMES_SQL)
+    cursor.execute(STAGE_PREDICTIONS_SQL)
+    conn.commit()  # keep the staging tables if a batch is rolled back
+
+    start = 0
+    while start < len(pending):
+        size = batch.size
+        rows = pending[start:start + size]
+        started = time.perf_counter()
+        for attempt in range(max_retries):
+            try:
+                games_written, lines_written, predictions_written, prediction_rows = _apply_batch(
+                    conn, cursor, season_id, rows, predictions)
+                break
+            except pyodbc.Error as e:
+                conn.rollback()
+                if not _is_deadlock(e) or attempt == max_retries - 1:
+                    raise
+                stats['retries'] += 1
+                time.sleep(0.5 * (attempt + 1))
+        seconds = time.perf_counter() - started
+
+        stats['games_written'] += games_written
+        stats['lines'] += lines_written
+        stats['predictions_written'] += predictions_written
+        stats['predictions'] += prediction_rows
+        start += len(rows)
+        progress(start, len(pending), batch.update(seconds), seconds)
+
+    cursor.execute(DROP_STAGING_SQL)
+    conn.commit()
+    return stats
+
+
+def bulk_import_season(conn, season_id, csv_path, column_models, team_id, full=False):
+    """
+    Import one season CSV with staging tables and set-based MERGEs
+
+    The file is not recorded in the manifest here: the caller refreshes the
+    season's GameFacts and StrategySummary first and then calls
+    record_file(conn, season_id, stats['signature'], stats['games']), so a run
+    interrupted before the refresh finishes imports (and refreshes) it again.
+
+    Returns:
+        dict of counts; 'unchanged' is True when the manifest showed nothing to do
+    """
+    changed, signature = check_file(conn, csv_path, full)
+    if not changed:
+        return {'unchanged': True}
+
+    stats = import_changed_games(conn, season_id, csv_path, column_models, team_id, full)
+    stats['unchanged'] = False
+    stats['signature'] = signature
+    return stats
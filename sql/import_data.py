@@ -1,15 +1,35 @@
 """
-Import NCAAB CSV data into SQL Server
-Run: python import_data.py
+Import NCAAB CSV data into the SportsAnalytics database
+Run: python import_data.py                # bulk and incremental: only new or changed games
+     python import_data.py --full         # bulk, ignoring the import manifest
+     python import_data.py --workers 3    # one worker process per season file
+     python import_data.py --row-by-row   # original per-row inserts
+
+SQL Server by default; with DB_BACKEND=sqlite the season files go into the
+embedded database instead (dashboard/storage.py, sql/sqlite_import.py).
 """
 
+import argparse
 import csv
-import pyodbc
+import queue
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from multiprocessing import Manager
 from pathlib import Path
 
+from bulk_import import bulk_import_season, check_file, import_changed_games, load_model_ids, record_file
+import sqlite_import
+
+# Add dashboard to path (for the storage backends and the cache invalidation hook)
+sys.path.append(str(Path(__file__).parent.parent / 'dashboard'))
+
+import storage
+from query_cache import invalidate_all
+
 # Configuration
-SERVER = r'MSI\SQLEXPRESS'
-DATABASE = 'SportsAnalytics'
 CSV_PATH = Path(r'C:\Users\happy\Documents\Projects\ncaab-prediction-tracker')
 
 # CSV to Season mapping
@@ -38,23 +58,42 @@ COLUMN_MODEL_MAPPING = {
 }
 
 def get_connection():
-    """Create database connection"""
-    conn_str = f'DRIVER={{ODBC Driver 17 for SQL Server}};SERVER={SERVER};DATABASE={DATABASE};Trusted_Connection=yes;'
-    return pyodbc.connect(conn_str)
+    """Create database connection (DB_BACKEND picks SQL Server or the SQLite file)"""
+    return storage.connect()
 
 def get_season_id(cursor, season_year):
     """Get SeasonID for given season year"""
-    cursor.execute("SELECT SeasonID FROM dbo.Seasons WHERE SportID = 1 AND SeasonYear = ?", season_year)
+    cursor.execute("SELECT SeasonID FROM dbo.Seasons WHERE SportID = 1 AND SeasonYear = ?", (season_year,))
     row = cursor.fetchone()
     return row[0] if row else None
 
+def load_team_ids(cursor):
+    """Map of storage.team_name_key(name) -> TeamID (dbo.Teams includes the CSV name aliases)"""
+    cursor.execute("SELECT TeamName, TeamID FROM dbo.Teams")
+    return {storage.team_name_key(name): team_id for name, team_id in cursor.fetchall()}
+
+def resolve_team(team_ids, name, unresolved):
+    """TeamID for a CSV team name, counting names that do not match any team"""
+    team_id = team_ids.get(storage.team_name_key(name))
+    if team_id is None:
+        unresolved[name] += 1
+    return team_id
+
 def get_model_id(cursor, model_code):
     """Get ModelID for given model code"""
-    cursor.execute("SELECT ModelID FROM dbo.PredictionModels WHERE ModelCode = ?", model_code)
+    cursor.execute("SELECT ModelID FROM dbo.PredictionModels WHERE ModelCode = ?", (model_code,))
     row = cursor.fetchone()
     return row[0] if row else None
 
-def import_game(cursor, season_id, row):
+def refresh_game_facts(cursor, season_id):
+    """Rebuild the GameFacts rows (pivoted lines and ESPN prediction) for one season"""
+    storage.get_backend().refresh_game_facts(cursor, season_id)
+
+def refresh_strategy_summary(cursor, season_id):
+    """Recompute one season's StrategySummary rows from GameFacts"""
+    storage.get_backend().refresh_strategy_summary(cursor, season_id)
+
+def import_game(cursor, season_id, row, team_ids, unresolved):
     """Import a single game and its predictions"""
     try:
         # Parse game data
@@ -65,6 +104,8 @@ def import_game(cursor, season_id, row):
         road_score = int(row['rscore']) if row['rscore'] else None
         is_neutral = 1 if row.get('neutral') == '1' else 0
         round_num = int(row['lineround']) if row.get('lineround') else None
+        home_team_id = resolve_team(team_ids, home_team, unresolved)
+        road_team_id = resolve_team(team_ids, road_team, unresolved)
 
         # Check if game already exists
         cursor.execute("""
@@ -76,12 +117,20 @@ def import_game(cursor, season_id, row):
         existing = cursor.fetchone()
         if existing:
             game_id = existing[0]
+
+            # Fill team keys on games imported before they existed (or before an alias was added)
+            cursor.execute("""
+                UPDATE dbo.Games SET HomeTeamID = ?, RoadTeamID = ?
+                WHERE GameID = ? AND (HomeTeamID IS NULL OR RoadTeamID IS NULL)
+            """, home_team_id, road_team_id, game_id)
         else:
             # Insert game
             cursor.execute("""
-                INSERT INTO dbo.Games (SportID, SeasonID, GameDate, HomeTeam, RoadTeam, HomeScore, RoadScore, IsNeutralSite, RoundNumber)
-                VALUES (1, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, season_id, game_date, home_team, road_team, home_score, road_score, is_neutral, round_num)
+                INSERT INTO dbo.Games (SportID, SeasonID, GameDate, HomeTeam, RoadTeam, HomeScore, RoadScore, IsNeutralSite, RoundNumber,
+                                       HomeTeamID, RoadTeamID)
+                VALUES (1, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, season_id, game_date, home_team, road_team, home_score, road_score, is_neutral, round_num,
+                home_team_id, road_team_id)
 
             # Get the new GameID
             cursor.execute("SELECT @@IDENTITY")
@@ -138,7 +187,156 @@ def import_game(cursor, season_id, row):
         print(f"    ERROR processing game {row.get('home', 'unknown')}: {e}")
         return False, 0
 
+def import_season_rows(conn, cursor, season_id, csv_path, team_ids, unresolved):
+    """Row-by-row import of one season CSV; returns (games, predictions)"""
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        games_count = 0
+        preds_count = 0
+
+        for row in reader:
+            success, pred_count = import_game(cursor, season_id, row, team_ids, unresolved)
+            if success:
+                games_count += 1
+                preds_count += pred_count
+
+            # Commit every 100 games
+            if games_count % 100 == 0:
+                conn.commit()
+                print(f"  Progress: {games_count} games processed...")
+
+        # Final commit for this file
+        conn.commit()
+
+    return games_count, preds_count
+
+def import_season_worker(task, team_ids, column_models, full, progress_queue):
+    """Process-pool worker: import one season CSV (or one chunk of it) on its own connection"""
+    season_year, season_id, csv_path, chunk = task
+    label = season_year if chunk[1] == 1 else f"{season_year} part {chunk[0] + 1}/{chunk[1]}"
+    unresolved = Counter()
+
+    def progress(committed, total, batch_size, seconds):
+        progress_queue.put((label, committed, total, batch_size, seconds))
+
+    conn = get_connection()
+    try:
+        stats = import_changed_games(conn, season_id, csv_path, column_models,
+                                     partial(resolve_team, team_ids, unresolved=unresolved),
+                                     full=full, chunk=chunk, progress=progress)
+    finally:
+        conn.close()
+    return stats, unresolved
+
+def import_parallel(conn, cursor, seasons, team_ids, column_models, unresolved, args):
+    """
+    Coordinator for --workers: fans season files (or chunks of them) out to a
+    process pool, prints their progress, and finishes each fully imported
+    season (GameFacts and StrategySummary, then the manifest entry) on its own connection
+
+    Returns:
+        (games, predictions, anything changed)
+    """
+    started = time.perf_counter()
+    tasks = []
+    signatures = {}
+    for csv_file, season_year, season_id, csv_path in seasons:
+        changed, signature = check_file(conn, csv_path, args.full)
+        if not changed:
+            print(f"\n[{season_year}] ✓ {csv_file} unchanged since the last import, skipped")
+            continue
+        signatures[season_year] = (season_id, signature)
+        tasks.extend((season_year, season_id, str(csv_path), (i, args.chunks)) for i in range(args.chunks))
+
+    if not tasks:
+        return 0, 0, False
+
+    print(f"\nImporting {len(signatures)} seasons as {len(tasks)} tasks on {args.workers} workers")
+    totals = {season_year: Counter() for season_year in signatures}
+    failed = Counter()
+
+    with Manager() as manager, ProcessPoolExecutor(max_workers=args.workers) as pool:
+        progress_queue = manager.Queue()
+        futures = {pool.submit(import_season_worker, task, team_ids, column_models, args.full, progress_queue): task
+                   for task in tasks}
+
+        def drain(timeout):
+            try:
+                label, committed, total, batch_size, seconds = progress_queue.get(timeout=timeout)
+            except queue.Empty:
+                return False
+            print(f"  [{label}] {committed}/{total} games committed ({seconds:.2f}s, next batch {batch_size})")
+            return True
+
+        while not all(future.done() for future in futures):
+            drain(0.5)
+        while drain(0):
+            pass
+
+        for future, (season_year, season_id, csv_path, chunk) in futures.items():
+            try:
+                stats, worker_unresolved = future.result()
+            except Exception as e:
+                failed[season_year] += 1
+                print(f"  ✗ [{season_year}] worker failed: {e}")
+                continue
+            if chunk[0] == 0:
+                # Every chunk parses the whole file; count file-level numbers once
+                unresolved.update(worker_unresolved)
+                totals[season_year].update({k: stats[k] for k in ('rows', 'skipped', 'games', 'removed')})
+            totals[season_year].update({k: stats[k] for k in ('staged', 'games_written', 'lines',
+                                                              'predictions', 'predictions_written', 'retries')})
+
+    total_games = total_predictions = 0
+    changed = False
+    for season_year, (season_id, signature) in signatures.items():
+        stats = totals[season_year]
+        if failed[season_year]:
+            print(f"\n[{season_year}] ✗ {failed[season_year]} of {args.chunks} tasks failed; "
+                  f"committed batches are kept and the next run resumes from them")
+            continue
+
+        print(f"\n[{season_year}] Read {stats['rows']} rows ({stats['skipped']} skipped) as {stats['games']} games, "
+              f"{stats['staged']} new or changed ({stats['retries']} deadlock retries)")
+        print(f"  Wrote {stats['games_written']} games, {stats['lines']} lines and "
+              f"{stats['predictions_written']} predictions")
+        if stats['removed']:
+            print(f"  ⚠ {stats['removed']} previously imported games are no longer in the CSV (left in place)")
+
+        # Refresh even with nothing staged (an earlier run may have stopped after its batches),
+        # and record the file only once the refresh is committed
+        refresh_game_facts(cursor, season_id)
+        refresh_strategy_summary(cursor, season_id)
+        conn.commit()
+        print(f"  ✓ Refreshed GameFacts and StrategySummary for {season_year}")
+        record_file(conn, season_id, signature, stats['games'])
+        changed = True
+        total_games += stats['staged']
+        total_predictions += stats['predictions']
+
+    print(f"\n✓ Parallel import finished in {time.perf_counter() - started:.1f}s "
+          f"({sum(failed.values())} failed tasks)")
+    return total_games, total_predictions, changed
+
 def main():
+    parser = argparse.ArgumentParser(description='Import the NCAAB season CSVs into the SportsAnalytics database')
+    parser.add_argument('--row-by-row', action='store_true',
+                        help='Insert one game at a time instead of the bulk staging/MERGE path')
+    parser.add_argument('--full', action='store_true',
+                        help='Ignore the import manifest and restage every game (bulk path)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Import seasons in parallel worker processes, each with its own connection')
+    parser.add_argument('--chunks', type=int, default=1,
+                        help='With --workers, split each season file across this many workers')
+    parser.add_argument('--csv-dir', type=Path, default=CSV_PATH, help='Folder with the ncaabb*.csv season files')
+    args = parser.parse_args()
+
+    backend = storage.get_backend()
+    embedded = backend.dialect == 'sqlite'
+    if embedded and (args.row_by_row or args.workers > 1):
+        # Both are built on T-SQL (IF NOT EXISTS, MERGE into temp tables); SQLite has one writer anyway
+        print("⚠ --row-by-row and --workers only apply to SQL Server; using the SQLite import")
+
     print("=" * 50)
     print("Starting NCAAB Data Import")
     print("=" * 50)
@@ -146,50 +344,87 @@ def main():
     try:
         conn = get_connection()
         cursor = conn.cursor()
-        print("✓ Connected to database")
+        print(f"✓ Connected to {backend.describe()}")
 
         total_games = 0
         total_predictions = 0
+        changed = False
 
-        for csv_file, season_year in CSV_FILES.items():
-            csv_path = CSV_PATH / csv_file
+        # Resolve team names to TeamIDs once, in memory
+        team_ids = load_team_ids(cursor)
+        unresolved = Counter()
+        print(f"✓ Loaded {len(team_ids)} team names")
+
+        # Prediction columns -> ModelID, also resolved once
+        model_ids = load_model_ids(cursor)
+        column_models = {column: model_ids[code] for column, code in COLUMN_MODEL_MAPPING.items()
+                         if code in model_ids}
 
+        # Season files that exist and have a season row
+        seasons = []
+        for csv_file, season_year in CSV_FILES.items():
+            csv_path = args.csv_dir / csv_file
             if not csv_path.exists():
                 print(f"\n✗ File not found: {csv_path}")
                 continue
-
-            print(f"\n[Processing {csv_file} for season {season_year}]")
-
-            # Get season ID
             season_id = get_season_id(cursor, season_year)
             if not season_id:
-                print(f"  ✗ Season not found: {season_year}")
+                print(f"\n✗ Season not found: {season_year}")
                 continue
+            seasons.append((csv_file, season_year, season_id, csv_path))
 
-            # Read and process CSV
-            with open(csv_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                games_count = 0
-                preds_count = 0
-
-                for row in reader:
-                    success, pred_count = import_game(cursor, season_id, row)
-                    if success:
-                        games_count += 1
-                        preds_count += pred_count
-
-                    # Commit every 100 games
-                    if games_count % 100 == 0:
-                        conn.commit()
-                        print(f"  Progress: {games_count} games processed...")
-
-                # Final commit for this file
+        if args.workers > 1 and not args.row_by_row and not embedded:
+            total_games, total_predictions, changed = import_parallel(
+                conn, cursor, seasons, team_ids, column_models, unresolved, args)
+        else:
+            for csv_file, season_year, season_id, csv_path in seasons:
+                print(f"\n[Processing {csv_file} for season {season_year}]")
+
+                started = time.perf_counter()
+                if args.row_by_row and not embedded:
+                    games_count, preds_count = import_season_rows(conn, cursor, season_id, csv_path,
+                                                                  team_ids, unresolved)
+                else:
+                    importer = sqlite_import.import_season if embedded else bulk_import_season
+                    stats = importer(conn, season_id, csv_path, column_models,
+                                     partial(resolve_team, team_ids, unresolved=unresolved),
+                                     full=args.full)
+                    if stats['unchanged']:
+                        print(f"  ✓ Unchanged since the last import, skipped")
+                        continue
+
+                    games_count, preds_count = stats['staged'], stats['predictions']
+                    print(f"  Read {stats['rows']} rows ({stats['skipped']} skipped) as {stats['games']} games, "
+                          f"{stats['staged']} new or changed")
+                    print(f"  Wrote {stats['games_written']} games, {stats['lines']} lines and "
+                          f"{stats['predictions_written']} predictions")
+                    if stats['removed']:
+                        print(f"  ⚠ {stats['removed']} previously imported games are no longer in the CSV "
+                              f"(left in place)")
+
+                changed = True
+
+                # Materialize this season's games and strategy totals for the views and the dashboard.
+                # Also when nothing was staged: an earlier run may have committed every batch and
+                # stopped before this refresh (the file is only recorded below, after it)
+                refresh_game_facts(cursor, season_id)
+                refresh_strategy_summary(cursor, season_id)
                 conn.commit()
+                print(f"  ✓ Refreshed GameFacts and StrategySummary for {season_year}")
+                if embedded:
+                    sqlite_import.record_file(conn, season_id, stats['signature'], stats['games'])
+                elif not args.row_by_row:
+                    record_file(conn, season_id, stats['signature'], stats['games'])
 
                 total_games += games_count
                 total_predictions += preds_count
 
-                print(f"  ✓ Imported {games_count} games and {preds_count} predictions")
+                print(f"  ✓ Imported {games_count} games and {preds_count} predictions "
+                      f"in {time.perf_counter() - started:.1f}s")
+
+        # Tell running dashboards to drop cached results and rebuild their aggregates
+        if changed:
+            invalidate_all()
 
         print("\n" + "=" * 50)
         print(f"✓ Import Complete!")
@@ -197,10 +432,16 @@ def main():
         print(f"  Total Predictions: {total_predictions}")
         print("=" * 50)
 
+        if unresolved:
+            print(f"\n⚠ {len(unresolved)} team names did not match dbo.Teams (add them as aliases, then")
+            print("  EXEC dbo.usp_ResolveGameTeams; and EXEC dbo.usp_RefreshStrategySummary;):")
+            for name, count in unresolved.most_common():
+                print(f"  {name}: {count} games")
+
         cursor.close()
         conn.close()
 
-    except pyodbc.Error as e:
+    except storage.DB_ERRORS as e:
         print(f"\n✗ Database error: {e}")
     except Exception as e:
         print(f"\n✗ Error: {e}")
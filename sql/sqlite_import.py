@@ -0,0 +1,134 @@
+"""
+SQLite CSV import
+import_data.py's path for DB_BACKEND=sqlite. A changed season CSV (same
+manifest check as the bulk import) is parsed by bulk_import.parse_season_csv
+and upserted with executemany in one transaction: SQLite has a single
+writer and no MERGE or temp-table staging, and a whole season is written in
+well under a second, so there are no row hashes or batches.
+
+Unlike the SQL Server import it also loads the closing line (MAX(line) per
+game, as 21_ImportClosingLine.sql does there), so the embedded database is
+complete after one run.
+"""
+
+from bulk_import import check_file, parse_season_csv
+
+UPSERT_GAMES_SQL = """
+INSERT INTO dbo.Games (SportID, SeasonID, GameDate, HomeTeam, RoadTeam, HomeScore, RoadScore, IsNeutralSite,
+                       RoundNumber, HomeTeamID, RoadTeamID)
+VALUES (1, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (SportID, SeasonID, GameDate, HomeTeam, RoadTeam) DO UPDATE SET
+    HomeScore = excluded.HomeScore,
+    RoadScore = excluded.RoadScore,
+    IsNeutralSite = excluded.IsNeutralSite,
+    RoundNumber = excluded.RoundNumber,
+    HomeTeamID = COALESCE(excluded.HomeTeamID, HomeTeamID),
+    RoadTeamID = COALESCE(excluded.RoadTeamID, RoadTeamID)
+WHERE HomeScore IS NOT excluded.HomeScore
+   OR RoadScore IS NOT excluded.RoadScore
+   OR IsNeutralSite IS NOT excluded.IsNeutralSite
+   OR RoundNumber IS NOT excluded.RoundNumber
+   OR HomeTeamID IS NOT COALESCE(excluded.HomeTeamID, HomeTeamID)
+   OR RoadTeamID IS NOT COALESCE(excluded.RoadTeamID, RoadTeamID)
+"""
+
+UPSERT_LINES_SQL = """
+INSERT INTO dbo.GameLines (GameID, LineType, Line, StandardDeviation)
+VALUES (?, ?, ?, ?)
+ON CONFLICT (GameID, LineType) DO UPDATE SET
+    Line = excluded.Line,
+    StandardDeviation = excluded.StandardDeviation
+WHERE Line IS NOT excluded.Line OR StandardDeviation IS NOT excluded.StandardDeviation
+"""
+
+UPSERT_PREDICTIONS_SQL = """
+INSERT INTO dbo.GamePredictions (GameID, ModelID, PredictedLine)
+VALUES (?, ?, ?)
+ON CONFLICT (GameID, ModelID) DO UPDATE SET
+    PredictedLine = excluded.PredictedLine
+WHERE PredictedLine IS NOT excluded.PredictedLine
+"""
+
+UPSERT_FILE_SQL = """
+INSERT INTO dbo.ImportFiles (FileName, SeasonID, FileSize, FileModified, ContentHash, GameRows)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (FileName) DO UPDATE SET
+    SeasonID = excluded.SeasonID,
+    FileSize = excluded.FileSize,
+    FileModified = excluded.FileModified,
+    ContentHash = excluded.ContentHash,
+    GameRows = excluded.GameRows,
+    CompletedAt = CURRENT_TIMESTAMP
+"""
+
+
+def _decimal(value, places=2):
+    """Round like the DECIMAL(10,2) / DECIMAL(10,4) columns on SQL Server"""
+    return round(value, places) if value is not None else None
+
+
+def import_season(conn, season_id, csv_path, column_models, team_id, full=False):
+    """
+    Upsert one season CSV into the SQLite database
+
+    Like bulk_import_season, the file is left for record_file() once the
+    caller has refreshed the season.
+
+    Args:
+        conn: SQLite connection from storage.connect()
+        season_id: SeasonID the CSV belongs to
+        csv_path: Season CSV
+        column_models: {csv column: ModelID}
+        team_id: Callable mapping a CSV team name to its TeamID (or None)
+        full: Ignore the manifest and reimport an unchanged file
+
+    Returns:
+        dict of counts shaped like bulk_import.bulk_import_season's
+    """
+    changed, signature = check_file(conn, csv_path, full)
+    if not changed:
+        return {'unchanged': True}
+
+    closing_lines = {}
+    games, predictions, rows_read, skipped = parse_season_csv(csv_path, column_models, team_id, closing_lines)
+    stats = {'unchanged': False, 'rows': rows_read, 'skipped': skipped, 'games': len(games),
+             'staged': len(games), 'games_written': 0, 'lines': 0, 'predictions': 0,
+             'predictions_written': 0, 'removed': 0}
+
+    cursor = conn.cursor()
+    cursor.executemany(UPSERT_GAMES_SQL, [(season_id, *game[:9]) for game in games.values()])
+    stats['games_written'] = cursor.rowcount
+
+    cursor.execute("SELECT GameDate, HomeTeam, RoadTeam, GameID FROM dbo.Games WHERE SportID = 1 AND SeasonID = ?",
+                   (season_id,))
+    game_ids = {(game_date, home, road): game_id for game_date, home, road, game_id in cursor.fetchall()}
+    stats['removed'] = len(set(game_ids) - set(games))
+
+    line_rows = []
+    prediction_rows = []
+    for key, game in games.items():
+        game_id = game_ids[key]
+        if game[9] is not None:
+            line_rows.append((game_id, 'CONSENSUS', _decimal(game[9]), _decimal(game[10], 4)))
+        if game[11] is not None:
+            line_rows.append((game_id, 'OPENING', _decimal(game[11]), None))
+        if closing_lines.get(key) is not None:
+            line_rows.append((game_id, 'CLOSING', _decimal(closing_lines[key]), None))
+        prediction_rows.extend((game_id, model_id, _decimal(line)) for model_id, line in predictions[key].items())
+
+    cursor.executemany(UPSERT_LINES_SQL, line_rows)
+    stats['lines'] = cursor.rowcount
+    cursor.executemany(UPSERT_PREDICTIONS_SQL, prediction_rows)
+    stats['predictions_written'] = cursor.rowcount
+    stats['predictions'] = len(prediction_rows)
+
+    conn.commit()
+    stats['signature'] = signature
+    return stats
+
+
+def record_file(conn, season_id, signature, games):
+    """Mark a CSV as fully imported (after the season's refresh has committed)"""
+    file_name, size, modified, digest = signature
+    conn.execute(UPSERT_FILE_SQL, (file_name, season_id, size, modified, digest, games))
+    conn.commit()
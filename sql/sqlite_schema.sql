@@ -0,0 +1,317 @@
+-- ============================================
+-- Embedded SQLite Schema
+-- The SportsAnalytics tables, reference data and views for DB_BACKEND=sqlite
+-- (dashboard/storage.py). The file is attached as schema "dbo", so the
+-- dashboard, import_data.py and daily_picks run their dbo.* queries unchanged.
+--
+-- Same column names and semantics as the SQL Server scripts:
+--   GameFacts / vw_GamesWithPredictions / vw_ESPNvsClosingLine   (30)
+--   StrategySummary                                              (31)
+--   Games.HomeTeamID/RoadTeamID, vw_GamesWithConferences         (32)
+--   ImportFiles                                                  (33)
+-- GameFacts and StrategySummary are refreshed by SQLiteBackend in
+-- storage.py (the stored procedures have no SQLite equivalent).
+--
+-- Applied automatically on first connect; storage.SCHEMA_VERSION is bumped
+-- whenever this file changes so existing files pick up the new views.
+-- ============================================
+
+-- ============================================
+-- Tables
+-- ============================================
+CREATE TABLE IF NOT EXISTS dbo.Sports (
+    SportID INTEGER PRIMARY KEY,
+    SportName TEXT NOT NULL UNIQUE,
+    SportCode TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS dbo.Seasons (
+    SeasonID INTEGER PRIMARY KEY,
+    SportID INTEGER NOT NULL REFERENCES Sports(SportID),
+    SeasonYear TEXT NOT NULL,
+    StartDate DATE,
+    EndDate DATE,
+    UNIQUE (SportID, SeasonYear)
+);
+
+CREATE TABLE IF NOT EXISTS dbo.PredictionModels (
+    ModelID INTEGER PRIMARY KEY,
+    ModelName TEXT NOT NULL UNIQUE,
+    ModelCode TEXT NOT NULL UNIQUE,
+    Description TEXT,
+    IsActive INTEGER DEFAULT 1
+);
+
+CREATE TABLE IF NOT EXISTS dbo.Conferences (
+    ConferenceID INTEGER PRIMARY KEY,
+    ConferenceName TEXT NOT NULL UNIQUE,
+    ConferenceType TEXT NOT NULL  -- 'Major', 'Mid-Major', 'Minor'
+);
+
+-- NOCASE matches the case-insensitive default collation on SQL Server
+CREATE TABLE IF NOT EXISTS dbo.Teams (
+    TeamID INTEGER PRIMARY KEY,
+    TeamName TEXT NOT NULL UNIQUE COLLATE NOCASE,
+    ConferenceID INTEGER REFERENCES Conferences(ConferenceID)
+);
+
+CREATE TABLE IF NOT EXISTS dbo.Games (
+    GameID INTEGER PRIMARY KEY,
+    SportID INTEGER NOT NULL REFERENCES Sports(SportID),
+    SeasonID INTEGER NOT NULL REFERENCES Seasons(SeasonID),
+    GameDate DATE NOT NULL,
+    HomeTeam TEXT NOT NULL,
+    RoadTeam TEXT NOT NULL,
+    HomeScore INTEGER,
+    RoadScore INTEGER,
+    IsNeutralSite INTEGER DEFAULT 0,
+    RoundNumber INTEGER,
+    HomeTeamID INTEGER REFERENCES Teams(TeamID),
+    RoadTeamID INTEGER REFERENCES Teams(TeamID),
+    CreatedDate DATETIME2(0) DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (SportID, SeasonID, GameDate, HomeTeam, RoadTeam)
+);
+
+CREATE INDEX IF NOT EXISTS dbo.IX_Games_SeasonID ON Games(SeasonID, GameDate);
+CREATE INDEX IF NOT EXISTS dbo.IX_Games_HomeTeamID ON Games(HomeTeamID);
+
+CREATE TABLE IF NOT EXISTS dbo.GamePredictions (
+    PredictionID INTEGER PRIMARY KEY,
+    GameID INTEGER NOT NULL REFERENCES Games(GameID),
+    ModelID INTEGER NOT NULL REFERENCES PredictionModels(ModelID),
+    PredictedLine REAL,  -- Positive = Home favored, Negative = Road favored
+    UNIQUE (GameID, ModelID)
+);
+
+CREATE TABLE IF NOT EXISTS dbo.GameLines (
+    LineID INTEGER PRIMARY KEY,
+    GameID INTEGER NOT NULL REFERENCES Games(GameID),
+    LineType TEXT NOT NULL,  -- 'OPENING', 'CONSENSUS', 'CLOSING'
+    Line REAL,
+    StandardDeviation REAL,
+    UNIQUE (GameID, LineType)
+);
+
+-- Materialized like dbo.GameFacts; the computed columns are filled on refresh
+CREATE TABLE IF NOT EXISTS dbo.GameFacts (
+    GameID INTEGER PRIMARY KEY,
+    SportID INTEGER NOT NULL,
+    SportName TEXT NOT NULL,
+    SeasonID INTEGER NOT NULL,
+    SeasonYear TEXT NOT NULL,
+    GameDate DATE NOT NULL,
+    HomeTeam TEXT NOT NULL,
+    RoadTeam TEXT NOT NULL,
+    HomeScore INTEGER,
+    RoadScore INTEGER,
+    IsNeutralSite INTEGER,
+    RoundNumber INTEGER,
+    ConsensusLine REAL,
+    OpeningLine REAL,
+    ClosingLine REAL,
+    LineStdDev REAL,
+    ESPNLine REAL,
+    ActualMargin INTEGER,
+    Winner TEXT,
+    ESPNEdge REAL,
+    AbsESPNEdge REAL
+);
+
+CREATE INDEX IF NOT EXISTS dbo.IX_GameFacts_Season_Date ON GameFacts(SeasonID, GameDate);
+CREATE INDEX IF NOT EXISTS dbo.IX_GameFacts_ESPN_Edge ON GameFacts(AbsESPNEdge)
+    WHERE ESPNLine IS NOT NULL AND ClosingLine IS NOT NULL;
+CREATE INDEX IF NOT EXISTS dbo.IX_GameFacts_ESPN_Date ON GameFacts(GameDate DESC, GameID DESC)
+    WHERE ESPNLine IS NOT NULL AND ClosingLine IS NOT NULL;
+
+CREATE TABLE IF NOT EXISTS dbo.StrategySummary (
+    SeasonYear TEXT NOT NULL,
+    GameMonth INTEGER NOT NULL,
+    ConferenceType TEXT NOT NULL,
+    Direction TEXT NOT NULL,
+    AbsEdge REAL NOT NULL,
+    Covered INTEGER NOT NULL,
+    Missed INTEGER NOT NULL,
+    Profit INTEGER NOT NULL,
+    PRIMARY KEY (SeasonYear, GameMonth, ConferenceType, Direction, AbsEdge)
+);
+
+CREATE TABLE IF NOT EXISTS dbo.ImportFiles (
+    FileName TEXT PRIMARY KEY,
+    SeasonID INTEGER NOT NULL REFERENCES Seasons(SeasonID),
+    FileSize INTEGER NOT NULL,
+    FileModified DATETIME2(3) NOT NULL,
+    ContentHash TEXT NOT NULL,
+    GameRows INTEGER NOT NULL,
+    CompletedAt DATETIME2(0) NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- ============================================
+-- Reference data (03_InsertReferenceData.sql)
+-- ============================================
+INSERT OR IGNORE INTO dbo.Sports (SportID, SportName, SportCode) VALUES
+    (1, 'NCAA Men''s Basketball', 'NCAAB'),
+    (2, 'NCAA Women''s Basketball', 'NCAAW'),
+    (3, 'NFL', 'NFL'),
+    (4, 'NBA', 'NBA'),
+    (5, 'NCAA Football', 'NCAAF'),
+    (6, 'MLB', 'MLB'),
+    (7, 'NHL', 'NHL');
+
+INSERT OR IGNORE INTO dbo.Seasons (SportID, SeasonYear, StartDate, EndDate) VALUES
+    (1, '2021-22', '2021-11-01', '2022-04-30'),
+    (1, '2022-23', '2022-11-01', '2023-04-30'),
+    (1, '2023-24', '2023-11-01', '2024-04-30'),
+    (1, '2024-25', '2024-11-01', '2025-04-30');
+
+INSERT OR IGNORE INTO dbo.PredictionModels (ModelName, ModelCode, Description) VALUES
+    ('ESPN BPI', 'ESPN', 'ESPN Basketball Power Index'),
+    ('Sagarin Ratings', 'SAGARIN', 'Jeff Sagarin''s rating system'),
+    ('Ken Pomeroy', 'KENPOM', 'KenPom.com advanced metrics'),
+    ('Massey Ratings', 'MASSEY', 'Kenneth Massey''s rating system'),
+    ('Dunkel Index', 'DUNKEL', 'Dunkel Index ratings'),
+    ('Dokter Entropy', 'DOKTER', 'Dokter Entropy ratings'),
+    ('Moore Rankings', 'MOORE', 'Moore computer rankings'),
+    ('Pugh Ratings', 'PUGH', 'Pugh Matrix ratings'),
+    ('Donchess Inference', 'DONCHESS', 'Donchess Inference system'),
+    ('Talis Rankings', 'TALIS', 'Talis ranking system'),
+    ('Piratings', 'PIRATINGS', 'Piratings system'),
+    ('Seven Overtimes', 'SEVENTIMES', '7OT rankings'),
+    ('Effective Ratings', 'EFFRATING', 'Effective rating system'),
+    ('David Dodds', 'DODDS', 'David Dodds ratings'),
+    ('Fox Sports', 'FOX', 'Fox Sports predictions');
+
+-- ============================================
+-- Views (recreated on every schema version bump)
+-- ============================================
+DROP VIEW IF EXISTS dbo.vw_GameFactsSource;
+DROP VIEW IF EXISTS dbo.vw_GamesWithPredictions;
+DROP VIEW IF EXISTS dbo.vw_ESPNvsClosingLine;
+DROP VIEW IF EXISTS dbo.vw_GamesWithConferences;
+DROP VIEW IF EXISTS dbo.vw_UnresolvedTeamNames;
+
+-- What usp_RefreshGameFacts merges: one row per game, lines pivoted into columns.
+-- Edges are rounded to DECIMAL(10,2) precision so the >= 3 cut matches SQL Server.
+CREATE VIEW dbo.vw_GameFactsSource
+AS
+SELECT
+    g.GameID,
+    g.SportID,
+    s.SportName,
+    g.SeasonID,
+    sn.SeasonYear,
+    g.GameDate,
+    g.HomeTeam,
+    g.RoadTeam,
+    g.HomeScore,
+    g.RoadScore,
+    g.IsNeutralSite,
+    g.RoundNumber,
+    (SELECT Line FROM GameLines WHERE GameID = g.GameID AND LineType = 'CONSENSUS') AS ConsensusLine,
+    (SELECT Line FROM GameLines WHERE GameID = g.GameID AND LineType = 'OPENING') AS OpeningLine,
+    l.Line AS ClosingLine,
+    (SELECT StandardDeviation FROM GameLines WHERE GameID = g.GameID AND LineType = 'CONSENSUS') AS LineStdDev,
+    e.PredictedLine AS ESPNLine,
+    g.HomeScore - g.RoadScore AS ActualMargin,
+    CASE
+        WHEN g.HomeScore > g.RoadScore THEN 'HOME'
+        WHEN g.RoadScore > g.HomeScore THEN 'ROAD'
+        WHEN g.HomeScore = g.RoadScore THEN 'TIE'
+    END AS Winner,
+    ROUND(l.Line - e.PredictedLine, 2) AS ESPNEdge,
+    ROUND(ABS(l.Line - e.PredictedLine), 2) AS AbsESPNEdge
+FROM Games g
+INNER JOIN Sports s ON g.SportID = s.SportID
+INNER JOIN Seasons sn ON g.SeasonID = sn.SeasonID
+LEFT JOIN GameLines l ON l.GameID = g.GameID AND l.LineType = 'CLOSING'
+LEFT JOIN (
+    SELECT gp.GameID, gp.PredictedLine
+    FROM GamePredictions gp
+    INNER JOIN PredictionModels pm ON gp.ModelID = pm.ModelID
+    WHERE pm.ModelCode = 'ESPN'
+) e ON e.GameID = g.GameID;
+
+CREATE VIEW dbo.vw_GamesWithPredictions
+AS
+SELECT
+    GameID,
+    SportName,
+    SeasonYear,
+    GameDate,
+    HomeTeam,
+    RoadTeam,
+    HomeScore,
+    RoadScore,
+    IsNeutralSite,
+    RoundNumber,
+    ActualMargin,
+    Winner,
+    ConsensusLine,
+    OpeningLine,
+    ClosingLine,
+    LineStdDev,
+    ESPNLine
+FROM GameFacts;
+
+CREATE VIEW dbo.vw_ESPNvsClosingLine
+AS
+SELECT
+    GameID,
+    SportName,
+    SeasonYear,
+    GameDate,
+    HomeTeam,
+    RoadTeam,
+    HomeScore,
+    RoadScore,
+    IsNeutralSite,
+    ClosingLine,
+    ESPNLine,
+    ESPNEdge,
+    AbsESPNEdge,
+    CASE
+        WHEN ClosingLine > 0 AND ESPNLine <= -3 THEN 'ROAD (Strong)'
+        WHEN ClosingLine > 0 AND ESPNLine < 0 THEN 'ROAD (Weak)'
+        WHEN ClosingLine < 0 AND ESPNLine >= 3 THEN 'HOME (Strong)'
+        WHEN ClosingLine < 0 AND ESPNLine > 0 THEN 'HOME (Weak)'
+        ELSE 'NONE'
+    END AS ESPNFavorsUnderdog,
+    ActualMargin,
+    Winner,
+    CASE
+        WHEN ActualMargin IS NULL THEN NULL
+        WHEN ClosingLine > 0 AND ESPNLine < ClosingLine THEN
+            CASE WHEN ActualMargin < ClosingLine THEN 'COVERED' ELSE 'MISSED' END
+        WHEN ClosingLine < 0 AND ESPNLine > ClosingLine THEN
+            CASE WHEN ActualMargin > ClosingLine THEN 'COVERED' ELSE 'MISSED' END
+        ELSE NULL
+    END AS CoverResult
+FROM GameFacts
+WHERE ESPNLine IS NOT NULL
+  AND ClosingLine IS NOT NULL
+  AND AbsESPNEdge >= 3;
+
+CREATE VIEW dbo.vw_GamesWithConferences
+AS
+SELECT
+    g.*,
+    hc.ConferenceID AS HomeConferenceID,
+    rc.ConferenceID AS RoadConferenceID,
+    hc.ConferenceName AS HomeConferenceName,
+    rc.ConferenceName AS RoadConferenceName,
+    COALESCE(hc.ConferenceType, 'Unknown') AS HomeConferenceType,
+    COALESCE(rc.ConferenceType, 'Unknown') AS RoadConferenceType
+FROM Games g
+LEFT JOIN Teams ht ON g.HomeTeamID = ht.TeamID
+LEFT JOIN Teams rt ON g.RoadTeamID = rt.TeamID
+LEFT JOIN Conferences hc ON ht.ConferenceID = hc.ConferenceID
+LEFT JOIN Conferences rc ON rt.ConferenceID = rc.ConferenceID;
+
+CREATE VIEW dbo.vw_UnresolvedTeamNames
+AS
+SELECT TeamName, COUNT(*) AS Games
+FROM (
+    SELECT HomeTeam AS TeamName FROM Games WHERE HomeTeamID IS NULL
+    UNION ALL
+    SELECT RoadTeam FROM Games WHERE RoadTeamID IS NULL
+) names
+GROUP BY TeamName;